@@ -0,0 +1,241 @@
+"""
+Compiled caveats.
+
+Caveat identifiers are "kind:argument" strings. A CaveatRegistry parses
+each one once into a typed predicate over the request:
+
+    path_prefix:/docs                  resource is /docs or below it
+    time_window:<iso start>/<iso end>  ctx.now inside the window (either end may be empty)
+    source_cidr:10.0.0.0/8,fd00::/8    the client address inside one of the networks
+    methods:GET,HEAD                   the HTTP method (or the action) in the set
+    byte_quota:1048576                 bytes written with the token stay within the quota
+                                       (charged after each successful write, see charge())
+
+Identity rehydrates a token's caveats as proxion_core Caveat(id, predicate)
+objects bound to the compiled predicates, cheapest first, so
+proxion_core's validate_request enforces them. The token cache keeps the
+rehydrated token, so each token is compiled once. proxion_core's
+RequestContext has no method, client address or body size. Callers supply
+those with request_facts() around validation, and predicates fall back to
+them. Unknown or malformed caveats never pass, and neither does a request
+missing a fact its caveat needs (no client address, say).
+"""
+import abc
+import contextlib
+import contextvars
+import ipaddress
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_facts: contextvars.ContextVar = contextvars.ContextVar("proxion_request_facts", default={})
+
+@contextlib.contextmanager
+def request_facts(**facts: Any) -> Iterator[None]:
+    """Make method / source_ip / size visible to caveat predicates in this context."""
+    reset = _facts.set(facts)
+    try:
+        yield
+    finally:
+        _facts.reset(reset)
+
+def fact(ctx: Any, name: str) -> Any:
+    """`name` from the request context, else from the current request_facts()."""
+    value = getattr(ctx, name, None)
+    return value if value is not None else _facts.get().get(name)
+
+class CaveatError(ValueError):
+    """Raised for a caveat identifier that cannot be parsed."""
+
+class CompiledCaveat(abc.ABC):
+    """One parsed caveat; `cost` orders evaluation (cheapest first)."""
+    __slots__ = ("caveat_id",)
+    cost = 0
+
+    def __init__(self, caveat_id: str):
+        self.caveat_id = caveat_id
+
+    @abc.abstractmethod
+    def check(self, ctx: Any, token_id: Optional[str] = None) -> bool:
+        """Whether the request described by `ctx` satisfies this caveat."""
+
+    def bind(self, token_id: Optional[str] = None) -> Callable[[Any], bool]:
+        """The predicate proxion_core's Caveat expects: ctx -> bool."""
+        return lambda ctx: self.check(ctx, token_id)
+
+class Unsatisfiable(CompiledCaveat):
+    """An unknown or malformed caveat; fails closed."""
+    __slots__ = ()
+
+    def check(self, ctx, token_id=None):
+        return False
+
+class MethodSet(CompiledCaveat):
+    __slots__ = ("methods",)
+    cost = 0
+
+    def __init__(self, caveat_id: str, arg: str):
+        super().__init__(caveat_id)
+        self.methods = frozenset(m.strip().upper() for m in arg.split(",") if m.strip())
+        if not self.methods:
+            raise CaveatError(f"Empty method set: {caveat_id}")
+
+    def check(self, ctx, token_id=None):
+        method = fact(ctx, "method") or ctx.action
+        return method.upper() in self.methods
+
+class PathPrefix(CompiledCaveat):
+    __slots__ = ("prefix", "_below")
+    cost = 1
+
+    def __init__(self, caveat_id: str, arg: str):
+        super().__init__(caveat_id)
+        self.prefix = "/" + arg.strip("/")
+        self._below = self.prefix.rstrip("/") + "/"
+
+    def check(self, ctx, token_id=None):
+        resource = "/" + ctx.resource.lstrip("/")
+        return resource == self.prefix or resource.startswith(self._below)
+
+class TimeWindow(CompiledCaveat):
+    __slots__ = ("start", "end")
+    cost = 2
+
+    def __init__(self, caveat_id: str, arg: str):
+        super().__init__(caveat_id)
+        start, sep, end = arg.partition("/")
+        if not sep:
+            raise CaveatError(f"Time window needs <start>/<end>: {caveat_id}")
+        self.start = _parse_time(start)
+        self.end = _parse_time(end)
+
+    def check(self, ctx, token_id=None):
+        now = ctx.now
+        return (self.start is None or now >= self.start) and (self.end is None or now < self.end)
+
+class SourceCidr(CompiledCaveat):
+    __slots__ = ("networks",)
+    cost = 3
+
+    def __init__(self, caveat_id: str, arg: str):
+        super().__init__(caveat_id)
+        try:
+            self.networks = tuple(ipaddress.ip_network(n.strip(), strict=False) for n in arg.split(",") if n.strip())
+        except ValueError as e:
+            raise CaveatError(f"Invalid network in {caveat_id}: {e}")
+        if not self.networks:
+            raise CaveatError(f"Empty network list: {caveat_id}")
+
+    def check(self, ctx, token_id=None):
+        source = fact(ctx, "source_ip")
+        if not source:
+            return False
+        try:
+            address = ipaddress.ip_address(source)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+class ByteQuota(CompiledCaveat):
+    """Admits a write whose size still fits the token's remaining quota.
+
+    Nothing is charged here; the caller charges the bytes actually written
+    once the write succeeds (CaveatRegistry.charge), so failed writes cost
+    nothing. A request of unknown size (chunked body) is admitted while any
+    quota remains. Concurrent writes may overshoot by what is in flight.
+    Actions other than WRITE and CREATE are not limited."""
+    __slots__ = ("limit", "usage")
+    cost = 9
+
+    def __init__(self, caveat_id: str, arg: str, usage: "QuotaUsage"):
+        super().__init__(caveat_id)
+        try:
+            self.limit = int(arg)
+        except ValueError:
+            raise CaveatError(f"Invalid byte quota: {caveat_id}")
+        self.usage = usage
+
+    def check(self, ctx, token_id=None):
+        if ctx.action not in ("WRITE", "CREATE"):
+            return True
+        used = self.usage.used(token_id or "", self.caveat_id)
+        size = fact(ctx, "size")
+        return used < self.limit if size is None else used + size <= self.limit
+
+class QuotaUsage:
+    """Bytes charged per (token, quota caveat), for this process."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._used: Dict[Tuple[str, str], int] = {}
+
+    def charge(self, token_id: str, caveat_id: str, size: int):
+        key = (token_id, caveat_id)
+        with self._lock:
+            self._used[key] = self._used.get(key, 0) + size
+
+    def used(self, token_id: str, caveat_id: str) -> int:
+        with self._lock:
+            return self._used.get((token_id, caveat_id), 0)
+
+    def forget(self, token_id: str):
+        with self._lock:
+            for key in [k for k in self._used if k[0] == token_id]:
+                del self._used[key]
+
+class CaveatRegistry:
+    """Parsers by caveat kind, starting with the built-in kinds. register()
+    adds kinds; compile() memoizes by id."""
+    def __init__(self):
+        self.usage = QuotaUsage()
+        self._parsers: Dict[str, Callable[[str, str], CompiledCaveat]] = {
+            "methods": MethodSet,
+            "path_prefix": PathPrefix,
+            "time_window": TimeWindow,
+            "source_cidr": SourceCidr,
+            "byte_quota": lambda caveat_id, arg: ByteQuota(caveat_id, arg, self.usage),
+        }
+        self._compiled: Dict[str, CompiledCaveat] = {}
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, parser: Callable[[str, str], CompiledCaveat]):
+        with self._lock:
+            self._parsers[kind] = parser
+            self._compiled.clear()
+
+    def compile(self, caveat_id: str) -> CompiledCaveat:
+        if not isinstance(caveat_id, str):
+            return Unsatisfiable(repr(caveat_id))
+        compiled = self._compiled.get(caveat_id)
+        if compiled is None:
+            kind, _, arg = caveat_id.partition(":")
+            parser = self._parsers.get(kind)
+            try:
+                compiled = parser(caveat_id, arg) if parser else Unsatisfiable(caveat_id)
+            except CaveatError:
+                compiled = Unsatisfiable(caveat_id)
+            with self._lock:
+                if len(self._compiled) >= 4096:
+                    self._compiled.clear()
+                self._compiled[caveat_id] = compiled
+        return compiled
+
+    def compile_all(self, caveat_ids: Iterable[str]) -> List[CompiledCaveat]:
+        """The compiled caveats, cheapest first."""
+        return sorted((self.compile(c) for c in caveat_ids), key=lambda c: c.cost)
+
+    def charge(self, token_id: str, caveat_ids: Iterable[str], size: int):
+        """Charge `size` written bytes to every byte quota among `caveat_ids`."""
+        for caveat in map(self.compile, caveat_ids):
+            if isinstance(caveat, ByteQuota):
+                self.usage.charge(token_id, caveat.caveat_id, size)
+
+def _parse_time(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise CaveatError(f"Invalid time: {value}")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+CAVEATS = CaveatRegistry()
@@ -2,18 +2,32 @@ import json
 import logging
 from datetime import datetime, timezone
 from typing import Dict, Optional, Any
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives import serialization
 from proxion_core.tokens import Token
 from proxion_core.validator import validate_request, Decision
 from proxion_core.context import RequestContext, Caveat
+from .caveats import CAVEATS, request_facts
+from .keys import key_derivation
+from .token_cache import TokenRevoked, VerifiedTokenCache
 
 class Identity:
     """Core cryptographic identity management for Proxion."""
     
-    def __init__(self, private_key):
+    def __init__(self, private_key, token_cache: Optional[VerifiedTokenCache] = None):
         self.private_key = private_key
         self.public_key = private_key.public_key()
+        # Rehydrated tokens, so repeat requests skip JSON parsing and caveat rebuilding
+        self.token_cache = token_cache or VerifiedTokenCache()
+        # Derived keys and the encoded public key, computed once per master key;
+        # pinned so the shared registry never wipes a key this identity signs with
+        self.keys = key_derivation(private_key, pin=True)
+        self.keys.on_rotate(self.token_cache.clear)
+
+    def rotate(self, private_key):
+        """Switch to a new master key; derived keys and cached tokens are dropped."""
+        self.private_key = private_key
+        self.public_key = private_key.public_key()
+        self.keys.rotate(private_key)
 
     def get_master_seed(self) -> bytes:
         """Get the raw master seed for safe KDF derivation."""
@@ -25,44 +39,35 @@ class Identity:
 
     def get_signing_key(self) -> bytes:
         """Derive an HMAC signing key from the master identity key."""
-        raw_bytes = self.get_master_seed()
-        hkdf = HKDF(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=None,
-            info=b"proxion:token:signing",
-        )
-        return hkdf.derive(raw_bytes)
+        return self.keys.derive(b"proxion:token:signing")
 
     def get_public_key_hex(self) -> str:
         """Get the public key as a hex string."""
-        return self.public_key.public_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PublicFormat.Raw
-        ).hex()
+        return self.keys.public_key_hex
+
+    @staticmethod
+    def _parse_token(token_data: str) -> Token:
+        """Rebuild a Token (and its caveats) from its JSON form."""
+        raw = json.loads(token_data)
+        
+        # Rehydrate Caveats from compiled predicates, cheapest first
+        caveats = [Caveat(c.caveat_id, c.bind(raw["token_id"])) for c in CAVEATS.compile_all(raw.get("caveats", []))]
+        
+        return Token(
+            token_id=raw["token_id"],
+            permissions=frozenset(tuple(p) for p in raw["permissions"]),
+            exp=datetime.fromisoformat(raw["exp"]),
+            aud=raw["aud"],
+            caveats=tuple(caveats), 
+            holder_key_fingerprint=raw["holder_key_fingerprint"],
+            alg=raw.get("alg", "HMAC-SHA256"),
+            signature=raw["signature"]
+        )
 
     def validate_token(self, token_data: str, ctx_data: dict, proof: dict) -> Decision:
         """Validate a Proxion capability token."""
         try:
-            raw = json.loads(token_data)
-            
-            # Rehydrate Caveats
-            caveats = []
-            for cid in raw.get("caveats", []):
-                if cid.startswith("path_prefix:"):
-                    prefix = cid.split(":", 1)[1]
-                    caveats.append(Caveat(cid, lambda ctx, p=prefix: ctx.resource.startswith(p)))
-            
-            token = Token(
-                token_id=raw["token_id"],
-                permissions=frozenset(tuple(p) for p in raw["permissions"]),
-                exp=datetime.fromisoformat(raw["exp"]),
-                aud=raw["aud"],
-                caveats=tuple(caveats), 
-                holder_key_fingerprint=raw["holder_key_fingerprint"],
-                alg=raw.get("alg", "HMAC-SHA256"),
-                signature=raw["signature"]
-            )
+            token = self.token_cache.get_or_verify(token_data, lambda: self._parse_token(token_data))
             
             ctx = RequestContext(
                 action=ctx_data["action"],
@@ -71,16 +76,26 @@ class Identity:
                 now=datetime.now(timezone.utc)
             )
             
-            return validate_request(
-                token=token,
-                ctx=ctx,
-                proof=proof,
-                signing_key=self.get_signing_key()
-            )
+            # Request facts RequestContext cannot carry, for method/CIDR/quota caveats
+            with request_facts(method=ctx_data.get("method"), source_ip=ctx_data.get("source_ip"),
+                               size=ctx_data.get("size")):
+                return validate_request(
+                    token=token,
+                    ctx=ctx,
+                    proof=proof,
+                    signing_key=self.get_signing_key()
+                )
+        except TokenRevoked:
+            return Decision(False, "Token revoked")
         except Exception as e:
             logging.error(f"Identity Validation Traceback: {e}")
             return Decision(False, f"Validation Error: {str(e)}")
 
+    def charge_quota(self, token_data: str, size: int):
+        """Charge `size` bytes written under the token to its byte_quota caveats."""
+        raw = json.loads(token_data)
+        CAVEATS.charge(raw["token_id"], raw.get("caveats", []), size)
+
     def sign_challenge(self, challenge: bytes) -> bytes:
         """Sign a challenge for Proof-of-Possession (PoP)."""
         # Note: Implement specific PoP signing logic if different from standard signatures
@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+def _zeroize(buf: bytearray):
+    buf[:] = bytes(len(buf))
+
+def _public_bytes(master_key) -> bytes:
+    return master_key.public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw
+    )
+
+class KeyDerivation:
+    """
+    HKDF-SHA256 derivations from one Ed25519 master key, memoized by info label.
+
+    The raw seed is exported once and every (info, length) pair is derived
+    once; the hex-encoded public key is also cached. Seed and derived keys
+    are held in bytearrays that are overwritten with zeros when dropped by
+    invalidate(), rotate() or close(). Callers receive immutable copies,
+    which Python cannot wipe, so keep them no longer than needed. derive()
+    on a closed instance raises rather than deriving from the wiped seed.
+
+    rotate() swaps in a new master key and runs the on_rotate() hooks so
+    caches built on the old key (e.g. verified tokens) can be cleared.
+    """
+    def __init__(self, master_key):
+        self._lock = threading.Lock()
+        self._hooks: List[Callable[[], None]] = []
+        self.pinned = False  # Set by long-lived holders (Identity); the registry never evicts it
+        self._load(master_key)
+
+    def _load(self, master_key):
+        self.master_key = master_key
+        self._closed = False
+        self._seed = bytearray(master_key.private_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PrivateFormat.Raw,
+            encryption_algorithm=serialization.NoEncryption()
+        ))
+        self._derived: Dict[Tuple[bytes, int], bytearray] = {}
+        self._public_key_hex = _public_bytes(master_key).hex()
+
+    @property
+    def public_key_hex(self) -> str:
+        return self._public_key_hex
+
+    def derive(self, info: bytes, length: int = 32) -> bytes:
+        key = (info, length)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("KeyDerivation is closed")
+            derived = self._derived.get(key)
+            if derived is None:
+                hkdf = HKDF(algorithm=hashes.SHA256(), length=length, salt=None, info=info)
+                derived = self._derived[key] = bytearray(hkdf.derive(self._seed))
+            return bytes(derived)
+
+    def invalidate(self, info: bytes = None):
+        """Drop (and zeroize) the keys derived for `info`, or all of them."""
+        with self._lock:
+            for key in [k for k in self._derived if info is None or k[0] == info]:
+                _zeroize(self._derived.pop(key))
+
+    def on_rotate(self, hook: Callable[[], None]):
+        self._hooks.append(hook)
+
+    def rotate(self, master_key):
+        """Replace the master key, wiping everything derived from the old one."""
+        old = self.master_key
+        with self._lock:
+            self._wipe()
+            self._load(master_key)
+        _rekey(old, self)
+        for hook in list(self._hooks):
+            hook()
+
+    def _wipe(self):
+        for derived in self._derived.values():
+            _zeroize(derived)
+        self._derived.clear()
+        _zeroize(self._seed)
+
+    def close(self):
+        with self._lock:
+            self._wipe()
+            self._closed = True
+
+# Shared services by raw public key, so every caller deriving from the
+# process identity key hits the same table, even with a freshly loaded key
+# object. At most _MAX_SERVICES unpinned services are kept; evicted ones are
+# wiped, but a pinned service (held by an Identity) is never evicted.
+_MAX_SERVICES = 8
+_services: "OrderedDict[bytes, KeyDerivation]" = OrderedDict()
+_services_lock = threading.Lock()
+
+def key_derivation(master_key, pin: bool = False) -> KeyDerivation:
+    """The shared KeyDerivation for `master_key`; `pin` keeps it out of eviction."""
+    public = _public_bytes(master_key)
+    with _services_lock:
+        service = _services.get(public)
+        if service is None:
+            service = _services[public] = KeyDerivation(master_key)
+        _services.move_to_end(public)
+        service.pinned = service.pinned or pin
+        evictable = [k for k, s in _services.items() if not s.pinned]
+        evicted = [_services.pop(k) for k in evictable[:max(0, len(evictable) - _MAX_SERVICES)]]
+    for old in evicted:
+        old.close()
+    return service
+
+def _rekey(old_key, service: KeyDerivation):
+    with _services_lock:
+        old = _public_bytes(old_key)
+        if _services.get(old) is service:
+            del _services[old]
+        _services[_public_bytes(service.master_key)] = service
@@ -0,0 +1,72 @@
+"""
+Compiled permission sets.
+
+A token's (action, resource) tuples are indexed once so every check is a
+few dict lookups, however many permissions were delegated to it:
+
+- exact pairs live in a set;
+- "*" as the resource grants the action on everything, "*" as the action
+  grants every action on the resource;
+- a requested "rs:wg0" also matches a granted "wg0" (the part after the
+  first ":").
+
+These are exactly the rules of proxion_core's validate_request, which
+authorizes /pod requests, so the RS decorators (require_capability,
+require_approval) and /pod agree on every token. A "path/*" resource is
+an ordinary exact resource here, as it is there. Only `token.permissions`
+is read, so any token type works.
+"""
+from typing import Any, FrozenSet, Iterable, Set, Tuple
+
+WILDCARD = "*"
+
+class PermissionSet:
+    """Index over (action, resource) permissions; see the module docstring."""
+    __slots__ = ("source", "actions", "_exact", "_any_resource")
+
+    def __init__(self, permissions: Iterable[Tuple[str, str]]):
+        self.source = permissions
+        self._exact: Set[Tuple[str, str]] = set()
+        self._any_resource: Set[str] = set()
+        actions = set()
+        for action, resource in permissions:
+            actions.add(action)
+            if resource == WILDCARD:
+                self._any_resource.add(action)
+            else:
+                self._exact.add((action, resource))
+        self.actions: FrozenSet[str] = frozenset(actions)
+
+    def __len__(self) -> int:
+        return len(self._exact) + len(self._any_resource)
+
+    def has_action(self, action: str) -> bool:
+        """Whether any permission names exactly `action` (on any resource)."""
+        return action in self.actions
+
+    def allows(self, action: str, resource: str) -> bool:
+        # Same split as validate_request: "a:b:c" matches a granted "b"
+        suffix = resource.split(":")[1] if ":" in resource else None
+        for act in (action, WILDCARD):
+            if act in self._any_resource or (act, resource) in self._exact:
+                return True
+            if suffix is not None and (act, suffix) in self._exact:
+                return True
+        return False
+
+def compile_permissions(token: Any) -> PermissionSet:
+    """The PermissionSet for `token`, built once and kept on the token.
+
+    Cached tokens are reused across requests, so the index is too. It is
+    rebuilt if the token's permissions object is replaced.
+    """
+    permissions = token.permissions
+    compiled = getattr(token, "_permission_set", None)
+    if compiled is not None and compiled.source is permissions:
+        return compiled
+    compiled = PermissionSet(permissions)
+    try:
+        object.__setattr__(token, "_permission_set", compiled)
+    except (AttributeError, TypeError):
+        pass  # Slotted token type; compile per call
+    return compiled
@@ -0,0 +1,216 @@
+"""
+Revocation list with proactive expiry and incremental distribution.
+
+- Every revocation carries an expiry. A min-heap on expiry purges entries
+  as soon as they lapse, so memory tracks the revocations that are live
+  now, not every revocation ever issued.
+- A Bloom filter over the live ids answers the common "not revoked" case
+  without taking the lock. Bits are never cleared in place: a purged id
+  still sets its bits until the filter is rebuilt (swapped in whole) once
+  stale ids pile up, and a false positive only costs the locked check.
+- Each revocation bumps a version. snapshot() is cached per state and
+  diff(since_version) returns only the revocations after a version, so CRL
+  consumers can poll incrementally. The epoch changes whenever a list is
+  created, so a replica of an earlier list knows to start over.
+
+One entry is a single (expires_at, version, token_id) tuple shared by the
+index, the heap and the version log: about 250 bytes per live id including
+the id string, plus ~1.2 bytes of filter per id of `capacity`.
+"""
+import hashlib
+import heapq
+import math
+import secrets
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+Item = Tuple[float, int, str]  # (expires_at timestamp, version, token_id)
+
+@dataclass(frozen=True)
+class RevocationSnapshot:
+    """Revocations as of `version`: the full list (reset) or a diff."""
+    epoch: str
+    version: int
+    revoked: Tuple[Tuple[str, float], ...]  # (token_id, expires_at timestamp)
+    reset: bool = True
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (blake2b double hashing)."""
+    __slots__ = ("capacity", "size", "hashes", "bits")
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01):
+        self.capacity = capacity
+        self.size = max(64, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits, size = self.bits, self.size
+        for i in range(self.hashes):  # Most misses stop at the first clear bit
+            pos = (h1 + i * h2) % size
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+class RevocationList:
+    """Revoked token ids until their expiry; see the module docstring.
+
+    `capacity` sizes the Bloom filter (it doubles if the live list outgrows
+    it); `fp_rate` is the target false-positive rate at that size.
+    """
+    def __init__(self, capacity: int = 65536, fp_rate: float = 0.01, default_ttl: int = 3600) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Item] = {}
+        self._heap: List[Item] = []
+        self._log: List[Item] = []  # Version order; may hold superseded or purged items
+        self._fp_rate = fp_rate
+        self._bloom = BloomFilter(capacity, fp_rate)
+        self._stale = 0  # Ids still set in the filter but no longer live
+        self._snapshot: Optional[RevocationSnapshot] = None
+        self.default_ttl = default_ttl
+        self.epoch = secrets.token_hex(8)
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def revoke(self, token_or_token_id: Union[Any, str], now: datetime, ttl_seconds: Optional[int] = None) -> str:
+        tid = _token_id(token_or_token_id)
+        expires_at = now + timedelta(seconds=ttl_seconds if ttl_seconds else self.default_ttl)
+        with self._lock:
+            self._purge(now.timestamp())
+            self._add(tid, expires_at.timestamp())
+        return tid
+
+    def _add(self, tid: str, expires_at: float):
+        if tid in self._entries:
+            self._stale += 1  # Re-revoked; the old item is superseded
+        self.version += 1
+        item = (expires_at, self.version, tid)
+        # Filter first, so a lock-free reader never misses a live entry
+        self._bloom.add(tid)
+        self._entries[tid] = item
+        heapq.heappush(self._heap, item)
+        self._log.append(item)
+        self._snapshot = None
+        if len(self._entries) > self._bloom.capacity:
+            self._rebuild(self._bloom.capacity * 2)
+
+    def is_revoked(self, token_or_token_id: Union[Any, str], now: datetime) -> bool:
+        tid = _token_id(token_or_token_id)
+        if tid not in self._bloom:  # Lock-free fast path
+            return False
+        with self._lock:
+            self._purge(now.timestamp())
+            item = self._entries.get(tid)
+            return item is not None and now.timestamp() <= item[0]
+
+    def purge(self, now: datetime) -> int:
+        """Drop expired entries; returns how many were removed."""
+        with self._lock:
+            return self._purge(now.timestamp())
+
+    def _purge(self, now: float) -> int:
+        removed = 0
+        heap = self._heap
+        while heap and heap[0][0] < now:
+            item = heapq.heappop(heap)
+            if self._entries.get(item[2]) is item:
+                del self._entries[item[2]]
+                removed += 1
+        if removed:
+            self._stale += removed
+            self._snapshot = None
+            if self._stale > max(1024, len(self._entries)):
+                self._rebuild(self._bloom.capacity)
+        return removed
+
+    def _rebuild(self, capacity: int):
+        """Fresh filter and compacted log from the live entries."""
+        bloom = BloomFilter(capacity, self._fp_rate)
+        for tid in self._entries:
+            bloom.add(tid)
+        self._bloom = bloom  # Atomic swap for lock-free readers
+        self._log = sorted(self._entries.values(), key=lambda item: item[1])
+        self._heap = list(self._log)
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def _live(self, items: Iterable[Item]) -> Tuple[Tuple[str, float], ...]:
+        entries = self._entries
+        return tuple((item[2], item[0]) for item in items if entries.get(item[2]) is item)
+
+    def snapshot(self) -> RevocationSnapshot:
+        """Every live revocation; cached until the list changes."""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = RevocationSnapshot(self.epoch, self.version, self._live(self._log))
+            return self._snapshot
+
+    def diff(self, since_version: int, epoch: Optional[str] = None) -> RevocationSnapshot:
+        """Revocations made after `since_version`.
+
+        Expired entries are not reported; replicas expire them on their own
+        clocks. A version or epoch from another list yields a full snapshot
+        (reset=True) instead.
+        """
+        if (epoch is not None and epoch != self.epoch) or since_version > self.version:
+            return self.snapshot()
+        with self._lock:
+            start = _after_version(self._log, since_version)
+            return RevocationSnapshot(self.epoch, self.version, self._live(self._log[start:]), reset=False)
+
+    def apply(self, snapshot: RevocationSnapshot, now: datetime) -> int:
+        """Load a snapshot or diff from another list; returns its version to poll from next."""
+        with self._lock:
+            if snapshot.reset:
+                self._entries.clear()
+                self._rebuild(self._bloom.capacity)
+                self._snapshot = None
+            now_ts = now.timestamp()
+            for tid, expires_at in snapshot.revoked:
+                if expires_at >= now_ts:
+                    self._add(tid, expires_at)
+        return snapshot.version
+
+    def get_crl(self) -> List[str]:
+        return [tid for tid, _ in self.snapshot().revoked]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "version": self.version,
+                "bloom_bytes": len(self._bloom.bits),
+                "bloom_capacity": self._bloom.capacity,
+                "stale": self._stale,
+            }
+
+def _after_version(log: List[Item], version: int) -> int:
+    """Index of the first item in version-ordered `log` newer than `version`."""
+    lo, hi = 0, len(log)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if log[mid][1] <= version:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _token_id(token_or_token_id: Union[Any, str]) -> str:
+    return token_or_token_id if isinstance(token_or_token_id, str) else token_or_token_id.token_id
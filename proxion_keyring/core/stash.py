@@ -2,6 +2,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 from proxion_core.tokens import issue_token
 from proxion_core.context import Caveat
+from .caveats import CAVEATS
 
 class Stash:
     """Unified storage hub and Solid session management."""
@@ -19,7 +20,8 @@ class Stash:
         caveats = []
         if path_prefix != "/":
             # Add attenuation caveat
-            caveats.append(Caveat(f"path_prefix:{path_prefix}", lambda ctx: True)) 
+            caveat = CAVEATS.compile(f"path_prefix:{path_prefix}")
+            caveats.append(Caveat(caveat.caveat_id, caveat.bind()))
         
         token = issue_token(
             permissions=permissions,
@@ -46,10 +48,8 @@ class Stash:
     def storage_delete(self, path: str) -> bool:
         """Delete a file or directory from the Unified Stash."""
         if self.pod_proxy:
-             hub = self.pod_proxy.hub
-             provider, subpath = hub._route(path)
-             if provider and hasattr(provider, 'delete'):
-                 return provider.delete(subpath)
+             # Route through the hub so its attribute cache sees the mutation
+             return self.pod_proxy.hub.delete(path)
         return False
     def storage_ls(self, path: str = "/") -> list:
         """List files/folders in the Unified Stash via HybridHub."""
@@ -57,12 +57,9 @@ class Stash:
             return []
             
         hub = self.pod_proxy.hub
-        entries = hub.list_dir(path)
-        
         results = []
-        for e in entries:
+        for e, attr in hub.list_dir_with_attrs(path):
             full_path = "/".join([path.rstrip('/'), e]).replace("//", "/")
-            attr = hub.get_attr(full_path)
             if attr:
                 is_dir = bool(attr['st_mode'] & 0o40000)
                 results.append({
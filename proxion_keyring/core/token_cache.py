@@ -0,0 +1,82 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+class TokenRevoked(ValueError):
+    """Raised when a cached or freshly verified token is on the revocation list."""
+
+class VerifiedTokenCache:
+    """
+    Bounded cache of verified, rehydrated tokens.
+
+    Entries are keyed by a SHA-256 digest of the raw token string (plus a
+    scope naming how it was verified), and live until the token's own
+    expiry or `ttl` seconds, whichever comes first. Failed verifications
+    are never cached. When a `revocation_list` is attached, every lookup,
+    hit or miss, is checked against it, so revoking a token takes effect on
+    the next request.
+    """
+    def __init__(self, revocation_list=None, max_entries: int = 4096, ttl: float = 300.0):
+        self.revocation_list = revocation_list
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[bytes, str], Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_verify(self, token_str: str, verify: Callable[[], Any], scope: str = "") -> Any:
+        """Return the cached token for `token_str`, or verify() it and cache the result."""
+        key = (hashlib.sha256(token_str.encode()).digest(), scope)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                token = entry[0]
+            else:
+                if entry:
+                    del self._entries[key]
+                token = None
+        if token is None:
+            token = verify()
+            self._store(key, token, now)
+            with self._lock:
+                self.misses += 1
+        self._check_revoked(token)
+        return token
+
+    def _store(self, key: Tuple[bytes, str], token: Any, now: float):
+        expires = now + self.ttl
+        exp = getattr(token, "exp", None)
+        if isinstance(exp, datetime):
+            expires = min(expires, exp.timestamp())
+        if expires <= now:
+            return
+        with self._lock:
+            self._entries[key] = (token, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _check_revoked(self, token: Any):
+        if self.revocation_list is not None and self.revocation_list.is_revoked(token, datetime.now(timezone.utc)):
+            raise TokenRevoked("Token Revoked")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else None,
+            }
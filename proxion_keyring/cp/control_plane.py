@@ -18,9 +18,9 @@ from proxion_core import (
     issue_token,
     mint_ticket,
     redeem_ticket,
-    RevocationList
 )
 from proxion_core.serialization import TokenSerializer
+from ..core.revocation import RevocationList
 
 
 @dataclass(frozen=True)
@@ -183,3 +183,9 @@ class ControlPlane:
         """Return list of revoked token IDs (simulated CRL)."""
         return self._revocation_list.get_crl()
 
+    def get_crl_since(self, version: int | None = None, epoch: str | None = None):
+        """Revocations after `version`; a full snapshot without one or if the epoch changed."""
+        if version is None:
+            return self._revocation_list.snapshot()
+        return self._revocation_list.diff(version, epoch)
+
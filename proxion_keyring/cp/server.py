@@ -103,13 +103,23 @@ def revoke():
 
 @app.route("/crl", methods=["GET"])
 def get_crl():
-    """Serve the Certificate Revocation List."""
+    """Serve the Certificate Revocation List.
+
+    ?since=<version>&epoch=<epoch> returns only newer revocations; the
+    response's version and epoch are what to send on the next poll.
+    """
     try:
-        crl = cp.get_crl()
+        crl = cp.get_crl_since(request.args.get("since", type=int), request.args.get("epoch"))
         import sys
-        sys.stderr.write(f"CP: Serving CRL with {len(crl)} entries\n")
+        sys.stderr.write(f"CP: Serving CRL with {len(crl.revoked)} entries (version {crl.version})\n")
         sys.stderr.flush()
-        return jsonify({"revoked_tokens": crl}), 200
+        return jsonify({
+            "revoked_tokens": [tid for tid, _ in crl.revoked],
+            "expires_at": {tid: expires_at for tid, expires_at in crl.revoked},
+            "version": crl.version,
+            "epoch": crl.epoch,
+            "reset": crl.reset,
+        }), 200
     except Exception as e:
         import traceback
         traceback.print_exc()
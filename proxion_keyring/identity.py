@@ -4,8 +4,8 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional
 from cryptography.hazmat.primitives.asymmetric import ed25519
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives import serialization
+from .core.keys import key_derivation
 
 def load_or_create_identity_key(key_path="identity_private.pem"):
     """
@@ -40,41 +40,17 @@ def load_or_create_identity_key(key_path="identity_private.pem"):
 def derive_child_key(master_key: ed25519.Ed25519PrivateKey, context: str) -> ed25519.Ed25519PrivateKey:
     """
     Derive a deterministic child key for a specific context (Unlinkability).
-    Uses HKDF-SHA256.
+    Uses HKDF-SHA256 (memoized per master key and context).
     """
-    # Get raw 32-byte seed from master key
-    raw_bytes = master_key.private_bytes(
-        encoding=serialization.Encoding.Raw,
-        format=serialization.PrivateFormat.Raw,
-        encryption_algorithm=serialization.NoEncryption()
-    )
-    
-    hkdf = HKDF(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=None,
-        info=context.encode(),
-    )
-    derived_bytes = hkdf.derive(raw_bytes)
+    derived_bytes = key_derivation(master_key).derive(context.encode())
     return ed25519.Ed25519PrivateKey.from_private_bytes(derived_bytes)
 
 def derive_app_password(master_key: ed25519.Ed25519PrivateKey, app_name: str) -> str:
     """
     Derive a deterministic 16-char password for an app (e.g. adguard).
-    Uses HKDF-SHA256 of the master key seed.
+    Uses HKDF-SHA256 of the master key seed (memoized per master key and app).
     """
-    raw_bytes = master_key.private_bytes(
-        encoding=serialization.Encoding.Raw,
-        format=serialization.PrivateFormat.Raw,
-        encryption_algorithm=serialization.NoEncryption()
-    )
-    hkdf = HKDF(
-        algorithm=hashes.SHA256(),
-        length=16,
-        salt=None,
-        info=f"app:password:{app_name}".encode(),
-    )
-    derived = hkdf.derive(raw_bytes)
+    derived = key_derivation(master_key).derive(f"app:password:{app_name}".encode(), length=16)
     # Hex for easy typing if needed, but we typically use it only in the backend.
     return derived.hex()[:16]
 
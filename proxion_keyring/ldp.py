@@ -0,0 +1,257 @@
+"""
+Minimal LDP container parsing for remote Solid pods.
+
+Solid servers describe containers in Turtle (always available) or JSON-LD.
+Only the handful of terms needed to list a container are interpreted:
+ldp:contains plus the per-member metadata servers commonly inline
+(rdf:type, posix:size, posix:mtime, dcterms:modified).
+"""
+import json
+import re
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple, Any
+from urllib.parse import urljoin
+
+LDP = "http://www.w3.org/ns/ldp#"
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+POSIX = "http://www.w3.org/ns/posix/stat#"
+DCTERMS_MODIFIED = "http://purl.org/dc/terms/modified"
+CONTAINER_TYPES = {LDP + "Container", LDP + "BasicContainer"}
+
+_TOKEN = re.compile(r'''
+    (?P<ws>\s+|\#[^\n]*)
+  | (?P<iri><[^>]*>)
+  | (?P<literal>"""(?:[^"\\]|\\.|"(?!""))*"""|"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<datatype>\^\^)
+  | (?P<keyword>@[A-Za-z][A-Za-z0-9-]*)
+  | (?P<punct>[;,.\[\]()])
+  | (?P<number>[+-]?(?:\d*\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<pname>(?:[A-Za-z_][\w.-]*)?:(?:(?:[\w-]|%[0-9A-Fa-f]{2})(?:[\w.-]*[\w-])?)?)
+  | (?P<bare>[A-Za-z_][\w-]*)
+''', re.VERBOSE)
+
+_ESCAPE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))', re.DOTALL)
+_ECHARS = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f", '"': '"', "'": "'", "\\": "\\"}
+
+def _unescape(text: str) -> str:
+    """Undo Turtle string escapes (ECHAR and \\u/\\U); other text passes through untouched."""
+    def replace(m):
+        code = m.group(1) or m.group(2)
+        if code:
+            return chr(int(code, 16))
+        if m.group(3) not in _ECHARS:
+            raise ValueError(f"Invalid escape \\{m.group(3)} in literal")
+        return _ECHARS[m.group(3)]
+    return _ESCAPE.sub(replace, text)
+
+def _resolve(base: str, ref: str) -> str:
+    """urljoin that keeps empty fragments (namespace IRIs end in '#')."""
+    resolved = urljoin(base, ref)
+    return resolved + "#" if ref.endswith("#") and not resolved.endswith("#") else resolved
+
+def _tokens(text: str):
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise ValueError(f"Unparseable Turtle near {text[pos:pos + 20]!r}")
+        pos = m.end()
+        if m.lastgroup != "ws":
+            yield m
+
+def parse_turtle(text: str, base: str) -> List[Tuple[str, str, Any]]:
+    """Parse the Turtle subset servers emit for containers into (s, p, o) triples.
+
+    IRIs come back absolute; literals come back as plain Python values
+    (int/float for numeric tokens and numeric datatypes, else str).
+    Blank-node property lists and collections are skipped.
+    """
+    prefixes: Dict[str, str] = {}
+    triples: List[Tuple[str, str, Any]] = []
+    toks = list(_tokens(text))
+    i = 0
+
+    def term(m):
+        kind, text = m.lastgroup, m.group()
+        if kind == "iri":
+            return _resolve(base, text[1:-1])
+        if kind == "pname":
+            prefix, _, local = text.partition(":")
+            if prefix not in prefixes:
+                raise ValueError(f"Unknown prefix {prefix!r}")
+            return prefixes[prefix] + local
+        if kind == "bare":
+            return {"a": RDF_TYPE, "true": True, "false": False}.get(text, text)
+        if kind == "number":
+            return int(text) if re.fullmatch(r"[+-]?\d+", text) else float(text)
+        raise ValueError(f"Unexpected token {text!r}")
+
+    def literal(index):
+        raw = toks[index].group()
+        quote = 3 if raw[:3] in ('"""', "'''") else 1
+        value = _unescape(raw[quote:-quote]) if "\\" in raw else raw[quote:-quote]
+        index += 1
+        if index < len(toks) and toks[index].lastgroup == "keyword":
+            index += 1
+        elif index < len(toks) and toks[index].lastgroup == "datatype":
+            datatype = term(toks[index + 1])
+            index += 2
+            if datatype.endswith(("#integer", "#int", "#long", "#nonNegativeInteger")):
+                value = int(value)
+            elif datatype.endswith(("#decimal", "#double", "#float")):
+                value = float(value)
+        return value, index
+
+    def skip_nested(index):
+        depth = 0
+        while index < len(toks):
+            g = toks[index].group()
+            if g in ("[", "("):
+                depth += 1
+            elif g in ("]", ")"):
+                depth -= 1
+                if not depth:
+                    return index + 1
+            index += 1
+        return index
+
+    def obj(index):
+        m = toks[index]
+        if m.lastgroup == "literal":
+            return literal(index)
+        if m.group() in ("[", "("):
+            return None, skip_nested(index)
+        return term(m), index + 1
+
+    while i < len(toks):
+        g = toks[i].group()
+        if g.lower() in ("@prefix", "prefix"):
+            name = toks[i + 1].group()[:-1]
+            prefixes[name] = _resolve(base, toks[i + 2].group()[1:-1])
+            i += 3
+            if i < len(toks) and toks[i].group() == ".":
+                i += 1
+            continue
+        if g.lower() in ("@base", "base"):
+            base = _resolve(base, toks[i + 1].group()[1:-1])
+            i += 2
+            if i < len(toks) and toks[i].group() == ".":
+                i += 1
+            continue
+        if g in ("[", "("):
+            i = skip_nested(i)
+            continue
+
+        subject = term(toks[i])
+        i += 1
+        while i < len(toks):
+            predicate = term(toks[i])
+            i += 1
+            while True:
+                value, i = obj(i)
+                if value is not None:
+                    triples.append((subject, predicate, value))
+                if i < len(toks) and toks[i].group() == ",":
+                    i += 1
+                    continue
+                break
+            if i < len(toks) and toks[i].group() == ";":
+                i += 1
+                # Trailing ';' before '.' is legal
+                if i < len(toks) and toks[i].group() == ".":
+                    break
+                continue
+            break
+        if i < len(toks) and toks[i].group() == ".":
+            i += 1
+    return triples
+
+def parse_jsonld(text: str, base: str) -> List[Tuple[str, str, Any]]:
+    """Flatten expanded or compact-with-full-IRIs JSON-LD node objects into triples."""
+    doc = json.loads(text)
+    nodes = doc.get("@graph", [doc]) if isinstance(doc, dict) else doc
+    context = {}
+    if isinstance(doc, dict) and isinstance(doc.get("@context"), dict):
+        context = {k: v for k, v in doc["@context"].items() if isinstance(v, str)}
+
+    def expand(key: str) -> str:
+        prefix, sep, local = key.partition(":")
+        if sep and prefix in context:
+            return context[prefix] + local
+        return context.get(key, key)
+
+    triples = []
+    for node in nodes:
+        subject = _resolve(base, node.get("@id", ""))
+        for key, values in node.items():
+            if key in ("@id", "@context"):
+                continue
+            predicate = RDF_TYPE if key == "@type" else expand(key)
+            for value in values if isinstance(values, list) else [values]:
+                if isinstance(value, dict):
+                    value = _resolve(base, value["@id"]) if "@id" in value else value.get("@value")
+                elif key == "@type":
+                    value = expand(value)
+                if value is not None:
+                    triples.append((subject, predicate, value))
+    return triples
+
+def _timestamp(value) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+def http_timestamp(value: Optional[str]) -> float:
+    """Parse a Last-Modified header, defaulting to 0."""
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+def container_members(triples: List[Tuple[str, str, Any]], container_url: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Return (member url, partial attr) for each ldp:contains member.
+
+    The attr dict only carries what the listing itself stated; it has
+    `complete=True` when type, size and mtime were all present.
+    """
+    members = [o for s, p, o in triples if s == container_url and p == LDP + "contains"]
+    facts: Dict[str, Dict[str, Any]] = {m: {} for m in members}
+    for s, p, o in triples:
+        meta = facts.get(s)
+        if meta is None:
+            continue
+        if p == RDF_TYPE and o in CONTAINER_TYPES:
+            meta["is_dir"] = True
+        elif p == POSIX + "size":
+            meta["st_size"] = int(o)
+        elif p == POSIX + "mtime":
+            meta["st_mtime"] = float(o)
+        elif p == DCTERMS_MODIFIED and "st_mtime" not in meta:
+            ts = _timestamp(o)
+            if ts is not None:
+                meta["st_mtime"] = ts
+    for url in members:
+        meta = facts[url]
+        meta.setdefault("is_dir", url.endswith("/"))
+        if meta["is_dir"]:
+            meta.setdefault("st_size", 0)
+        meta["complete"] = "st_size" in meta and "st_mtime" in meta
+    return [(url, facts[url]) for url in members]
+
+def parse_container(body: str, content_type: str, container_url: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Parse a container representation (Turtle or JSON-LD) into its members.
+
+    Raises ValueError for any body it cannot make sense of.
+    """
+    try:
+        if "json" in (content_type or ""):
+            triples = parse_jsonld(body, container_url)
+        else:
+            triples = parse_turtle(body, container_url)
+        return container_members(triples, container_url)
+    except (IndexError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Malformed container representation: {e!r}") from e
@@ -31,8 +31,9 @@ class Lens:
         
         self.data_dir = data_dir
         self.index_path = os.path.join(data_dir, "lens_index.json")
+        self.cursor_path = os.path.join(data_dir, "lens_pod_cursor")
         self.index: List[Dict[str, Any]] = []
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()  # scan_mounts saves the index while holding it
         self._stop_event = threading.Event()
         self.is_scanning = False
         
@@ -50,6 +51,17 @@ class Lens:
                 except:
                     self.index = []
 
+    def _load_cursor(self):
+        try:
+            with open(self.cursor_path, 'r') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _save_cursor(self, cursor):
+        with open(self.cursor_path, 'w') as f:
+            f.write(cursor or "")
+
     def _save_index(self):
         with self._lock:
             with open(self.index_path, 'w') as f:
@@ -109,7 +121,9 @@ class Lens:
         # 2. Virtual Pod Space (Solid Stash)
         if self.manager and hasattr(self.manager, 'pod_proxy') and self.manager.pod_proxy:
             print("[Lens] Indexing Solid Pod Space...")
-            self._scan_pod_recursive(self.manager.pod_proxy.hub, "/", new_index)
+            with self._lock:
+                previous = [item for item in self.index if item.get("drive") == "POD:"]
+            new_index.extend(self._index_pod(self.manager.pod_proxy, previous))
 
         with self._lock:
             self.index = new_index
@@ -118,30 +132,94 @@ class Lens:
         self.is_scanning = False
         print(f"[Lens] Scan complete. Indexed {len(self.index)} items.")
 
+    def _index_pod(self, pod_proxy, previous):
+        """Pod entries: journal changes applied to `previous` when the saved
+        cursor is still usable, otherwise a full walk of the hub. Mounts
+        without a journal (remote pods) are always walked."""
+        journals = getattr(pod_proxy, 'journals', None)
+        cursor = self._load_cursor()
+        if journals and cursor and previous:
+            try:
+                hub = pod_proxy.hub
+                unjournaled = set(hub.mounts) - set(journals.mounts)
+                # First segment not a mount: the primary's files merged into the root
+                entries = {
+                    item["path"]: item for item in previous
+                    if item["path"].split("/")[2] not in unjournaled
+                }
+                for name in sorted(unjournaled):
+                    walked = []
+                    self._scan_pod_recursive(hub, f"/{name}", walked)
+                    entries.update((item["path"], item) for item in walked)
+                while True:
+                    page = journals.changes(cursor, 1000)
+                    if page["reset"]:
+                        raise LookupError(f"journal reset for {page['reset']}")
+                    for change in page["changes"]:
+                        self._apply_pod_change(hub, entries, change)
+                    cursor = page["cursor"]
+                    if not page["has_more"]:
+                        break
+                self._save_cursor(cursor)
+                print("[Lens] Pod index updated incrementally.")
+                return list(entries.values())
+            except Exception as e:
+                print(f"[Lens] Incremental pod update failed ({e}); rescanning.")
+
+        # Position taken before the walk, so changes made during it are replayed next time
+        cursor = journals.changes(None)["cursor"] if journals else None
+        results = []
+        self._scan_pod_recursive(pod_proxy.hub, "/", results)
+        self._save_cursor(cursor)
+        return results
+
+    def _apply_pod_change(self, hub, entries, change):
+        if change["is_dir"]:
+            return
+        paths = [change["path"]]
+        # The primary mount is also merged into the pod root
+        mounted = hub.mounts.get(change["mount"])
+        if mounted is not None and getattr(hub, 'primary_provider', None) is mounted:
+            paths.append(change["path"][len(change["mount"]) + 1:])
+        for path in paths:
+            key = f"/pod/{path}"
+            if change["op"] == "Delete":
+                entries.pop(key, None)
+            else:
+                entries[key] = self._pod_entry(key, change["size"], change["mtime"], "synced")
+
+    @staticmethod
+    def _pod_entry(path, size, mtime, status):
+        name = path.rsplit("/", 1)[-1]
+        return {
+            "name": name,
+            "path": path,
+            "drive": "POD:",
+            "label": "Solid Stash",
+            "size": size,
+            "mtime": mtime,
+            "type": os.path.splitext(name)[1].lower(),
+            "proxion_status": status
+        }
+
     def _scan_pod_recursive(self, hub, path, results):
         """Recursively walk the HybridHub."""
         try:
-            entries = hub.list_dir(path)
-            for e in entries:
+            for e, attr in hub.list_dir_with_attrs(path):
                 if e in [".", ".."]: continue
                 full_p = os.path.join(path, e).replace("\\", "/")
-                attr = hub.get_attr(full_p)
                 if not attr: continue
                 
                 is_dir = bool(attr['st_mode'] & 0o40000)
                 if is_dir:
                     self._scan_pod_recursive(hub, full_p, results)
                 else:
-                    results.append({
-                        "name": e,
-                        "path": f"/pod{full_p}",
-                        "drive": "POD:",
-                        "label": "Solid Stash",
-                        "size": attr.get('st_size', 0),
-                        "mtime": attr.get('st_mtime', 0),
-                        "type": os.path.splitext(e)[1].lower(),
-                        "proxion_status": attr.get("proxion_status", "unknown")
-                    })
+                    results.append(self._pod_entry(
+                        f"/pod{full_p}",
+                        attr.get('st_size', 0),
+                        attr.get('st_mtime', 0),
+                        attr.get("proxion_status", "unknown")
+                    ))
         except:
             pass
 
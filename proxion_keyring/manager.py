@@ -7,7 +7,7 @@ from .core.identity import Identity
 from .core.tunnel import Tunnel, TunnelManager
 from .core.stash import Stash
 from .scout import SecurityCouncil
-from proxion_core import RevocationList
+from .core.revocation import RevocationList
 
 class KeyringManager:
     """
@@ -49,6 +49,7 @@ class KeyringManager:
 
         # 6. Security & Revocation (Compliance)
         self.revocation_list = RevocationList()
+        self.identity.token_cache.revocation_list = self.revocation_list
 
         # Legacy / Extra Components (To be modularized later)
         from .warden import Warden
@@ -132,6 +133,9 @@ class KeyringManager:
     def validate_token(self, token_data: str, ctx_data: dict, proof: dict):
         return self.identity.validate_token(token_data, ctx_data, proof)
 
+    def charge_quota(self, token_data: str, size: int):
+        return self.identity.charge_quota(token_data, size)
+
     def sign_challenge(self, challenge: bytes) -> bytes:
         return self.identity.sign_challenge(challenge)
 
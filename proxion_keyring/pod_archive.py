@@ -0,0 +1,289 @@
+import posixpath
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+ARCHIVE_TYPES = {"tar": "application/x-tar", "zip": "application/zip"}
+
+# (action, pod path, size) -> whether the caller may do it
+Authorize = Callable[[str, str, Optional[int]], bool]
+
+class ArchiveError(Exception):
+    """Raised for malformed or unsafe archives; `status` is the HTTP code to return."""
+    def __init__(self, message: str, status: int = 400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+class _Sink:
+    """Write-only file object that collects output for a generator to drain."""
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+class ArchiveExporter:
+    """
+    Streams a container subtree as a tar or zip archive.
+
+    The tree is walked depth-first through the hub, and each file is copied
+    from read_stream straight into the archive, so memory stays at one chunk
+    and nothing touches a temp file. Tar headers are sized from the listing
+    attrs; a file that changes size mid-walk is truncated or zero-padded to
+    keep the archive well-formed. Zip entries are stored (not deflated) with
+    data descriptors, since the output is not seekable. With `authorize`,
+    entries the caller may not READ are left out, along with their subtrees.
+    """
+    TAR_BLOCK = 512
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def walk(self, pod_path: str, prefix: str = "",
+             authorize: Optional[Authorize] = None) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield (pod path, archive name, attr) depth-first, directories before their contents."""
+        base = pod_path.strip('/')
+        for name, attr in sorted(self.hub.list_dir_with_attrs(base), key=lambda e: e[0]):
+            child = f"{base}/{name}" if base else name
+            if authorize is not None and not authorize("READ", child, None):
+                continue
+            arcname = f"{prefix}{name}"
+            yield child, arcname, attr
+            if attr['st_mode'] & 0o40000:
+                yield from self.walk(child, arcname + "/", authorize)
+
+    def stream(self, pod_path: str, kind: str, authorize: Optional[Authorize] = None) -> Iterator[bytes]:
+        if kind == "tar":
+            return self._tar(pod_path, authorize)
+        if kind == "zip":
+            return self._zip(pod_path, authorize)
+        raise ArchiveError(f"Unsupported archive type: {kind}")
+
+    def _tar(self, pod_path: str, authorize: Optional[Authorize]) -> Iterator[bytes]:
+        for child, arcname, attr in self.walk(pod_path, authorize=authorize):
+            info = tarfile.TarInfo(arcname)
+            info.mtime = int(attr.get('st_mtime') or 0)
+            if attr['st_mode'] & 0o40000:
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                yield info.tobuf(tarfile.PAX_FORMAT)
+                continue
+            info.size = attr.get('st_size', 0)
+            info.mode = 0o644
+            yield info.tobuf(tarfile.PAX_FORMAT)
+            remaining = info.size
+            for chunk in self.hub.read_stream(child):
+                if remaining <= 0:
+                    break
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+                yield chunk
+            if remaining > 0:
+                yield b"\0" * remaining
+            padding = -info.size % self.TAR_BLOCK
+            if padding:
+                yield b"\0" * padding
+        yield b"\0" * (self.TAR_BLOCK * 2)
+
+    def _zip(self, pod_path: str, authorize: Optional[Authorize]) -> Iterator[bytes]:
+        sink = _Sink()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for child, arcname, attr in self.walk(pod_path, authorize=authorize):
+                date_time = time.localtime(max(attr.get('st_mtime') or 0, 315532800))[:6]  # zip epoch is 1980
+                if attr['st_mode'] & 0o40000:
+                    info = zipfile.ZipInfo(arcname + "/", date_time)
+                    info.external_attr = (0o40755 << 16) | 0x10
+                    zf.writestr(info, b"")
+                    yield sink.drain()
+                    continue
+                info = zipfile.ZipInfo(arcname, date_time)
+                info.external_attr = 0o100644 << 16
+                with zf.open(info, "w", force_zip64=attr.get('st_size', 0) >= zipfile.ZIP64_LIMIT) as dest:
+                    for chunk in self.hub.read_stream(child):
+                        dest.write(chunk)
+                        yield sink.drain()
+                yield sink.drain()
+        yield sink.drain()
+
+class ArchiveImporter:
+    """
+    Extracts an uploaded tar or zip archive into a container.
+
+    The body is first spooled (to memory up to `spool_limit`, then to disk)
+    so every member name can be checked before anything is written: one
+    absolute or '..' path, or one member `authorize` refuses (CREATE for a
+    new path, WRITE for one that exists), rejects the whole archive. Each
+    file is authorized with the running total of file bytes up to and
+    including it, so byte quotas see the whole archive. Members
+    up to `buffer_limit` bytes are then buffered and written by a pool of
+    `workers` threads, while larger members are written inline. Total
+    buffered bytes are capped at `max_buffered`, so memory is bounded no
+    matter what the archive holds. Links and device entries are skipped.
+    """
+    def __init__(self, hub, workers: int = 8, buffer_limit: int = 4 * 1024 * 1024,
+                 max_buffered: int = 64 * 1024 * 1024, spool_limit: int = 64 * 1024 * 1024):
+        self.hub = hub
+        self.workers = workers
+        self.buffer_limit = buffer_limit
+        self.max_buffered = max_buffered
+        self.spool_limit = spool_limit
+
+    @staticmethod
+    def _target(pod_path: str, name: str) -> Optional[str]:
+        """Pod path for an archive member name, or None for the archive root itself."""
+        name = name.replace("\\", "/")
+        if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+            raise ArchiveError(f"Absolute member path: {name}")
+        parts = [p for p in name.split("/") if p not in ("", ".")]
+        if ".." in parts:
+            raise ArchiveError(f"Member escapes the target container: {name}")
+        if not parts:
+            return None
+        return posixpath.join(pod_path.strip('/'), *parts)
+
+    def extract(self, pod_path: str, kind: str, stream, authorize: Optional[Authorize] = None) -> Dict[str, Any]:
+        if kind not in ARCHIVE_TYPES:
+            raise ArchiveError(f"Unsupported archive type: {kind}")
+        with tempfile.SpooledTemporaryFile(max_size=self.spool_limit) as spool:
+            while chunk := stream.read(1024 * 1024):
+                spool.write(chunk)
+            spool.seek(0)
+            if kind == "tar":
+                return self._extract_tar(pod_path, spool, authorize)
+            return self._extract_zip(pod_path, spool, authorize)
+
+    def _plan(self, pod_path: str, members: Iterator[Tuple[str, int, Any]],
+              authorize: Optional[Authorize]) -> List[Tuple[str, int, Any]]:
+        """(target, size, opener) for every member, once all of them are known safe and allowed."""
+        planned, denied = [], []
+        total = 0
+        for name, size, opener in members:
+            target = self._target(pod_path, name)
+            if target is None:
+                continue
+            if opener:
+                total += size
+            if authorize is not None:
+                action = "WRITE" if self.hub.get_attr(target) else "CREATE"
+                if not authorize(action, target, total if opener else None):
+                    denied.append(target)
+            planned.append((target, size, opener))
+        if denied:
+            raise ArchiveError("Not authorized to write some members", status=403, denied=denied)
+        return planned
+
+    def _run(self, members: List[Tuple[str, int, Any]]) -> Dict[str, Any]:
+        """Write planned (target, size, opener) members; opener is None for directories.
+
+        opener() returns the member's chunks; small members are read here and
+        written on the pool so parallel writes overlap per-file fsync latency.
+        """
+        result = {"files": 0, "directories": 0, "bytes": 0}
+        errors: List[Dict[str, str]] = []
+        budget = threading.Semaphore(max(1, self.max_buffered // max(1, self.buffer_limit)))
+        lock = threading.Lock()
+        created = set()
+
+        def ensure_dir(path: str):
+            with lock:
+                if path and path not in created:
+                    self.hub.create(path, is_dir=True)
+                    created.add(path)
+
+        def store(target: str, chunks, size: int, slot: bool):
+            try:
+                ensure_dir(posixpath.dirname(target))
+                self.hub.write_stream(target, chunks)
+                with lock:
+                    result["files"] += 1
+                    result["bytes"] += size
+            except Exception as e:
+                with lock:
+                    errors.append({"path": target, "error": str(e)})
+            finally:
+                if slot:
+                    budget.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pod-import") as pool:
+            for target, size, opener in members:
+                if opener is None:
+                    ensure_dir(target)
+                    result["directories"] += 1
+                    continue
+                chunks = opener()
+                if size <= self.buffer_limit:
+                    budget.acquire()
+                    pool.submit(store, target, [b"".join(chunks)], size, True)
+                else:
+                    store(target, chunks, size, False)
+        if errors:
+            raise ArchiveError("Some members could not be written", status=500, **result, errors=errors)
+        return result
+
+    @staticmethod
+    def _chunks(f, size: int, block: int = 1024 * 1024) -> Iterator[bytes]:
+        remaining = size
+        with f:
+            while remaining > 0:
+                data = f.read(min(block, remaining))
+                if not data:
+                    raise ArchiveError("Archive is truncated")
+                remaining -= len(data)
+                yield data
+
+    def _extract_tar(self, pod_path: str, spool, authorize: Optional[Authorize]) -> Dict[str, Any]:
+        try:
+            archive = tarfile.open(fileobj=spool, mode="r:*")
+        except tarfile.TarError as e:
+            raise ArchiveError(f"Not a tar archive: {e}")
+
+        def members():
+            for member in archive.getmembers():
+                if member.isdir():
+                    yield member.name, 0, None
+                elif member.isfile():
+                    yield member.name, member.size, lambda member=member: self._chunks(archive.extractfile(member), member.size)
+                # Links, devices and FIFOs are skipped
+
+        with archive:
+            try:
+                planned = self._plan(pod_path, members(), authorize)
+            except tarfile.TarError as e:
+                raise ArchiveError(f"Corrupt tar archive: {e}")
+            return self._run(planned)
+
+    def _extract_zip(self, pod_path: str, spool, authorize: Optional[Authorize]) -> Dict[str, Any]:
+        try:
+            archive = zipfile.ZipFile(spool)
+        except zipfile.BadZipFile as e:
+            raise ArchiveError(f"Not a zip archive: {e}")
+
+        def members():
+            for info in archive.infolist():
+                if info.is_dir():
+                    yield info.filename, 0, None
+                elif (info.external_attr >> 16) & 0o170000 in (0, 0o100000):
+                    # Read inside opener so the zip handle is used from this thread only
+                    yield info.filename, info.file_size, lambda info=info: self._chunks(archive.open(info), info.file_size)
+
+        with archive:
+            return self._run(self._plan(pod_path, members(), authorize))
@@ -0,0 +1,209 @@
+import base64
+import json
+import secrets
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional
+
+class BatchError(Exception):
+    """Raised for malformed batch requests; `status` is the HTTP code to return."""
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+# op -> capability action checked for it (same mapping as the /pod methods)
+BATCH_ACTIONS = {
+    "attr": "READ",
+    "get": "READ",
+    "put": "WRITE",
+    "delete": "DELETE",
+    "mkdir": "CREATE",
+}
+
+# op -> the /pod HTTP method it stands for (what "methods:" caveats see)
+BATCH_METHODS = {
+    "attr": "HEAD",
+    "get": "GET",
+    "put": "PUT",
+    "delete": "DELETE",
+    "mkdir": "POST",
+}
+
+class BatchOperation:
+    __slots__ = ("index", "id", "op", "path", "body")
+
+    def __init__(self, index: int, id: Any, op: str, path: str, body: Optional[bytes]):
+        self.index = index
+        self.id = id
+        self.op = op
+        self.path = path
+        self.body = body
+
+    @property
+    def action(self) -> str:
+        return BATCH_ACTIONS[self.op]
+
+    @property
+    def resource(self) -> str:
+        return "/" + self.path.lstrip('/')
+
+    @property
+    def method(self) -> str:
+        return BATCH_METHODS[self.op]
+
+    @property
+    def size(self) -> Optional[int]:
+        """Body bytes for a put, else None (what "byte_quota:" caveats see)."""
+        return len(self.body) if self.body is not None else None
+
+class BatchExecutor:
+    """
+    Runs many small /pod operations from one request.
+
+    `parse` validates the JSON payload up front; `run` executes operations
+    on a bounded thread pool over the hub and yields one result dict per
+    operation as it completes (order is not preserved, use `index`/`id`).
+    Operations on the same path, or on a path and anything below it, run
+    one after another in submission order; only unrelated paths overlap.
+    GETs are limited to `max_body` bytes so a batch cannot pull large files
+    into memory.
+    """
+    MAX_OPERATIONS = 1000
+
+    def __init__(self, hub, workers: int = 8, max_body: int = 1024 * 1024):
+        self.hub = hub
+        self.workers = workers
+        self.max_body = max_body
+
+    def parse(self, payload: Any) -> List[BatchOperation]:
+        ops = payload.get("operations") if isinstance(payload, dict) else payload
+        if not isinstance(ops, list):
+            raise BatchError("Expected a list of operations")
+        if len(ops) > self.MAX_OPERATIONS:
+            raise BatchError(f"At most {self.MAX_OPERATIONS} operations per batch", status=413)
+        parsed = []
+        for i, raw in enumerate(ops):
+            if not isinstance(raw, dict) or raw.get("op") not in BATCH_ACTIONS or not isinstance(raw.get("path"), str):
+                raise BatchError(f"Operation {i}: needs 'op' ({', '.join(BATCH_ACTIONS)}) and 'path'")
+            body = None
+            if raw["op"] == "put":
+                try:
+                    body = base64.b64decode(raw.get("body", ""), validate=True)
+                except (ValueError, TypeError):
+                    raise BatchError(f"Operation {i}: 'body' must be base64")
+            parsed.append(BatchOperation(i, raw.get("id"), raw["op"], raw["path"].strip('/'), body))
+        return parsed
+
+    def _execute(self, op: BatchOperation) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"index": op.index, "id": op.id, "op": op.op, "path": op.path}
+        try:
+            if op.op in ("attr", "get"):
+                attr = self.hub.get_attr(op.path)
+                if attr is None:
+                    return {**result, "status": 404, "error": "Not Found"}
+                result["attr"] = attr
+                if op.op == "get":
+                    if attr['st_mode'] & 0o40000:
+                        result["entries"] = self.hub.list_dir(op.path)
+                    elif attr.get('st_size', 0) > self.max_body:
+                        return {**result, "status": 413, "error": f"Body exceeds {self.max_body} bytes; use GET /pod"}
+                    else:
+                        result["body"] = b"".join(self.hub.read_stream(op.path))
+                return {**result, "status": 200}
+            if op.op == "put":
+                self.hub.write_stream(op.path, [op.body])
+                return {**result, "status": 201}
+            if op.op == "mkdir":
+                self.hub.create(op.path, is_dir=True)
+                return {**result, "status": 201}
+            if op.op == "delete":
+                if self.hub.delete(op.path):
+                    return {**result, "status": 204}
+                return {**result, "status": 404, "error": "Not Found"}
+        except PermissionError as e:
+            return {**result, "status": 403, "error": str(e)}
+        except (FileNotFoundError, NotADirectoryError):
+            return {**result, "status": 404, "error": "Not Found"}
+        except Exception as e:
+            return {**result, "status": 500, "error": str(e)}
+        return {**result, "status": 400, "error": "Unsupported operation"}
+
+    @staticmethod
+    def _chains(ops: List[BatchOperation]) -> List[deque]:
+        """Group ops whose paths are equal or nested, each group in submission order."""
+        parent = list(range(len(ops)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        at: Dict[str, int] = {}           # path -> an op on exactly that path
+        below: Dict[str, List[int]] = {}  # path -> ops somewhere under it
+        for i, op in enumerate(ops):
+            parts = op.path.split("/") if op.path else []
+            ancestors = ["/".join(parts[:k]) for k in range(len(parts))]
+            for j in [at[p] for p in ancestors + [op.path] if p in at] + below.pop(op.path, []):
+                parent[find(j)] = i
+            at[op.path] = i
+            for p in ancestors:
+                below.setdefault(p, []).append(i)
+        chains: Dict[int, deque] = {}
+        for i, op in enumerate(ops):
+            chains.setdefault(find(i), deque()).append(op)
+        return list(chains.values())
+
+    def run(self, ops: List[BatchOperation], denied: Dict[int, str]) -> Iterator[Dict[str, Any]]:
+        """Yield results as operations finish; `denied` maps op index -> denial reason."""
+        runnable = []
+        for op in ops:
+            if op.index in denied:
+                yield {"index": op.index, "id": op.id, "op": op.op, "path": op.path,
+                       "status": 403, "error": f"Unauthorized: {denied[op.index]}"}
+            else:
+                runnable.append(op)
+        if not runnable:
+            return
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pod-batch") as pool:
+            # Each chain has at most one op in flight; its next op starts when that one finishes
+            pending = {}
+            for chain in self._chains(runnable):
+                pending[pool.submit(self._execute, chain.popleft())] = chain
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chain = pending.pop(future)
+                    if chain:
+                        pending[pool.submit(self._execute, chain.popleft())] = chain
+                    yield future.result()
+
+def encode_ndjson(results: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """One JSON object per line; GET bodies are base64 in "body"."""
+    for result in results:
+        if "body" in result:
+            result["body"] = base64.b64encode(result["body"]).decode()
+        yield (json.dumps(result) + "\n").encode()
+
+def encode_multipart(results: Iterator[Dict[str, Any]], boundary: str) -> Iterator[bytes]:
+    """multipart/mixed with one part per result.
+
+    GET bodies are sent raw as application/octet-stream parts, with the rest
+    of the result in an X-Attr header; other results are application/json
+    parts. Content-ID carries the operation index and X-Status its status.
+    """
+    for result in results:
+        headers = [f"Content-ID: <{result['index']}>", f"X-Status: {result['status']}"]
+        if "body" in result:
+            payload = result.pop("body")
+            headers.insert(0, "Content-Type: application/octet-stream")
+            headers.append(f"X-Attr: {json.dumps(result)}")
+        else:
+            payload = json.dumps(result).encode()
+            headers.insert(0, "Content-Type: application/json")
+        head = "".join(h + "\r\n" for h in headers)
+        yield f"--{boundary}\r\n{head}\r\n".encode() + payload + b"\r\n"
+    yield f"--{boundary}--\r\n".encode()
+
+def new_boundary() -> str:
+    return f"proxion-batch-{secrets.token_hex(12)}"
@@ -0,0 +1,260 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+class BlockCache:
+    """
+    Disk-backed block store for remote resource bytes.
+
+    Each object (a provider-qualified path) is split into fixed-size blocks
+    stored as individual files under `cache_dir`; SQLite indexes them with
+    a fill level and last-access time. A block may be partially filled: its
+    bytes always form a contiguous prefix from the block start, so a Range
+    read only has to fetch what lies beyond that prefix. Objects are tagged
+    with a version (mtime/size); a version change drops their blocks. Total
+    stored bytes are kept under `budget` by evicting least-recently-used
+    blocks, in batches down to EVICT_TARGET of the budget so a stream of
+    appends does not query the LRU index on every block.
+
+    Block files are not fsynced; an append checks the file still holds the
+    indexed fill and rewrites the block from its start if it does not.
+    """
+    DEFAULT_BLOCK_SIZE = 1024 * 1024
+    TOUCH_BATCH = 64
+    EVICT_BATCH = 256
+    EVICT_TARGET = 0.9
+
+    def __init__(self, cache_dir: str, budget: int, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.budget = budget
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._pending_touches: Dict[Tuple[str, int], float] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(self.cache_dir, "index.db"), check_same_thread=False)
+        self._init_db()
+        self.used = self._conn.execute("SELECT COALESCE(SUM(filled), 0) FROM blocks").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    def _init_db(self):
+        """Initialize the SQLite index schema."""
+        self._conn.executescript('''
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS objects (
+                key TEXT PRIMARY KEY,
+                version TEXT,
+                size INTEGER,
+                block_size INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS blocks (
+                key TEXT,
+                block INTEGER,
+                filled INTEGER,
+                last_access REAL,
+                PRIMARY KEY (key, block)
+            );
+            CREATE INDEX IF NOT EXISTS blocks_lru ON blocks (last_access);
+        ''')
+        self._conn.commit()
+
+    # --- Index ---
+
+    def _block_path(self, key: str, block: int) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest, f"{block:08d}")
+
+    def _ensure_object(self, key: str, version: str, size: int):
+        """Register an object version; a changed version or block size drops stale blocks."""
+        row = self._conn.execute("SELECT version, block_size FROM objects WHERE key = ?", (key,)).fetchone()
+        if row and row[0] == version and row[1] == self.block_size:
+            return
+        if row:
+            self._drop_blocks(key)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO objects (key, version, size, block_size) VALUES (?, ?, ?, ?)",
+            (key, version, size, self.block_size)
+        )
+        self._conn.commit()
+
+    def _drop_blocks(self, key: str):
+        rows = self._conn.execute("SELECT block, filled FROM blocks WHERE key = ?", (key,)).fetchall()
+        for block, filled in rows:
+            self._unlink(key, block)
+            self.used -= filled
+        self._conn.execute("DELETE FROM blocks WHERE key = ?", (key,))
+
+    def _unlink(self, key: str, block: int):
+        try:
+            os.remove(self._block_path(key, block))
+        except OSError:
+            pass
+
+    def _flush_touches(self):
+        if self._pending_touches:
+            self._conn.executemany(
+                "UPDATE blocks SET last_access = ? WHERE key = ? AND block = ?",
+                [(ts, key, block) for (key, block), ts in self._pending_touches.items()]
+            )
+            self._pending_touches.clear()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used blocks, a batch at a time, once usage exceeds the budget."""
+        if self.used <= self.budget:
+            return
+        self._flush_touches()
+        target = int(self.budget * self.EVICT_TARGET)
+        while self.used > target:
+            rows = self._conn.execute(
+                "SELECT key, block, filled FROM blocks ORDER BY last_access LIMIT ?", (self.EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for key, block, filled in rows:
+                if self.used <= target:
+                    break
+                self._unlink(key, block)
+                self.used -= filled
+                victims.append((key, block))
+            self._conn.executemany("DELETE FROM blocks WHERE key = ? AND block = ?", victims)
+        self._conn.commit()
+
+    def _length(self, path: str) -> int:
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
+
+    # --- Public API ---
+
+    def fills(self, key: str, version: str, size: int, first: int, last: int) -> Dict[int, int]:
+        """Return {block: filled bytes} for cached blocks in [first, last]."""
+        with self._lock:
+            self._ensure_object(key, version, size)
+            rows = self._conn.execute(
+                "SELECT block, filled FROM blocks WHERE key = ? AND block BETWEEN ? AND ?",
+                (key, first, last)
+            ).fetchall()
+        return dict(rows)
+
+    def read(self, key: str, block: int, start: int, end: int) -> Optional[bytes]:
+        """Read [start, end) within a block, or None if the file vanished (evicted)."""
+        try:
+            with open(self._block_path(key, block), "rb") as f:
+                f.seek(start)
+                data = f.read(end - start)
+        except OSError:
+            return None
+        if len(data) != end - start:
+            return None
+        with self._lock:
+            self.hits += 1
+            self._pending_touches[(key, block)] = time.time()
+            if len(self._pending_touches) >= self.TOUCH_BATCH:
+                self._flush_touches()
+        return data
+
+    def append(self, key: str, version: str, block: int, offset: int, data: bytes) -> bool:
+        """Extend a block's filled prefix with `data`, which starts at in-block `offset`.
+
+        Bytes the block already holds are skipped. Returns False (storing
+        nothing) if `offset` lies beyond the current fill, which would leave a
+        hole, or if the object changed version meanwhile.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM objects WHERE key = ?", (key,)).fetchone()
+            if not row or row[0] != version:
+                return False
+            current = self._conn.execute(
+                "SELECT filled FROM blocks WHERE key = ? AND block = ?", (key, block)
+            ).fetchone()
+            path = self._block_path(key, block)
+            if current and self._length(path) < current[0]:
+                # Unsynced bytes lost in a crash: forget the block so this
+                # (or the next) fetch from its start rewrites it
+                self.used -= current[0]
+                self._conn.execute("DELETE FROM blocks WHERE key = ? AND block = ?", (key, block))
+                self._conn.commit()
+                current = None
+            filled = current[0] if current else 0
+            if offset > filled:
+                return False
+            data = data[filled - offset:]
+            if not data:
+                return True
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "r+b" if current else "wb") as f:
+                f.seek(filled)
+                f.write(data)
+            self.misses += 1
+            self.used += len(data)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blocks (key, block, filled, last_access) VALUES (?, ?, ?, ?)",
+                (key, block, filled + len(data), time.time())
+            )
+            self._conn.commit()
+            self._evict()
+        return True
+
+    def status(self, key: str, version: str, size: int) -> Optional[str]:
+        """'cached' if every byte of this version is on disk, 'partial' if some are, else None."""
+        return self.statuses({key: (version, size)}).get(key)
+
+    def statuses(self, objects: Dict[str, Tuple[str, int]]) -> Dict[str, str]:
+        """Batch form of `status` for listings: {key: (version, size)} -> {key: status}."""
+        if not objects:
+            return {}
+        keys = list(objects)
+        result = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                marks = ",".join("?" * len(batch))
+                rows = self._conn.execute(f'''
+                    SELECT o.key, o.version, o.block_size, COALESCE(SUM(b.filled), 0)
+                    FROM objects o LEFT JOIN blocks b ON b.key = o.key
+                    WHERE o.key IN ({marks}) GROUP BY o.key
+                ''', batch).fetchall()
+                for key, version, block_size, filled in rows:
+                    want_version, size = objects[key]
+                    if version != want_version or not filled:
+                        continue
+                    result[key] = "cached" if filled >= size else "partial"
+        return result
+
+    def drop(self, key: str, recursive: bool = False):
+        """Forget an object (and, recursively, everything under it as a prefix)."""
+        with self._lock:
+            keys = [key]
+            if recursive:
+                prefix = key.rstrip('/') + '/'
+                keys += [k for (k,) in self._conn.execute(
+                    "SELECT key FROM objects WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+                )]
+            for k in keys:
+                self._drop_blocks(k)
+                self._conn.execute("DELETE FROM objects WHERE key = ?", (k,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            blocks = self._conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+            return {
+                "used": self.used,
+                "budget": self.budget,
+                "block_size": self.block_size,
+                "blocks": blocks,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def close(self):
+        with self._lock:
+            self._flush_touches()
+            self._conn.close()
@@ -0,0 +1,404 @@
+import contextlib
+import mimetypes
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .pod_proxy import LocalProvider
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class ZlibCodec:
+    ID = 1
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes, size: int) -> bytes:
+        return zlib.decompress(data, bufsize=size or zlib.DEF_BUF_SIZE)
+
+class ZstdCodec:
+    ID = 2
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        self.level = level
+        self._local = threading.local()  # zstandard contexts are not thread-safe
+
+    def _contexts(self):
+        if not hasattr(self._local, "c"):
+            self._local.c = zstandard.ZstdCompressor(level=self.level)
+            self._local.d = zstandard.ZstdDecompressor()
+        return self._local.c, self._local.d
+
+    def compress(self, data: bytes) -> bytes:
+        return self._contexts()[0].compress(data)
+
+    def decompress(self, data: bytes, size: int) -> bytes:
+        return self._contexts()[1].decompress(data, max_output_size=size)
+
+CODECS = {ZlibCodec.ID: ZlibCodec, ZstdCodec.ID: ZstdCodec}
+
+def make_codec(name: str = "auto"):
+    """'zstd', 'zlib', or 'auto'/True (zstd when the zstandard package is installed)."""
+    if name in ("auto", True):
+        return ZstdCodec() if zstandard is not None else ZlibCodec()
+    if name == "zstd":
+        return ZstdCodec()
+    if name == "zlib":
+        return ZlibCodec()
+    raise ValueError(f"Unknown compression codec: {name}")
+
+class FrameIndex:
+    """Parsed header/footer of a compressed file: where each frame lives."""
+    def __init__(self, codec_id: int, frame_size: int, size: int, lengths: List[int]):
+        self.codec_id = codec_id
+        self.frame_size = frame_size
+        self.size = size
+        self.lengths = lengths
+        self.offsets = []
+        pos = SeekableFormat.HEADER.size
+        for length in lengths:
+            self.offsets.append(pos)
+            pos += length
+
+    def logical_length(self, frame: int) -> int:
+        return min(self.frame_size, self.size - frame * self.frame_size)
+
+class SeekableFormat:
+    """
+    Layout: header | frame 0 | frame 1 | ... | frame lengths (u32 each) | footer
+
+    Every frame holds `frame_size` logical bytes (the last may be shorter)
+    compressed independently, so a Range read decompresses only the frames
+    it overlaps and an offset write re-encodes only the frames it touches
+    (untouched frames are copied as they are).
+    Both header and footer carry a magic so plain files that happen to start
+    with the header magic are not misread.
+    """
+    MAGIC = b"\x89PXZ\r\n\x1a\n"
+    END_MAGIC = b"PXZ-END\n"
+    HEADER = struct.Struct("<8sBBHI")      # magic, version, codec, reserved, frame_size
+    FOOTER = struct.Struct("<IQ8s")         # frame count, logical size, end magic
+    VERSION = 1
+
+    @classmethod
+    def header(cls, codec_id: int, frame_size: int) -> bytes:
+        return cls.HEADER.pack(cls.MAGIC, cls.VERSION, codec_id, 0, frame_size)
+
+    @classmethod
+    def trailer(cls, lengths: List[int], size: int) -> bytes:
+        return struct.pack(f"<{len(lengths)}I", *lengths) + cls.FOOTER.pack(len(lengths), size, cls.END_MAGIC)
+
+    @classmethod
+    def read_index(cls, f) -> Optional[FrameIndex]:
+        """FrameIndex for an open file, or None if it is stored uncompressed."""
+        head = f.read(cls.HEADER.size)
+        if len(head) < cls.HEADER.size:
+            return None
+        magic, version, codec_id, _, frame_size = cls.HEADER.unpack(head)
+        if magic != cls.MAGIC or version != cls.VERSION or codec_id not in CODECS:
+            return None
+        end = f.seek(0, os.SEEK_END)
+        if end < cls.HEADER.size + cls.FOOTER.size:
+            return None
+        f.seek(end - cls.FOOTER.size)
+        count, size, end_magic = cls.FOOTER.unpack(f.read(cls.FOOTER.size))
+        table = 4 * count
+        if end_magic != cls.END_MAGIC or end - cls.FOOTER.size - table < cls.HEADER.size:
+            return None
+        f.seek(end - cls.FOOTER.size - table)
+        lengths = list(struct.unpack(f"<{count}I", f.read(table)))
+        if cls.HEADER.size + sum(lengths) + table + cls.FOOTER.size != end:
+            return None
+        return FrameIndex(codec_id, frame_size, size, lengths)
+
+class CompressedLocalProvider(LocalProvider):
+    """
+    LocalProvider that stores resources compressed in seekable frames.
+
+    Files keep their names and locations; only their bytes change, so the
+    inotify watcher, listings and sidecars behave as for a plain mount.
+    Attrs report the logical (uncompressed) size. Files whose type is
+    already compressed (images, audio, video, archives) or whose first frame
+    does not shrink by at least `min_saving` are written as-is, and plain
+    files (including ones written before compression was enabled, or by
+    chunked uploads) are read transparently. Compressed files have no real
+    file handle to hand out, so open_file() returns None for them and the
+    server falls back to read_range(). Frame indexes are cached by
+    mtime/size, plain files included, so listings only open files they
+    have not seen since they last changed.
+
+    Offset writes into existing data rewrite the file into a temp file that
+    replaces it atomically. Appends instead re-encode the last frame and
+    rewrite the trailer in place; readers decode each frame under the file's
+    write lock, so they never see a half-written append.
+    """
+    FRAME_SIZE = 256 * 1024
+    INDEX_CACHE_SIZE = 4096
+    SKIP_EXTENSIONS = {
+        '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.avif',
+        '.mp4', '.mkv', '.mov', '.avi', '.webm', '.m4v',
+        '.mp3', '.m4a', '.aac', '.ogg', '.opus', '.flac',
+        '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar', '.br',
+        '.jar', '.apk', '.epub', '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.pdf'
+    }
+
+    def __init__(self, root_path: str, codec: str = "auto", frame_size: int = FRAME_SIZE, min_saving: float = 0.1):
+        super().__init__(root_path)
+        self.codec_setting = codec
+        self.codec = make_codec(codec)
+        self.frame_size = frame_size
+        self.min_saving = min_saving
+        self._codecs = {self.codec.ID: self.codec}
+        self._indexes: "OrderedDict[str, Tuple[int, int, Optional[FrameIndex]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_locks: Dict[str, List[Any]] = {}  # path -> [lock, users]
+
+    # --- Format helpers ---
+
+    def _codec_for(self, codec_id: int):
+        if codec_id not in self._codecs:
+            self._codecs[codec_id] = CODECS[codec_id]()
+        return self._codecs[codec_id]
+
+    def _index(self, path: str, st=None) -> Optional[FrameIndex]:
+        """Frame index of a local file (None when stored plain), cached by mtime/size."""
+        st = st or os.stat(path)
+        with self._lock:
+            cached = self._indexes.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                self._indexes.move_to_end(path)
+                return cached[2]
+        index = None
+        if st.st_size >= SeekableFormat.HEADER.size + SeekableFormat.FOOTER.size:
+            with open(path, "rb") as f:
+                index = SeekableFormat.read_index(f)
+        with self._lock:
+            self._indexes[path] = (st.st_mtime_ns, st.st_size, index)
+            while len(self._indexes) > self.INDEX_CACHE_SIZE:
+                self._indexes.popitem(last=False)
+        return index
+
+    def _forget(self, path: str):
+        with self._lock:
+            self._indexes.pop(path, None)
+
+    @contextlib.contextmanager
+    def _writing(self, path: str):
+        """Serialize writers of one file; writers of different files run in parallel."""
+        with self._lock:
+            entry = self._write_locks.setdefault(path, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._write_locks[path]
+
+    def _attr(self, path: str, st) -> Dict[str, Any]:
+        """Logical size for compressed files."""
+        attr = self._stat_attr(st)
+        if not attr['st_mode'] & 0o40000:
+            index = self._index(path, st)
+            if index:
+                attr['st_size'] = index.size
+        return attr
+
+    def _skip(self, pod_path: str) -> bool:
+        ext = os.path.splitext(pod_path)[1].lower()
+        if ext in self.SKIP_EXTENSIONS:
+            return True
+        mime, encoding = mimetypes.guess_type(pod_path)
+        return bool(encoding) or (mime or "").startswith(("image/", "audio/", "video/"))
+
+    def _frames(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Regroup arbitrary chunks into frame_size pieces."""
+        buf = bytearray()
+        for chunk in chunks:
+            buf += chunk
+            while len(buf) >= self.frame_size:
+                yield bytes(buf[:self.frame_size])
+                del buf[:self.frame_size]
+        if buf:
+            yield bytes(buf)
+
+    def _encode(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield the on-disk bytes for `chunks`: the seekable format, or the
+        plain content if the first frame shows compression does not pay."""
+        frames = self._frames(chunks)
+        first = next(frames, b"")
+        packed = self.codec.compress(first)
+        if not first or len(packed) > len(first) * (1 - self.min_saving):
+            yield first
+            yield from frames
+            return
+        yield SeekableFormat.header(self.codec.ID, self.frame_size)
+        lengths, size = [len(packed)], len(first)
+        yield packed
+        for frame in frames:
+            packed = self.codec.compress(frame)
+            lengths.append(len(packed))
+            size += len(frame)
+            yield packed
+        yield SeekableFormat.trailer(lengths, size)
+
+    def _read_frame(self, f, index: FrameIndex, frame: int) -> bytes:
+        f.seek(index.offsets[frame])
+        data = f.read(index.lengths[frame])
+        return self._codec_for(index.codec_id).decompress(data, index.logical_length(frame))
+
+    def _read_frames(self, path: str, f, index: FrameIndex, frames: Iterable[int]) -> Iterator[bytes]:
+        """Decode `frames` of open file `f`, re-reading its index after an in-place append."""
+        seen = os.fstat(f.fileno())
+        for frame in frames:
+            with self._writing(path):
+                st = os.fstat(f.fileno())
+                if (st.st_size, st.st_mtime_ns) != (seen.st_size, seen.st_mtime_ns):
+                    f.seek(0)
+                    index = SeekableFormat.read_index(f) or index
+                    seen = st
+                data = self._read_frame(f, index, frame)
+            yield data
+
+    # --- Reads ---
+
+    def read_stream(self, pod_path: str):
+        path = self._safe_path(pod_path)
+        index = self._index(path)
+        if not index:
+            return super().read_stream(pod_path)
+        def generate():
+            with open(path, "rb") as f:
+                yield from self._read_frames(path, f, index, range(len(index.lengths)))
+        return generate()
+
+    def read_range(self, pod_path: str, start: int, length: int):
+        path = self._safe_path(pod_path)
+        index = self._index(path)
+        if not index:
+            yield from super().read_range(pod_path, start, length)
+            return
+        end = min(start + length, index.size)
+        frames = range(start // index.frame_size, (end - 1) // index.frame_size + 1 if end > start else 0)
+        with open(path, "rb") as f:
+            for frame, data in zip(frames, self._read_frames(path, f, index, frames)):
+                base = frame * index.frame_size
+                yield data[max(start, base) - base:end - base]
+
+    def open_file(self, pod_path: str):
+        path = self._safe_path(pod_path)
+        if os.path.isfile(path) and self._index(path):
+            return None
+        return super().open_file(pod_path)
+
+    # --- Writes ---
+
+    def write_stream(self, pod_path: str, chunks, offset: Optional[int] = None):
+        if offset is not None:
+            return self.write(pod_path, b"".join(chunks), offset)
+        path = self._safe_path(pod_path)
+        with self._writing(path):
+            try:
+                if self._skip(pod_path):
+                    return super().write_stream(pod_path, chunks)
+                return super().write_stream(pod_path, self._encode(chunks))
+            finally:
+                self._forget(path)
+
+    def write(self, pod_path: str, data: bytes, offset: int = 0):
+        """Patch bytes at `offset`, re-encoding only the frames the write touches.
+
+        An append rewrites the last frame and the trailer in place, so it
+        costs one frame. Any other patch streams the file into a temp file
+        (copying untouched frames as they are) that atomically replaces it.
+        """
+        path = self._safe_path(pod_path)
+        with self._writing(path):
+            try:
+                return self._patch(pod_path, path, data, offset)
+            finally:
+                self._forget(path)
+
+    def _patch(self, pod_path: str, path: str, data: bytes, offset: int):
+        exists = os.path.isfile(path)
+        index = self._index(path) if exists else None
+        if exists and not index:
+            return super().write(pod_path, data, offset)  # Plain file stays plain
+        if not index:
+            if self._skip(pod_path):
+                return super().write(pod_path, data, offset)
+            return super().write_stream(pod_path, self._encode([b"\0" * offset, data]))
+
+        if not data:
+            return True
+        codec = self._codec_for(index.codec_id)
+        size = max(index.size, offset + len(data))
+        first = min(offset, index.size) // index.frame_size
+        last = (offset + len(data) - 1) // index.frame_size
+        if self.write_handles:
+            self.write_handles.close(path, sync=False)
+
+        def frames(f) -> Iterator[bytes]:
+            """Packed frames from `first` on: touched ones re-encoded, the rest copied."""
+            for frame in range(first, max(len(index.lengths), last + 1)):
+                if frame > last:
+                    f.seek(index.offsets[frame])
+                    yield f.read(index.lengths[frame])
+                    continue
+                base = frame * index.frame_size
+                content = bytearray(self._read_frame(f, index, frame) if frame < len(index.lengths) else b"")
+                wanted = min(index.frame_size, size - base)
+                content.extend(b"\0" * (wanted - len(content)))
+                lo = max(offset, base) - base
+                piece = data[max(offset, base) - offset:][:wanted - lo]
+                content[lo:lo + len(piece)] = piece
+                yield codec.compress(bytes(content))
+
+        if offset >= index.size:
+            # Append: only the last frame and the trailer change, rewrite them in place
+            with open(path, "r+b") as f:
+                packed = list(frames(f))
+                f.seek(index.offsets[first] if first < len(index.lengths) else
+                       SeekableFormat.HEADER.size + sum(index.lengths))
+                for chunk in packed:
+                    f.write(chunk)
+                f.write(SeekableFormat.trailer(index.lengths[:first] + [len(p) for p in packed], size))
+                f.flush()
+                os.fsync(f.fileno())
+                f.truncate()
+            return True
+
+        def encode(f) -> Iterator[bytes]:
+            lengths = []
+            yield SeekableFormat.header(index.codec_id, index.frame_size)
+            for frame in range(first):
+                f.seek(index.offsets[frame])
+                packed = f.read(index.lengths[frame])
+                lengths.append(len(packed))
+                yield packed
+            for packed in frames(f):
+                lengths.append(len(packed))
+                yield packed
+            yield SeekableFormat.trailer(lengths, size)
+
+        with open(path, "rb") as f:
+            return super().write_stream(pod_path, encode(f))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"codec": self.codec.name, "frame_size": self.frame_size, "indexed_files": len(self._indexes)}
@@ -0,0 +1,466 @@
+import bisect
+import errno
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .pod_proxy import BaseResourceProvider, LocalProvider
+
+# Gear table for the rolling hash; fixed seed so boundaries are stable across runs
+_rng = random.Random(0x70786E)
+_GEAR = tuple(_rng.getrandbits(32) for _ in range(256))
+del _rng
+
+class ContentChunker:
+    """
+    FastCDC-style content-defined chunking.
+
+    Boundaries depend only on nearby content, so an insertion early in a
+    file shifts just the chunks around it and the rest still deduplicate.
+    Normalized chunking uses a stricter mask before `avg_size` and a looser
+    one after it, which keeps chunk sizes tightly around the average.
+    """
+    def __init__(self, min_size: int = 16 * 1024, avg_size: int = 64 * 1024, max_size: int = 256 * 1024):
+        if not min_size < avg_size < max_size:
+            raise ValueError("Chunk sizes must satisfy min < avg < max")
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        bits = avg_size.bit_length() - 1
+        self.mask_s = (1 << (bits + 2)) - 1
+        self.mask_l = (1 << (bits - 2)) - 1
+
+    def _cut(self, buf, n: int) -> int:
+        """Length of the first chunk in buf[:n].
+
+        The gear hash shifts right instead of left, so it stays under 2**33
+        without masking; its low bits mix roughly the last 32 bytes.
+        """
+        if n <= self.min_size:
+            return n
+        gear, mask_s, mask_l = _GEAR, self.mask_s, self.mask_l
+        normal = min(n, self.avg_size)
+        end = min(n, self.max_size)
+        view = memoryview(buf)
+        h = 0
+        i = self.min_size
+        for b in view[i:normal]:
+            h = (h >> 1) + gear[b]
+            i += 1
+            if not h & mask_s:
+                return i
+        for b in view[i:end]:
+            h = (h >> 1) + gear[b]
+            i += 1
+            if not h & mask_l:
+                return i
+        return end
+
+    def split(self, stream: Iterable[bytes]) -> Iterator[bytes]:
+        """Re-chunk an iterable of arbitrary byte pieces at content-defined boundaries."""
+        buf = bytearray()
+        for piece in stream:
+            buf += piece
+            while len(buf) >= self.max_size:
+                cut = self._cut(buf, len(buf))
+                yield bytes(buf[:cut])
+                del buf[:cut]
+        while buf:
+            cut = self._cut(buf, len(buf))
+            yield bytes(buf[:cut])
+            del buf[:cut]
+
+class DedupProvider(BaseResourceProvider):
+    """
+    Content-addressed store: files are manifests of content-defined chunks,
+    each chunk stored once under its SHA-256.
+
+    Layout under `store_path`:
+      - chunks/ab/abcdef...  one file per unique chunk
+      - index.db             SQLite: namespace entries with manifests, chunk refcounts
+    Rewriting or deleting a file only adjusts refcounts; `gc()` removes
+    chunks nobody references. Writers and gc() exclude each other, so a chunk
+    a writer just found on disk cannot be collected before its reference
+    lands. Names on LocalProvider's exclusion list cannot be read, written
+    or deleted, as on a plain mount.
+    """
+    EXCLUSION_LIST = LocalProvider.EXCLUSION_LIST
+    HIDDEN_LIST = LocalProvider.HIDDEN_LIST
+    READ_BLOCK = 64 * 1024
+
+    def __init__(self, store_path: str, chunker: Optional[ContentChunker] = None):
+        self.store_path = os.path.abspath(store_path)
+        self.chunk_dir = os.path.join(self.store_path, "chunks")
+        self.chunker = chunker or ContentChunker()
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(self.store_path, "index.db"), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._gc_guard = threading.Condition()
+        self._writers = 0
+        self._collecting = False
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the SQLite index schema."""
+        now = time.time()
+        self._conn.executescript('''
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS entries (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                name TEXT,
+                is_dir INTEGER,
+                size INTEGER,
+                ctime REAL,
+                mtime REAL,
+                manifest TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent, name);
+            CREATE TABLE IF NOT EXISTS chunks (
+                hash TEXT PRIMARY KEY,
+                size INTEGER,
+                refs INTEGER
+            );
+        ''')
+        self._conn.execute(
+            "INSERT OR IGNORE INTO entries VALUES ('', NULL, '', 1, 0, ?, ?, NULL)", (now, now)
+        )
+        self._conn.commit()
+
+    # --- Helpers ---
+
+    def _norm(self, path: str) -> str:
+        parts = [p for p in path.replace("\\", "/").split("/") if p not in ("", ".")]
+        if ".." in parts:
+            raise PermissionError("Path traversal escape attempted")
+        if parts and self._is_excluded(parts[-1]):
+            raise PermissionError(f"Access to {parts[-1]} is restricted for safety")
+        return "/".join(parts)
+
+    def _is_excluded(self, name: str) -> bool:
+        return name in self.EXCLUSION_LIST or name.endswith(tuple(e for e in self.EXCLUSION_LIST if e.startswith('.')))
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def _row(self, path: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT is_dir, size, ctime, mtime, manifest FROM entries WHERE path = ?", (path,)
+            ).fetchone()
+
+    @staticmethod
+    def _attr(row) -> Dict[str, Any]:
+        is_dir, size, ctime, mtime, _ = row
+        return {
+            "st_mode": 0o40755 if is_dir else 0o100644,
+            "st_nlink": 1,
+            "st_size": size,
+            "st_ctime": ctime,
+            "st_mtime": mtime,
+            "st_atime": mtime,
+            "proxion_status": "synced"
+        }
+
+    def _is_listed(self, name: str) -> bool:
+        """Same rule as LocalProvider._is_listed (dedup stores have no upload staging)."""
+        return not self._is_excluded(name) and not name.endswith(tuple(self.HIDDEN_LIST))
+
+    def _manifest(self, path: str) -> List[Tuple[str, int]]:
+        row = self._row(self._norm(path))
+        if not row or row[0]:
+            raise FileNotFoundError(path)
+        return json.loads(row[4] or "[]")
+
+    def _read_chunk(self, digest: str) -> bytes:
+        with open(self._chunk_path(digest), "rb") as f:
+            return f.read()
+
+    def _ensure_parents(self, path: str, now: float):
+        """Create missing ancestor directories (caller holds the lock)."""
+        parts = path.split("/")[:-1]
+        for i in range(len(parts)):
+            sub = "/".join(parts[:i + 1])
+            parent = "/".join(parts[:i])
+            row = self._conn.execute("SELECT is_dir FROM entries WHERE path = ?", (sub,)).fetchone()
+            if row and not row[0]:
+                raise NotADirectoryError(sub)
+            if not row:
+                self._conn.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, 1, 0, ?, ?, NULL)", (sub, parent, parts[i], now, now)
+                )
+
+    # --- GC exclusion ---
+
+    def _begin_write(self):
+        with self._gc_guard:
+            while self._collecting:
+                self._gc_guard.wait()
+            self._writers += 1
+
+    def _end_write(self):
+        with self._gc_guard:
+            self._writers -= 1
+            self._gc_guard.notify_all()
+
+    # --- Reads ---
+
+    def get_attr(self, path: str):
+        row = self._row(self._norm(path))
+        return self._attr(row) if row else None
+
+    def list_dir(self, path: str):
+        return [name for name, _ in self.list_dir_with_attrs(path)]
+
+    def list_dir_with_attrs(self, path: str):
+        page, _ = self.list_dir_page(path, None, -1)
+        return page
+
+    def list_dir_page(self, path: str, after: Optional[str], limit: int):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, is_dir, size, ctime, mtime, manifest FROM entries "
+                "WHERE parent = ? AND name > ? ORDER BY name LIMIT ?",
+                (self._norm(path), after or "", -1 if limit < 0 else limit + 1)
+            ).fetchall()
+        results = [(r[0], self._attr(r[1:])) for r in rows if self._is_listed(r[0])]
+        if limit < 0:
+            return results, False
+        return results[:limit], len(rows) > limit
+
+    def read_stream(self, path: str):
+        manifest = self._manifest(path)
+        def generate():
+            for digest, _ in manifest:
+                with open(self._chunk_path(digest), "rb") as f:
+                    while block := f.read(self.READ_BLOCK):
+                        yield block
+        return generate()
+
+    def read_range(self, path: str, start: int, length: int):
+        manifest = self._manifest(path)
+        offsets, pos = [], 0
+        for _, size in manifest:
+            offsets.append(pos)
+            pos += size
+        end = min(start + length, pos)
+        i = max(0, bisect.bisect_right(offsets, start) - 1)
+        while i < len(manifest) and offsets[i] < end:
+            digest, size = manifest[i]
+            lo = max(start, offsets[i]) - offsets[i]
+            hi = min(end, offsets[i] + size) - offsets[i]
+            with open(self._chunk_path(digest), "rb") as f:
+                f.seek(lo)
+                remaining = hi - lo
+                while remaining:
+                    block = f.read(min(self.READ_BLOCK, remaining))
+                    if not block:
+                        raise IOError(f"Chunk {digest} is truncated")
+                    remaining -= len(block)
+                    yield block
+            i += 1
+
+    # --- Writes ---
+
+    def _store_chunk(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        target = self._chunk_path(digest)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, target)
+        return digest
+
+    def write_stream(self, path: str, chunks, offset: Optional[int] = None) -> bool:
+        if offset is not None:
+            return self.write(path, b"".join(chunks), offset)
+        path = self._norm(path)
+        if not path:
+            raise IsADirectoryError("/")
+        self._begin_write()
+        try:
+            manifest = [(self._store_chunk(piece), len(piece)) for piece in self.chunker.split(chunks)]
+            self._commit(path, manifest)
+        finally:
+            self._end_write()
+        return True
+
+    def _commit(self, path: str, manifest: List[Tuple[str, int]], expected: Any = False) -> bool:
+        """Swap in a new manifest and move refcounts in one transaction.
+
+        With `expected` (a manifest JSON string, or None for a missing
+        file), nothing changes and False is returned unless the current
+        manifest still matches it.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT is_dir, ctime, manifest FROM entries WHERE path = ?", (path,)).fetchone()
+            if row and row[0]:
+                raise IsADirectoryError(path)
+            if expected is not False and (row[2] if row else None) != expected:
+                return False
+            self._ensure_parents(path, now)
+            self._conn.executemany(
+                "INSERT INTO chunks VALUES (?, ?, 1) ON CONFLICT(hash) DO UPDATE SET refs = refs + 1",
+                manifest
+            )
+            if row:
+                self._conn.executemany(
+                    "UPDATE chunks SET refs = refs - 1 WHERE hash = ?",
+                    [(digest,) for digest, _ in json.loads(row[2] or "[]")]
+                )
+            parent, _, name = path.rpartition("/")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, 0, ?, ?, ?, ?)",
+                (path, parent, name, sum(size for _, size in manifest), row[1] if row else now, now, json.dumps(manifest))
+            )
+        return True
+
+    def write(self, path: str, data: bytes, offset: int = 0) -> bool:
+        """Patch `data` in at `offset` (zero-filling any gap past the end).
+
+        Only the chunks the write overlaps (or the last chunk, when it
+        extends the file) are read and re-chunked; the rest of the manifest
+        is kept. A concurrent change to the same file makes the patch retry.
+        """
+        path = self._norm(path)
+        if not path:
+            raise IsADirectoryError("/")
+        if not data:
+            return True
+        self._begin_write()
+        try:
+            while True:
+                row = self._row(path)
+                if row and row[0]:
+                    raise IsADirectoryError(path)
+                expected = row[4] if row else None
+                manifest = json.loads(expected or "[]")
+                offsets, size = [], 0
+                for _, length in manifest:
+                    offsets.append(size)
+                    size += length
+                # Chunks [first, last) overlap the write; one past the end
+                # starts from the last chunk so the gap is zero-filled after it
+                first = max(0, bisect.bisect_right(offsets, min(offset, size)) - 1)
+                last = max(bisect.bisect_left(offsets, offset + len(data)), min(first + 1, len(manifest)))
+                base = offsets[first] if manifest else 0
+                region = bytearray(b"".join(self._read_chunk(digest) for digest, _ in manifest[first:last]))
+                if len(region) < offset - base:
+                    region.extend(b"\0" * (offset - base - len(region)))
+                region[offset - base:offset - base + len(data)] = data
+                pieces = [(self._store_chunk(piece), len(piece)) for piece in self.chunker.split([bytes(region)])]
+                if self._commit(path, manifest[:first] + pieces + manifest[last:], expected):
+                    return True
+        finally:
+            self._end_write()
+
+    def create(self, path: str, is_dir: bool = False) -> bool:
+        path = self._norm(path)
+        if not is_dir:
+            if not self.get_attr(path):
+                self.write_stream(path, [])
+            return True
+        now = time.time()
+        with self._lock, self._conn:
+            self._ensure_parents(path + "/_", now)
+        return True
+
+    def delete(self, path: str) -> bool:
+        """Delete a file (dropping its chunk references) or an empty directory."""
+        path = self._norm(path)
+        if not path:
+            return False
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT is_dir, manifest FROM entries WHERE path = ?", (path,)).fetchone()
+            if not row:
+                return False
+            if row[0]:
+                if self._conn.execute("SELECT 1 FROM entries WHERE parent = ? LIMIT 1", (path,)).fetchone():
+                    raise OSError(errno.ENOTEMPTY, "Directory not empty", path)
+            else:
+                self._conn.executemany(
+                    "UPDATE chunks SET refs = refs - 1 WHERE hash = ?",
+                    [(digest,) for digest, _ in json.loads(row[1] or "[]")]
+                )
+            self._conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+        return True
+
+    # --- Maintenance ---
+
+    def gc(self) -> Dict[str, int]:
+        """Remove unreferenced chunks; waits for in-flight writes to commit first."""
+        with self._gc_guard:
+            while self._writers or self._collecting:
+                self._gc_guard.wait()
+            self._collecting = True
+        try:
+            with self._lock, self._conn:
+                dead = self._conn.execute("SELECT hash, size FROM chunks WHERE refs <= 0").fetchall()
+                self._conn.execute("DELETE FROM chunks WHERE refs <= 0")
+            for digest, _ in dead:
+                try:
+                    os.remove(self._chunk_path(digest))
+                except FileNotFoundError:
+                    pass
+            return {"chunks": len(dead), "bytes": sum(size for _, size in dead)}
+        finally:
+            with self._gc_guard:
+                self._collecting = False
+                self._gc_guard.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Logical vs. stored bytes; ratio > 1 means dedup is saving space."""
+        with self._lock:
+            logical = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries WHERE is_dir = 0").fetchone()[0]
+            stored, unique = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM chunks WHERE refs > 0"
+            ).fetchone()
+            garbage = self._conn.execute("SELECT COUNT(*) FROM chunks WHERE refs <= 0").fetchone()[0]
+        return {
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "unique_chunks": unique,
+            "garbage_chunks": garbage,
+            "dedup_ratio": round(logical / stored, 3) if stored else 1.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def migrate_local_root(source: LocalProvider, target: DedupProvider, path: str = "", on_file=None) -> Dict[str, int]:
+    """Copy a LocalProvider tree into a DedupProvider, keeping mtimes.
+
+    The source is left untouched; `on_file(path, size)` is called per file
+    for progress reporting.
+    """
+    totals = {"files": 0, "bytes": 0}
+    for name, attr in source.list_dir_with_attrs(path):
+        child = f"{path}/{name}" if path else name
+        if attr['st_mode'] & 0o40000:
+            target.create(child, is_dir=True)
+            sub = migrate_local_root(source, target, child, on_file)
+            totals["files"] += sub["files"]
+            totals["bytes"] += sub["bytes"]
+            continue
+        target.write_stream(child, source.read_stream(child))
+        with target._lock, target._conn:
+            target._conn.execute(
+                "UPDATE entries SET mtime = ?, ctime = ? WHERE path = ?",
+                (attr['st_mtime'], attr['st_ctime'], target._norm(child))
+            )
+        totals["files"] += 1
+        totals["bytes"] += attr['st_size']
+        if on_file:
+            on_file(child, attr['st_size'])
+    return totals
@@ -0,0 +1,377 @@
+import base64
+import binascii
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .pod_notify import coalesce
+
+class JournalError(Exception):
+    """Raised for unusable change cursors; `status` is the HTTP code to return."""
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+class ChangeJournal:
+    """
+    Persistent, append-only change log for one mount.
+
+    Recorded changes are coalesced in memory per path and written to SQLite
+    in batches (when `max_pending` paths are waiting, after `flush_interval`
+    seconds, or before a read). At write time each path is stat'ed once and
+    compared with the `state` table, the journal's last known view of the
+    mount: the op becomes Create or Update from that, and changes that left
+    size and mtime alone (e.g. the inotify echo of a hub write) are dropped.
+    A directory with no known children is walked when it shows up, so a tree
+    moved in from outside the hub has its contents journaled, not only its
+    root. Anything lost in a crash is picked up by reconcile() at the next
+    start.
+
+    compact() keeps one row per path and drops Delete rows older than the
+    retention period. `floor` records the newest dropped tombstone; cursors
+    older than that cannot be served, and their clients must rescan.
+    """
+    def __init__(self, db_path: str, provider, location: str = "",
+                 flush_interval: float = 1.0, max_pending: int = 256):
+        self.db_path = db_path
+        self.provider = provider
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._pending_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db(location)
+
+    def _init_db(self, location: str):
+        """Create the schema; a journal whose mount now points elsewhere starts a new epoch."""
+        self._conn.executescript('''
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT,
+                op TEXT,
+                is_dir INTEGER,
+                size INTEGER,
+                mtime REAL,
+                time REAL
+            );
+            CREATE INDEX IF NOT EXISTS changes_path ON changes (path);
+            CREATE TABLE IF NOT EXISTS state (
+                path TEXT PRIMARY KEY,
+                is_dir INTEGER,
+                size INTEGER,
+                mtime REAL
+            );
+        ''')
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if meta.get("location") != location:
+            self._conn.executescript("DELETE FROM changes; DELETE FROM state;")
+            meta = {"location": location, "epoch": secrets.token_hex(4), "floor": "0"}
+            self._conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", meta.items())
+        self._conn.commit()
+        self.epoch = meta["epoch"]
+        self.floor = int(meta["floor"])
+
+    @property
+    def head(self) -> int:
+        """Sequence number of the newest change (0 when empty)."""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(seq) FROM changes").fetchone()
+        return max(row[0] or 0, self.floor)
+
+    def record(self, path: str, op: str):
+        """Note a change to `path` ("Create", "Update" or "Delete")."""
+        path = path.strip('/')
+        with self._pending_lock:
+            if path in self._pending:
+                op = coalesce(self._pending.pop(path), op) or "Delete"
+            self._pending[path] = op
+            due = (len(self._pending) >= self.max_pending
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def _stat(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.provider.get_attr(path)
+        except (OSError, PermissionError):
+            return None
+
+    def flush(self):
+        """Write pending changes to the journal."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, OrderedDict()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        observed = []
+        for path, op in pending.items():
+            attr = None if op == "Delete" else self._stat(path)
+            observed.append((path, attr))
+            if path and attr and attr['st_mode'] & 0o40000 and not self._has_children(path):
+                observed.extend(self._walk(path))
+        with self._lock:
+            self._apply(observed)
+
+    def _has_children(self, path: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM state WHERE path >= ? AND path < ? LIMIT 1", (path + "/", path + "0")
+            ).fetchone() is not None
+
+    def _walk(self, path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(path, attr) for everything below `path`, depth-first."""
+        try:
+            entries = self.provider.list_dir_with_attrs(path)
+        except OSError:
+            return
+        for name, attr in entries:
+            if not attr:
+                continue
+            child = f"{path}/{name}" if path else name
+            yield child, attr
+            if attr['st_mode'] & 0o40000:
+                yield from self._walk(child)
+
+    def _apply(self, observed: List[Tuple[str, Optional[Dict[str, Any]]]]):
+        """Diff (path, attr or None for gone) against `state` and append what changed. Caller holds _lock."""
+        now = time.time()
+        rows = []
+        for path, attr in observed:
+            known = self._conn.execute("SELECT is_dir, size, mtime FROM state WHERE path = ?", (path,)).fetchone()
+            if attr is None:
+                # Everything below a removed directory goes with it, even one
+                # that was only created implicitly and so was never journaled
+                children = self._conn.execute(
+                    "SELECT path, is_dir FROM state WHERE path >= ? AND path < ?", (path + "/", path + "0")
+                ).fetchall()
+                rows.extend((child, "Delete", is_dir, None, None, now) for child, is_dir in children)
+                self._conn.execute("DELETE FROM state WHERE path >= ? AND path < ?", (path + "/", path + "0"))
+                if known is not None:
+                    rows.append((path, "Delete", known[0], None, None, now))
+                    self._conn.execute("DELETE FROM state WHERE path = ?", (path,))
+                continue
+            entry = (1 if attr['st_mode'] & 0o40000 else 0, attr.get('st_size', 0), attr.get('st_mtime', 0))
+            if known is not None and tuple(known) == entry:
+                continue
+            rows.append((path, "Update" if known else "Create", *entry, now))
+            self._conn.execute("INSERT OR REPLACE INTO state VALUES (?, ?, ?, ?)", (path, *entry))
+        if rows:
+            self._conn.executemany(
+                "INSERT INTO changes (path, op, is_dir, size, mtime, time) VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        self._conn.commit()
+
+    def reconcile(self, batch: int = 1000):
+        """Walk the mount once and journal whatever changed while nobody was recording."""
+        self.flush()
+        with self._lock:
+            known = {path for path, in self._conn.execute("SELECT path FROM state")}
+        seen = set()
+        observed = []
+        for child, attr in self._walk(""):
+            seen.add(child)
+            observed.append((child, attr))
+            if len(observed) >= batch:
+                with self._lock:
+                    self._apply(observed)
+                observed.clear()
+        # Re-stat before journaling a delete: the path may have been created behind the walk
+        observed.extend((path, self._stat(path)) for path in sorted(known - seen, reverse=True))
+        with self._lock:
+            self._apply(observed)
+
+    def changes(self, since: int, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Changes after `since` (oldest first) and whether more remain."""
+        if since < self.floor:
+            raise JournalError("Cursor predates the journal; rescan", status=410)
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, path, op, is_dir, size, mtime, time FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit + 1)
+            ).fetchall()
+        changes = [
+            {"seq": seq, "path": path, "op": op, "is_dir": bool(is_dir), "size": size, "mtime": mtime, "time": at}
+            for seq, path, op, is_dir, size, mtime, at in rows[:limit]
+        ]
+        return changes, len(rows) > limit
+
+    def compact(self, retention: float) -> int:
+        """Drop superseded rows and Delete rows older than `retention` seconds; returns rows removed."""
+        self.flush()
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM changes WHERE seq NOT IN (SELECT MAX(seq) FROM changes GROUP BY path)"
+            ).rowcount
+            cutoff = time.time() - retention
+            newest = self._conn.execute(
+                "SELECT MAX(seq) FROM changes WHERE op = 'Delete' AND time < ?", (cutoff,)
+            ).fetchone()[0]
+            if newest:
+                removed += self._conn.execute(
+                    "DELETE FROM changes WHERE op = 'Delete' AND seq <= ?", (newest,)
+                ).rowcount
+                self.floor = max(self.floor, newest)
+                self._conn.execute("UPDATE meta SET value = ? WHERE key = 'floor'", (str(self.floor),))
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+            tracked = self._conn.execute("SELECT COUNT(*) FROM state").fetchone()[0]
+        return {"entries": rows, "tracked": tracked, "floor": self.floor}
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+class ChangeJournals:
+    """
+    One ChangeJournal per locally stored mount, under `directory`.
+
+    Cursors are opaque strings naming an epoch and a sequence number per
+    mount. A mount whose journal was recreated or compacted past the cursor
+    is listed under "reset" in the response, telling the client to rescan
+    that mount; every other mount continues incrementally.
+    """
+    def __init__(self, directory: str, retention: float = 30 * 86400, compact_every: int = 10000):
+        self.directory = directory
+        self.retention = retention
+        self.compact_every = compact_every
+        self._journals: Dict[str, ChangeJournal] = {}
+        self._by_provider: Dict[int, ChangeJournal] = {}
+        self._recorded = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _location(provider) -> str:
+        """Where a provider keeps its files, so a remapped mount gets a fresh journal."""
+        for attr in ("root_path", "store_path", "roots"):
+            value = getattr(provider, attr, None)
+            if value:
+                return json.dumps(value)
+        return type(provider).__name__
+
+    def sync(self, mounts: Dict[str, Any], reconcile: bool = True):
+        """Open journals for `mounts` ({name: provider}) and close the rest."""
+        opened = []
+        with self._lock:
+            for name in list(self._journals):
+                journal = self._journals[name]
+                if mounts.get(name) is not journal.provider:
+                    self._by_provider.pop(id(journal.provider), None)
+                    del self._journals[name]
+                    journal.close()
+            for name, provider in mounts.items():
+                if name in self._journals:
+                    continue
+                db = os.path.join(self.directory, name.replace("/", "__") + ".db")
+                journal = ChangeJournal(db, provider, self._location(provider))
+                self._journals[name] = journal
+                self._by_provider[id(provider)] = journal
+                opened.append(journal)
+        if reconcile:
+            for journal in opened:
+                threading.Thread(target=self._startup, args=(journal,), daemon=True, name="journal-reconcile").start()
+
+    def _startup(self, journal: ChangeJournal):
+        try:
+            journal.reconcile()
+            journal.compact(self.retention)
+        except sqlite3.ProgrammingError:
+            pass  # Closed by a remount while scanning
+
+    def record(self, provider, path: str, op: str):
+        journal = self._by_provider.get(id(provider))
+        if journal is None:
+            return
+        journal.record(path, op)
+        self._recorded += 1
+        if self._recorded >= self.compact_every:
+            self._recorded = 0
+            for journal in list(self._journals.values()):
+                journal.compact(self.retention)
+
+    @staticmethod
+    def encode_cursor(positions: Dict[str, Tuple[str, int]]) -> str:
+        raw = json.dumps({name: [epoch, seq] for name, (epoch, seq) in positions.items()}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Dict[str, Tuple[str, int]]:
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return {name: (str(epoch), int(seq)) for name, (epoch, seq) in raw.items()}
+        except (binascii.Error, ValueError, TypeError, AttributeError):
+            raise JournalError("Invalid change cursor")
+
+    def cursor(self, allowed: Callable[[str], bool] = lambda name: True) -> str:
+        """Cursor at the current head of every (allowed) mount."""
+        return self.encode_cursor({
+            name: (journal.epoch, journal.head)
+            for name, journal in sorted(self._journals.items()) if allowed(name)
+        })
+
+    def changes(self, cursor: Optional[str], limit: int = 1000,
+                allowed: Callable[[str], bool] = lambda name: True) -> Dict[str, Any]:
+        """Changes since `cursor` across allowed mounts, paths prefixed with the mount name.
+
+        Without a cursor nothing is returned but the current position, which
+        a client takes before its initial full scan.
+        """
+        if not cursor:
+            return {"changes": [], "cursor": self.cursor(allowed), "has_more": False, "reset": []}
+        positions = self.decode_cursor(cursor)
+        result: List[Dict[str, Any]] = []
+        reset, more = [], False
+        for name, journal in sorted(self._journals.items()):
+            if not allowed(name):
+                continue
+            epoch, since = positions.get(name, (journal.epoch, 0))
+            if epoch != journal.epoch:
+                reset.append(name)
+                positions[name] = (journal.epoch, journal.head)
+                continue
+            try:
+                rows, has_more = journal.changes(since, max(0, limit - len(result)))
+            except JournalError:
+                reset.append(name)
+                positions[name] = (journal.epoch, journal.head)
+                continue
+            for row in rows:
+                row["mount"] = name
+                row["path"] = f"{name}/{row['path']}" if row["path"] else name
+            result.extend(rows)
+            if rows:
+                positions[name] = (epoch, rows[-1]["seq"])
+            more = more or has_more
+        # Mounts that no longer exist drop out of the cursor
+        positions = {name: pos for name, pos in positions.items() if name in self._journals}
+        return {"changes": result, "cursor": self.encode_cursor(positions), "has_more": more, "reset": reset}
+
+    @property
+    def mounts(self) -> List[str]:
+        return list(self._journals)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: journal.stats() for name, journal in self._journals.items()}
+
+    def close(self):
+        with self._lock:
+            for journal in self._journals.values():
+                journal.close()
+            self._journals.clear()
+            self._by_provider.clear()
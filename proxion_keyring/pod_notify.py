@@ -0,0 +1,190 @@
+import itertools
+import json
+import posixpath
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+NOTIFY_CONTEXT = ["https://www.w3.org/ns/activitystreams", "https://www.w3.org/ns/solid/notification/v1"]
+
+# (pending kind, new kind) -> coalesced kind; None cancels the pending event
+_COALESCE = {
+    ("Create", "Update"): "Create",
+    ("Create", "Delete"): None,
+    ("Update", "Create"): "Update",
+    ("Update", "Delete"): "Delete",
+    ("Delete", "Create"): "Update",
+    ("Delete", "Update"): "Update",
+}
+
+def coalesce(previous: str, kind: str) -> Optional[str]:
+    """Merge two changes to one path into one (None: they cancel out)."""
+    return _COALESCE.get((previous, kind), kind)
+
+class NotifyError(Exception):
+    """Raised when a subscription cannot be opened; `status` is the HTTP code to return."""
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+class Subscription:
+    """
+    Pending changes for one subscriber.
+
+    Events are keyed by path, so a burst of writes to one file (every chunk
+    of an upload raises an inotify event) collapses into a single event, and
+    the hub's own report of a mutation merges with the inotify echo of it.
+    At most `max_pending` paths are held; past that the backlog is dropped
+    and the subscriber is told to re-list the topic instead.
+    """
+    def __init__(self, topic: str, recursive: bool = False, max_pending: int = 256):
+        self.topic = topic.strip('/')
+        self.recursive = recursive
+        self.max_pending = max_pending
+        self.overflowed = False
+        self.closed = False
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._cond = threading.Condition()
+
+    def matches(self, path: str) -> bool:
+        """The topic itself and its members (all descendants when recursive)."""
+        if path == self.topic or posixpath.dirname(path) == self.topic:
+            return True
+        return self.recursive and (not self.topic or path.startswith(self.topic + "/"))
+
+    def offer(self, path: str, kind: str):
+        with self._cond:
+            if self.closed or self.overflowed:
+                return
+            if path in self._pending:
+                kind = coalesce(self._pending.pop(path), kind)
+                if kind is None:
+                    return
+            elif len(self._pending) >= self.max_pending:
+                self.reset()
+                return
+            self._pending[path] = kind
+            self._cond.notify()
+
+    def reset(self):
+        """Drop the backlog; the subscriber gets one reset event instead."""
+        with self._cond:
+            self._pending.clear()
+            self.overflowed = True
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+    def take(self, timeout: float, window: float = 0.0) -> Optional[List[Tuple[str, str]]]:
+        """Wait up to `timeout` for changes, then `window` more to let a burst
+        coalesce. Returns [(path, kind)], [("", "Reset")] after an overflow,
+        or None on timeout or close."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending or self.overflowed or self.closed, timeout):
+                return None
+            if self.closed:
+                return None
+        if window:
+            time.sleep(window)
+        with self._cond:
+            if self.overflowed:
+                self.overflowed = False
+                return [("", "Reset")]
+            batch = list(self._pending.items())
+            self._pending.clear()
+            return batch
+
+class ChangeNotifier:
+    """
+    Fans pod changes out to subscribers (Solid Notifications style).
+
+    HybridHub publishes its own mutations and the inotify events seen on
+    LocalProvider roots; publish() is a no-op while nobody is subscribed.
+    Each stream holds a server thread, so `max_subscribers` caps them.
+    """
+    def __init__(self, max_subscribers: int = 16, max_pending: int = 256,
+                 window: float = 0.25, heartbeat: float = 15.0):
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self.window = window
+        self.heartbeat = heartbeat
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    @property
+    def active(self) -> bool:
+        return bool(self._subscriptions)
+
+    def subscribe(self, topic: str, recursive: bool = False) -> Subscription:
+        sub = Subscription(topic, recursive, self.max_pending)
+        with self._lock:
+            if len(self._subscriptions) >= self.max_subscribers:
+                raise NotifyError("Too many notification subscribers", status=503)
+            self._subscriptions = self._subscriptions + [sub]
+        return sub
+
+    def recursive_match(self, path: str) -> bool:
+        """Whether a recursive subscription covers `path` (its subtree must be watched)."""
+        path = path.strip('/')
+        return any(sub.recursive and sub.matches(path) for sub in self._subscriptions)
+
+    def unsubscribe(self, sub: Subscription):
+        sub.close()
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not sub]
+
+    def publish(self, path: str, kind: str):
+        path = path.strip('/')
+        for sub in self._subscriptions:  # Copy-on-write list; no lock needed
+            if sub.matches(path):
+                sub.offer(path, kind)
+
+    def reset(self):
+        """Events were lost (inotify overflow): every subscriber must re-list."""
+        for sub in self._subscriptions:
+            sub.reset()
+
+    def stats(self) -> Dict[str, int]:
+        return {"subscribers": len(self._subscriptions)}
+
+    def activity(self, sub: Subscription, path: str, kind: str, base_url: str) -> Dict[str, object]:
+        """Activity Streams object for one change, as Solid Notifications sends it.
+
+        Changes to members of the subscribed container are reported as Add
+        and Remove on that container, like a Solid server does.
+        """
+        topic_url = base_url + sub.topic
+        if kind == "Reset":
+            return {"@context": NOTIFY_CONTEXT, "id": f"urn:uuid:{uuid.uuid4()}", "type": "Reset",
+                    "object": topic_url, "published": _now()}
+        event = {"@context": NOTIFY_CONTEXT, "id": f"urn:uuid:{uuid.uuid4()}", "type": kind,
+                 "object": base_url + path, "published": _now()}
+        if path != sub.topic:
+            event["target"] = base_url + posixpath.dirname(path)
+            event["type"] = {"Create": "Add", "Delete": "Remove"}.get(kind, kind)
+        return event
+
+    def stream(self, sub: Subscription, base_url: str) -> Iterator[str]:
+        """text/event-stream for `sub`; unsubscribes when the client goes away."""
+        try:
+            yield ": subscribed\n\n"
+            while not sub.closed:
+                batch = sub.take(self.heartbeat, self.window)
+                if batch is None:
+                    yield ": keepalive\n\n"
+                    continue
+                for path, kind in batch:
+                    event = self.activity(sub, path, kind, base_url)
+                    yield f"id: {next(self._ids)}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
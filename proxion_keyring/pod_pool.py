@@ -0,0 +1,274 @@
+import errno
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .pod_proxy import BaseResourceProvider, LocalProvider
+
+class FreeSpaceCache:
+    """shutil.disk_usage per branch, refreshed at most every `interval` seconds.
+
+    Writes debit the cached figure immediately so a burst of placements
+    spreads out before the next real refresh. usage() serves the same
+    snapshot to storage stats, so polling them never touches the disks.
+    """
+    def __init__(self, roots: List[str], interval: float = 30.0):
+        self.roots = roots
+        self.interval = interval
+        self._free: Dict[str, int] = {}
+        self._disk: Dict[str, Tuple[int, int]] = {}  # root -> (total, used)
+        self._refreshed: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        free, disk = {}, {}
+        for root in self.roots:
+            try:
+                total, used, free[root] = shutil.disk_usage(root)
+                disk[root] = (total, used)
+            except OSError:
+                free[root] = 0  # Unplugged or unreadable branch
+        with self._lock:
+            self._free = free
+            self._disk = disk
+            self._refreshed = time.monotonic()
+
+    def _expire(self):
+        if self._refreshed is None or time.monotonic() - self._refreshed > self.interval:
+            self.refresh()
+
+    def free(self, root: str) -> int:
+        self._expire()
+        with self._lock:
+            return self._free.get(root, 0)
+
+    def usage(self, root: str) -> Optional[Tuple[int, int, int]]:
+        """(total, used, free) for `root`, or None if it could not be read."""
+        self._expire()
+        with self._lock:
+            if root not in self._disk:
+                return None
+            total, used = self._disk[root]
+            return total, used, self._free.get(root, 0)
+
+    def debit(self, root: str, size: int):
+        with self._lock:
+            if root in self._free:
+                self._free[root] = max(0, self._free[root] - size)
+            if root in self._disk:
+                total, used = self._disk[root]
+                self._disk[root] = (total, min(total, used + size))
+
+    def snapshot(self) -> Dict[str, int]:
+        return {root: self.free(root) for root in self.roots}
+
+class MostFreeSpace:
+    """mergerfs 'mfs': the branch with the most free space."""
+    def choose(self, pool: "PooledProvider", path: str, branches: List[LocalProvider]) -> LocalProvider:
+        return max(branches, key=lambda b: pool.free_space.free(b.root_path))
+
+class RoundRobin:
+    """Rotate new files across branches."""
+    def __init__(self):
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def choose(self, pool: "PooledProvider", path: str, branches: List[LocalProvider]) -> LocalProvider:
+        with self._lock:
+            branch = branches[self._next % len(branches)]
+            self._next += 1
+        return branch
+
+class PathPreserving:
+    """mergerfs 'epmfs': most free space among branches where the parent
+    directory already exists, keeping related files together; falls back to
+    most-free-space when no branch has the parent yet."""
+    def choose(self, pool: "PooledProvider", path: str, branches: List[LocalProvider]) -> LocalProvider:
+        parent = os.path.dirname(path.strip('/'))
+        existing = [b for b in branches if os.path.isdir(b._safe_path(parent))]
+        return MostFreeSpace().choose(pool, path, existing or branches)
+
+PLACEMENT_POLICIES: Dict[str, Callable[[], Any]] = {
+    "mfs": MostFreeSpace,
+    "rr": RoundRobin,
+    "epmfs": PathPreserving,
+}
+
+def register_policy(name: str, factory: Callable[[], Any]):
+    """Make a placement policy (an object with choose(pool, path, branches)) available by name."""
+    PLACEMENT_POLICIES[name] = factory
+
+class PooledProvider(BaseResourceProvider):
+    """
+    Union of several LocalProvider branches presented as one namespace.
+
+    Existing files are read and patched where they live, found through a
+    bounded location index (path -> branch) that is verified on use and
+    repaired by probing branches in order. New files go to the branch picked
+    by the placement policy, skipping branches below `min_free` bytes.
+    Directories are merged across branches; the first branch wins name clashes.
+    `branch_factory` builds each branch (e.g. a compressing LocalProvider).
+    `roots` lists the branch directories, which HybridHub watches.
+    """
+    def __init__(self, roots: List[str], policy: str = "mfs", min_free: int = 0,
+                 refresh_interval: float = 30.0, index_size: int = 65536,
+                 branch_factory: Callable[[str], LocalProvider] = LocalProvider):
+        if policy not in PLACEMENT_POLICIES:
+            raise ValueError(f"Unknown placement policy: {policy}")
+        self.branches = [branch_factory(r) for r in roots]
+        self.roots = [b.root_path for b in self.branches]
+        self.policy_name = policy
+        self.policy = PLACEMENT_POLICIES[policy]()
+        self.min_free = min_free
+        self.free_space = FreeSpaceCache(self.roots, refresh_interval)
+        self.index_size = index_size
+        self._index: "OrderedDict[str, LocalProvider]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- Location Index ---
+
+    def _remember(self, path: str, branch: LocalProvider):
+        with self._lock:
+            self._index[path] = branch
+            self._index.move_to_end(path)
+            while len(self._index) > self.index_size:
+                self._index.popitem(last=False)
+
+    def _forget(self, path: str, recursive: bool = False):
+        with self._lock:
+            self._index.pop(path, None)
+            if recursive:
+                prefix = path + '/'
+                for key in [k for k in self._index if k.startswith(prefix)]:
+                    del self._index[key]
+
+    def _locate(self, path: str) -> Tuple[Optional[LocalProvider], Optional[Dict[str, Any]]]:
+        """(branch, attr) holding `path`; indexed hits are re-verified with one stat."""
+        path = path.strip('/')
+        with self._lock:
+            branch = self._index.get(path)
+        if branch:
+            attr = branch.get_attr(path)
+            if attr:
+                return branch, attr
+            self._forget(path)
+        for branch in self.branches:
+            attr = branch.get_attr(path)
+            if attr:
+                self._remember(path, branch)
+                return branch, attr
+        return None, None
+
+    def _place(self, path: str) -> LocalProvider:
+        candidates = [b for b in self.branches if self.free_space.free(b.root_path) > self.min_free]
+        return self.policy.choose(self, path, candidates or self.branches)
+
+    # --- Reads ---
+
+    def get_attr(self, path: str):
+        if not path.strip('/'):
+            return self.branches[0].get_attr("")
+        return self._locate(path)[1]
+
+    def list_dir(self, path: str):
+        return [name for name, _ in self.list_dir_with_attrs(path)]
+
+    def list_dir_with_attrs(self, path: str):
+        sub = path.strip('/')
+        merged: Dict[str, Dict[str, Any]] = {}
+        for branch in self.branches:
+            for name, attr in branch.list_dir_with_attrs(sub):
+                if name in merged:
+                    continue
+                merged[name] = attr
+                if not attr['st_mode'] & 0o40000:
+                    self._remember(f"{sub}/{name}" if sub else name, branch)
+        return list(merged.items())
+
+    def read_stream(self, path: str):
+        branch, _ = self._locate(path)
+        if not branch:
+            raise FileNotFoundError(path)
+        return branch.read_stream(path)
+
+    def read_range(self, path: str, start: int, length: int):
+        branch, _ = self._locate(path)
+        if not branch:
+            raise FileNotFoundError(path)
+        return branch.read_range(path, start, length)
+
+    def open_file(self, path: str):
+        branch, _ = self._locate(path)
+        if not branch:
+            raise FileNotFoundError(path)
+        return branch.open_file(path)
+
+    # --- Writes ---
+
+    def _target(self, path: str) -> LocalProvider:
+        branch, attr = self._locate(path)
+        if branch and not attr['st_mode'] & 0o40000:
+            return branch
+        branch = self._place(path)
+        self._remember(path.strip('/'), branch)
+        return branch
+
+    def write(self, path: str, data: bytes, offset: int = 0) -> bool:
+        branch = self._target(path)
+        ok = branch.write(path, data, offset)
+        self.free_space.debit(branch.root_path, len(data))
+        return ok
+
+    def write_stream(self, path: str, chunks, offset: Optional[int] = None) -> bool:
+        branch = self._target(path)
+        written = 0
+        def counted():
+            nonlocal written
+            for chunk in chunks:
+                written += len(chunk)
+                yield chunk
+        ok = branch.write_stream(path, counted(), offset)
+        self.free_space.debit(branch.root_path, written)
+        return ok
+
+    def flush(self, path: str) -> bool:
+        branch, _ = self._locate(path)
+        return branch.flush(path) if branch else True
+
+    def create(self, path: str, is_dir: bool = False) -> bool:
+        if is_dir:
+            return self._place(path).create(path, is_dir=True)
+        return self._target(path).create(path)
+
+    def delete(self, path: str) -> bool:
+        """Remove a file from its branch, or a directory from every branch.
+
+        A directory must be empty on every branch, which is checked before
+        any branch removes it, so a refusal leaves all copies in place.
+        """
+        sub = path.strip('/')
+        holders = [(branch, attr) for branch in self.branches if (attr := branch.get_attr(sub))]
+        for branch, attr in holders:
+            if attr['st_mode'] & 0o40000 and os.listdir(branch._safe_path(sub)):
+                raise OSError(errno.ENOTEMPTY, "Directory not empty", path)
+        deleted = False
+        for branch, _ in holders:
+            deleted = branch.delete(sub) or deleted
+        self._forget(sub, recursive=True)
+        return deleted
+
+    def close(self):
+        for branch in self.branches:
+            close = getattr(branch, "close", None)
+            if close:
+                close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy_name,
+            "branches": self.free_space.snapshot(),
+            "indexed_paths": len(self._index)
+        }
@@ -1,19 +1,221 @@
+import io
 import os
+import sys
+import atexit
+import bisect
+import copy
 import errno
+import hashlib
+import json
+import posixpath
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
 from flask import Flask, request, Response, jsonify
 import requests
 from .manager import KeyringManager
-from typing import List, Dict, Optional, Any
+from .pod_archive import ARCHIVE_TYPES, ArchiveError, ArchiveExporter, ArchiveImporter
+from .pod_batch import BatchError, BatchExecutor, BatchOperation, encode_multipart, encode_ndjson, new_boundary
+from .pod_journal import ChangeJournals, JournalError
+from .pod_notify import ChangeNotifier, NotifyError, Subscription
+from .pod_uploads import ChunkedUploads, UploadError
+from typing import List, Dict, Optional, Any, Tuple, Iterable, Callable
 
 class BaseResourceProvider:
     """Interface for Solid Resource Providers (Local, Remote, Virtual)."""
     def get_attr(self, path: str) -> Optional[Dict[str, Any]]: ...
     def list_dir(self, path: str) -> List[str]: ...
     def read_stream(self, path: str): ...
+
+    def read_range(self, path: str, start: int, length: int):
+        """Yield `length` bytes from `start`. Generic skip/truncate fallback
+        over read_stream for providers without random access."""
+        pos = 0
+        for chunk in self.read_stream(path):
+            end = pos + len(chunk)
+            if end > start:
+                piece = chunk[max(0, start - pos):start + length - pos]
+                if piece:
+                    yield piece
+            pos = end
+            if pos >= start + length:
+                break
+
+    def open_file(self, path: str):
+        """Return a real binary file object for disk-backed providers, else None."""
+        return None
+
+    def write_stream(self, path: str, chunks, offset: Optional[int] = None) -> bool:
+        """Write an iterable of byte chunks. offset=None replaces the whole
+        resource; an int patches in place like `write`. This fallback buffers."""
+        return self.write(path, b"".join(chunks), offset or 0)
+
+    def list_dir_with_attrs(self, path: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """List a container as (name, attr) pairs. Providers that can fetch
+        both in one pass should override this generic N+1 fallback."""
+        results = []
+        for name in self.list_dir(path):
+            attr = self.get_attr(path.rstrip('/') + "/" + name if path.strip('/') else name)
+            if attr:
+                results.append((name, attr))
+        return results
+
+    def list_dir_page(self, path: str, after: Optional[str], limit: int) -> Tuple[List[Tuple[str, Dict[str, Any]]], bool]:
+        """Return (entries, has_more): up to `limit` (name, attr) pairs sorted
+        by name and strictly after `after`. Keyset paging by name stays stable
+        while the container changes. This fallback sorts the full listing."""
+        entries = sorted(self.list_dir_with_attrs(path), key=lambda e: e[0])
+        if after is not None:
+            entries = entries[bisect.bisect_right([name for name, _ in entries], after):]
+        return entries[:limit], len(entries) > limit
+
     def write(self, path: str, data: bytes, offset: int = 0) -> bool: ...
     def create(self, path: str, is_dir: bool = False) -> bool: ...
     def delete(self, path: str) -> bool: ...
 
+    def flush(self, path: str) -> bool:
+        """Make earlier writes to `path` durable. Providers without write caching have nothing to do."""
+        return True
+
+class _WriteHandle:
+    __slots__ = ("path", "file", "lock", "dirty", "closed", "last_used")
+
+    def __init__(self, path: str, file):
+        self.path = path
+        self.file = file
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.closed = False
+        self.last_used = time.monotonic()
+
+class WriteHandleCache:
+    """
+    Open handles for offset writes, keyed by absolute local path.
+
+    Sequential chunked writes (the FUSE driver sends a file as many offset
+    writes) reuse one buffered handle instead of paying makedirs/exists/
+    open/close per chunk, and the seek is skipped when a write continues
+    where the last one ended. Each write() ends with a flush to the OS, so
+    any reader, through the provider or straight from disk, sees every
+    acknowledged byte; only fsync is deferred. A handle is fsynced and
+    closed once, after `idle_timeout` seconds unused, when more than
+    `max_handles` are open (least recently used first), or on close().
+    `on_retire(path)` is then called for handles that were written to,
+    except on close(sync=False), which callers use to discard a file.
+    """
+    def __init__(self, max_handles: int = 64, idle_timeout: float = 5.0, buffer_size: int = 256 * 1024,
+                 on_retire: Optional[Callable[[str], None]] = None):
+        self.max_handles = max_handles
+        self.idle_timeout = idle_timeout
+        self.buffer_size = buffer_size
+        self.on_retire = on_retire
+        self._handles: "OrderedDict[str, _WriteHandle]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self.opens = 0
+        self.syncs = 0
+
+    def write(self, path: str, chunks: Iterable[bytes], offset: int):
+        """Write `chunks` contiguously from `offset`, then flush them to the OS."""
+        while True:
+            handle = self._checkout(path)
+            with handle.lock:
+                if handle.closed:
+                    continue  # Evicted between checkout and lock; reopen
+                f = handle.file
+                if f.tell() != offset:
+                    f.seek(offset)
+                for chunk in chunks:
+                    f.write(chunk)
+                f.flush()
+                handle.dirty = True
+                handle.last_used = time.monotonic()
+                return
+
+    def _checkout(self, path: str) -> _WriteHandle:
+        with self._lock:
+            handle = self._handles.get(path)
+            if handle:
+                self._handles.move_to_end(path)
+                return handle
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o666)
+        handle = _WriteHandle(path, os.fdopen(fd, 'r+b', buffering=self.buffer_size))
+        victims = []
+        with self._lock:
+            existing = self._handles.get(path)
+            if existing:
+                handle.file.close()  # Lost an open race; nothing was written yet
+                return existing
+            self._handles[path] = handle
+            self.opens += 1
+            while len(self._handles) > self.max_handles:
+                victims.append(self._handles.popitem(last=False)[1])
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, daemon=True, name="write-handle-reaper")
+                self._reaper.start()
+        for victim in victims:
+            self._close(victim, sync=True)
+        return handle
+
+    def _close(self, handle: _WriteHandle, sync: bool):
+        with handle.lock:
+            if handle.closed:
+                return
+            handle.closed = True
+            try:
+                handle.file.flush()
+                if sync and handle.dirty:
+                    os.fsync(handle.file.fileno())
+                    self.syncs += 1
+            finally:
+                handle.file.close()
+        if sync and handle.dirty and self.on_retire:
+            self.on_retire(handle.path)
+
+    def _reap(self):
+        while True:
+            time.sleep(max(0.1, self.idle_timeout / 2))
+            now = time.monotonic()
+            with self._lock:
+                idle = [p for p, h in self._handles.items() if now - h.last_used > self.idle_timeout]
+                victims = [self._handles.pop(p) for p in idle]
+                done = not self._handles
+                if done:
+                    self._reaper = None  # Restarted by the next checkout
+            for victim in victims:
+                self._close(victim, sync=True)
+            if done:
+                return
+
+    def close(self, path: str, sync: bool = True):
+        """Flush, optionally fsync, and close the handle for `path` (and any below it)."""
+        prefix = os.path.join(path, '')
+        with self._lock:
+            victims = [self._handles.pop(p) for p in [p for p in self._handles if p == path or p.startswith(prefix)]]
+        for victim in victims:
+            self._close(victim, sync)
+
+    def is_open(self, path: str) -> bool:
+        with self._lock:
+            return path in self._handles
+
+    def close_all(self):
+        with self._lock:
+            victims = list(self._handles.values())
+            self._handles.clear()
+        for victim in victims:
+            self._close(victim, sync=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"open": len(self._handles), "opens": self.opens, "syncs": self.syncs}
+
+# Shared by the proxy's local mounts when pod_write_handles is enabled
+WRITE_HANDLES = WriteHandleCache(idle_timeout=1.0)
+atexit.register(WRITE_HANDLES.close_all)
+
 class LocalProvider(BaseResourceProvider):
     """MANAGES ACCESS to the physical POD_LOCAL_ROOT."""
     EXCLUSION_LIST = {
@@ -21,9 +223,15 @@ class LocalProvider(BaseResourceProvider):
         'Thumbs.db', 'proxion_config.json', 'warden_blocklist.txt'
     }
     HIDDEN_LIST = {'.acl', '.meta'}
+    UPLOAD_SUFFIX = '.proxion-upload'
+    SORTED_DIRS = 64  # Directories whose sorted names list_dir_page keeps between pages
 
-    def __init__(self, root_path: str):
+    def __init__(self, root_path: str, write_handles: Optional[WriteHandleCache] = None):
         self.root_path = os.path.abspath(root_path)
+        # Opt-in; without one, every write opens and closes its file
+        self.write_handles = write_handles
+        self._sorted: "OrderedDict[str, Tuple[Tuple[int, int], List[str]]]" = OrderedDict()
+        self._sorted_lock = threading.Lock()
 
     def _safe_path(self, pod_path: str) -> str:
         """Translates pod path to safe local path, preventing traversal."""
@@ -40,8 +248,18 @@ class LocalProvider(BaseResourceProvider):
 
     def get_attr(self, pod_path: str):
         path = self._safe_path(pod_path)
-        if not os.path.exists(path): return None
-        st = os.stat(path)
+        try:
+            st = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return self._attr(path, st)
+
+    def _attr(self, path: str, st) -> Dict[str, Any]:
+        """Attrs for a local file from its stat result (subclasses adjust them)."""
+        return self._stat_attr(st)
+
+    @staticmethod
+    def _stat_attr(st) -> Dict[str, Any]:
         return {
             "st_mode": st.st_mode,
             "st_nlink": st.st_nlink,
@@ -52,17 +270,79 @@ class LocalProvider(BaseResourceProvider):
             "proxion_status": "synced"
         }
 
+    def _is_listed(self, name: str) -> bool:
+        """Filter exclusions and hidden sidecars out of listings."""
+        return (
+            name not in self.EXCLUSION_LIST
+            and not any(name.endswith(ext) for ext in self.HIDDEN_LIST)
+            and not name.endswith(self.UPLOAD_SUFFIX)
+            and not any(name.endswith(ext) for ext in self.EXCLUSION_LIST if ext.startswith('.'))
+        )
+
     def list_dir(self, pod_path: str):
         path = self._safe_path(pod_path)
         if not os.path.isdir(path): return []
-        entries = os.listdir(path)
-        # Filter exclusions and hidden sidecars
-        return [
-            e for e in entries 
-            if e not in self.EXCLUSION_LIST 
-            and not any(e.endswith(ext) for ext in self.HIDDEN_LIST)
-            and not any(e.endswith(ext) for ext in self.EXCLUSION_LIST if ext.startswith('.'))
-        ]
+        return [e for e in os.listdir(path) if self._is_listed(e)]
+
+    def list_dir_with_attrs(self, pod_path: str):
+        """Single os.scandir sweep; DirEntry.stat() is free on Windows and
+        skips path resolution on POSIX."""
+        path = self._safe_path(pod_path)
+        results = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not self._is_listed(entry.name):
+                        continue
+                    try:
+                        results.append((entry.name, self._attr(entry.path, entry.stat())))
+                    except OSError:
+                        continue  # Vanished or dangling symlink
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        return results
+
+    def list_dir_page(self, pod_path: str, after: Optional[str], limit: int):
+        """Sort names from one scandir pass, then stat only the requested page.
+
+        The sorted names are kept per directory until its mtime changes, so
+        walking a large container page by page sorts it once.
+        """
+        path = self._safe_path(pod_path)
+        try:
+            names = self._sorted_names(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return [], False
+        start = bisect.bisect_right(names, after) if after is not None else 0
+        results = []
+        for i in range(start, len(names)):
+            if len(results) == limit:
+                return results, True
+            child = os.path.join(path, names[i])
+            try:
+                results.append((names[i], self._attr(child, os.stat(child))))
+            except OSError:
+                continue  # Vanished or dangling symlink
+        return results, False
+
+    def _sorted_names(self, path: str) -> List[str]:
+        st = os.stat(path)
+        key = (st.st_ino, st.st_mtime_ns)
+        with self._sorted_lock:
+            cached = self._sorted.get(path)
+            if cached and cached[0] == key:
+                self._sorted.move_to_end(path)
+                return cached[1]
+        with os.scandir(path) as it:
+            names = sorted(entry.name for entry in it if self._is_listed(entry.name))
+        # A change within the mtime's granularity would go unseen; only keep settled listings
+        if time.time() - st.st_mtime >= 1:
+            with self._sorted_lock:
+                self._sorted[path] = (key, names)
+                self._sorted.move_to_end(path)
+                while len(self._sorted) > self.SORTED_DIRS:
+                    self._sorted.popitem(last=False)
+        return names
 
     def read_stream(self, pod_path: str):
         path = self._safe_path(pod_path)
@@ -71,8 +351,18 @@ class LocalProvider(BaseResourceProvider):
                 while chunk := f.read(1024*64): yield chunk
         return generate()
 
+    def read_range(self, pod_path: str, start: int, length: int):
+        with self.open_file(pod_path) as f:
+            yield from FileRange(f, start, length, close_file=False)
+
+    def open_file(self, pod_path: str):
+        return open(self._safe_path(pod_path), "rb")
+
     def write(self, pod_path: str, data: bytes, offset: int = 0):
         path = self._safe_path(pod_path)
+        if self.write_handles:
+            self.write_handles.write(path, [data], offset)
+            return True
         os.makedirs(os.path.dirname(path), exist_ok=True)
         mode = 'r+b' if os.path.exists(path) else 'wb'
         with open(path, mode) as f:
@@ -80,17 +370,67 @@ class LocalProvider(BaseResourceProvider):
             f.write(data)
         return True
 
+    def write_stream(self, pod_path: str, chunks, offset: Optional[int] = None):
+        """Stream chunks to disk one at a time (memory stays at one chunk).
+
+        Full replacements land in a hidden sibling temp file that is fsynced
+        and atomically renamed over the target, so readers never observe a
+        half-written resource and a failed upload leaves the old one intact.
+        """
+        path = self._safe_path(pod_path)
+        if offset is not None and self.write_handles:
+            self.write_handles.write(path, chunks, offset)
+            return True
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if offset is not None:
+            mode = 'r+b' if os.path.exists(path) else 'wb'
+            with open(path, mode) as f:
+                f.seek(offset)
+                for chunk in chunks:
+                    f.write(chunk)
+            return True
+
+        import secrets
+        tmp = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{secrets.token_hex(4)}{self.UPLOAD_SUFFIX}")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.write_handles:
+                self.write_handles.close(path, sync=False)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return True
+
     def create(self, pod_path: str, is_dir: bool = False):
         path = self._safe_path(pod_path)
         if is_dir:
             os.makedirs(path, exist_ok=True)
         else:
             os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self.write_handles:
+                self.write_handles.close(path, sync=False)
             open(path, 'wb').close()
         return True
 
+    def flush(self, pod_path: str):
+        """Close the cached write handle for a resource, fsyncing what it wrote."""
+        if self.write_handles:
+            self.write_handles.close(self._safe_path(pod_path))
+        return True
+
     def delete(self, pod_path: str):
         path = self._safe_path(pod_path)
+        if self.write_handles:
+            self.write_handles.close(path, sync=False)
         if os.path.isdir(path):
             os.rmdir(path)
         else:
@@ -109,7 +449,7 @@ class LocalProvider(BaseResourceProvider):
                 except:
                     pass
 
-class RemoteProvider(BaseResourceProvider):
+class DemoRemoteProvider(BaseResourceProvider):
     """MOCK Provider for demonstrating Hybrid Hub (Remote Solid Resources)."""
     def __init__(self, name: str):
         self.name = name
@@ -125,115 +465,1266 @@ class RemoteProvider(BaseResourceProvider):
     def list_dir(self, path: str):
         return ["cloud_data.txt"] if not path or path == "/" else []
 
+    def list_dir_with_attrs(self, path: str):
+        return [(name, self.get_attr(name)) for name in self.list_dir(path)]
+
     def read_stream(self, path: str):
         yield b"This is a virtual remote resource from " + self.name.encode()
 
-class HybridHub(BaseResourceProvider):
-    """Multiplexes between Local and Remote providers based on path prefixes."""
+class RemoteProvider(BaseResourceProvider):
+    """
+    Solid/LDP pod reached over HTTP.
+
+    All requests share one pooled keep-alive requests.Session. Container
+    listings are parsed from Turtle/JSON-LD; members whose size or mtime the
+    listing omits are HEADed concurrently on a bounded thread pool.
+
+    LDP has no partial writes, so offset writes are staged: the resource is
+    downloaded once into a local file under `staging_dir`, patched there
+    through a private WriteHandleCache, and uploaded whole when its handle
+    is retired (flush(), `idle_timeout` seconds without writes, or
+    eviction). Until then reads and attrs come from the staged file
+    (proxion_status "pending"). A run of offset writes costs one download
+    and one upload of the file, not one of each per write.
+    """
+    CHUNK_SIZE = 256 * 1024
+    ACCEPT_CONTAINER = "text/turtle, application/ld+json;q=0.9"
+
+    def __init__(self, name: str, base_url: str, token: Optional[str] = None,
+                 pool_size: int = 16, max_workers: int = 8, timeout: float = 15.0,
+                 session: Optional[requests.Session] = None, staging_dir: Optional[str] = None,
+                 idle_timeout: float = 5.0):
+        from concurrent.futures import ThreadPoolExecutor
+        from requests.adapters import HTTPAdapter
+        self.name = name
+        self.base_url = base_url.rstrip('/') + '/'
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"remote-{name}")
+        self.staging_dir = staging_dir  # Created on the first offset write when None
+        self._staged: Dict[str, str] = {}  # subpath -> staging file
+        self._stage_locks = [threading.Lock() for _ in range(32)]
+        self.write_handles = WriteHandleCache(max_handles=16, idle_timeout=idle_timeout, on_retire=self._retired)
+
+    # --- URL Mapping ---
+
+    def _url(self, path: str, is_dir: bool = False) -> str:
+        from urllib.parse import quote
+        sub = path.strip('/')
+        url = self.base_url + quote(sub)
+        return url + '/' if is_dir and sub else url
+
+    def _name(self, url: str) -> str:
+        from urllib.parse import unquote
+        return unquote(url.rstrip('/').rsplit('/', 1)[-1])
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, timeout=self.timeout, **kwargs)
+
+    @staticmethod
+    def _is_container(resp: requests.Response) -> bool:
+        link = resp.headers.get("Link", "")
+        return resp.url.endswith('/') or 'ldp#BasicContainer' in link or 'ldp#Container' in link
+
+    def _attr_from_response(self, resp: requests.Response, is_dir: bool) -> Dict[str, Any]:
+        from .ldp import http_timestamp
+        mtime = http_timestamp(resp.headers.get("Last-Modified"))
+        return {
+            "st_mode": 0o40755 if is_dir else 0o100644,
+            "st_size": 0 if is_dir else int(resp.headers.get("Content-Length") or 0),
+            "st_ctime": mtime,
+            "st_mtime": mtime,
+            "proxion_status": "cloud-only"
+        }
+
+    # --- Staging ---
+
+    def _stage_lock(self, key: str) -> threading.Lock:
+        return self._stage_locks[hash(key) % len(self._stage_locks)]
+
+    def _open_staged(self, path: str):
+        staged = self._staged.get(path.strip('/'))
+        if staged:
+            try:
+                return open(staged, "rb")
+            except FileNotFoundError:
+                pass  # Uploaded and dropped meanwhile
+        return None
+
+    def _staged_attr(self, staged: str) -> Optional[Dict[str, Any]]:
+        try:
+            st = os.stat(staged)
+        except FileNotFoundError:
+            return None
+        return {"st_mode": 0o100644, "st_size": st.st_size, "st_ctime": st.st_ctime,
+                "st_mtime": st.st_mtime, "proxion_status": "pending"}
+
+    def _stage(self, key: str) -> str:
+        """Staging file seeded with the resource's current body (caller holds the stage lock)."""
+        if self.staging_dir is None:
+            self.staging_dir = tempfile.mkdtemp(prefix=f"proxion-{self.name}-")
+        staged = os.path.join(self.staging_dir, hashlib.sha256(key.encode()).hexdigest())
+        with open(staged, "wb") as f:
+            try:
+                for chunk in self.read_stream(key):
+                    f.write(chunk)
+            except FileNotFoundError:
+                pass  # New resource
+        self._staged[key] = staged
+        return staged
+
+    def _retired(self, staged: str):
+        """WriteHandleCache hook: upload in the background once a staged file goes idle."""
+        for key, path in list(self._staged.items()):
+            if path == staged:
+                self._executor.submit(self._upload, key)
+
+    def _upload(self, key: str) -> bool:
+        """PUT a staged resource and drop the staging file, unless writes resumed."""
+        with self._stage_lock(key):
+            staged = self._staged.get(key)
+            if staged is None or self.write_handles.is_open(staged):
+                return True
+            with open(staged, "rb") as f:
+                ok = self._put(key, iter(lambda: f.read(self.CHUNK_SIZE), b""))
+            if ok:  # On failure the staged bytes stay for the next flush
+                del self._staged[key]
+                os.remove(staged)
+            return ok
+
+    def _discard(self, key: str):
+        """Drop staged writes that a replace or delete supersedes."""
+        with self._stage_lock(key):
+            staged = self._staged.pop(key, None)
+            if staged:
+                self.write_handles.close(staged, sync=False)
+                try:
+                    os.remove(staged)
+                except FileNotFoundError:
+                    pass
+
+    # --- Reads ---
+
+    def get_attr(self, path: str):
+        if not path.strip('/'):
+            return {"st_mode": 0o40755, "st_size": 0, "st_ctime": 0, "st_mtime": 0, "proxion_status": "cloud-only"}
+        staged = self._staged.get(path.strip('/'))
+        attr = self._staged_attr(staged) if staged else None
+        if attr:
+            return attr
+        # Solid gives containers a trailing slash; try the document first
+        for is_dir in (path.endswith('/'), not path.endswith('/')):
+            try:
+                resp = self._request("HEAD", self._url(path, is_dir), allow_redirects=True)
+                if resp.ok:
+                    return self._attr_from_response(resp, is_dir or self._is_container(resp))
+            except (requests.RequestException, ValueError):
+                return None  # Unreachable, or a malformed Content-Length
+        return None
+
+    def list_dir(self, path: str):
+        return [name for name, _ in self.list_dir_with_attrs(path)]
+
+    def list_dir_with_attrs(self, path: str) -> List[Tuple[str, Dict[str, Any]]]:
+        from .ldp import parse_container
+        url = self._url(path, is_dir=True)
+        try:
+            resp = self._request("GET", url, headers={"Accept": self.ACCEPT_CONTAINER})
+        except requests.RequestException:
+            return []
+        if not resp.ok:
+            return []
+        try:
+            members = parse_container(resp.text, resp.headers.get("Content-Type", ""), resp.url)
+        except ValueError:
+            return []  # Malformed container; treat like an unreadable one
+
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for member_url, meta in members:
+            name = self._name(member_url)
+            if not name:
+                continue
+            if meta["complete"]:
+                results[name] = {
+                    "st_mode": 0o40755 if meta["is_dir"] else 0o100644,
+                    "st_size": meta["st_size"],
+                    "st_ctime": meta["st_mtime"],
+                    "st_mtime": meta["st_mtime"],
+                    "proxion_status": "cloud-only"
+                }
+            else:
+                pending.append((name, member_url, meta["is_dir"]))
+
+        # Bounded fan-out over the shared pool for members the listing left bare
+        def head(item):
+            name, member_url, is_dir = item
+            try:
+                r = self._request("HEAD", member_url)
+                return name, self._attr_from_response(r, is_dir or self._is_container(r)) if r.ok else None
+            except (requests.RequestException, ValueError):
+                return name, None
+        for name, attr in self._executor.map(head, pending):
+            if attr:
+                results[name] = attr
+        order = [name for name in (self._name(u) for u, _ in members) if name in results]
+        # Staged files may not be uploaded yet, or be larger than uploaded
+        base = path.strip('/')
+        for key, staged in list(self._staged.items()):
+            parent, _, name = key.rpartition('/')
+            attr = self._staged_attr(staged) if parent == base else None
+            if attr:
+                if name not in results:
+                    order.append(name)
+                results[name] = attr
+        return [(name, results[name]) for name in order]
+
+    def read_stream(self, path: str):
+        staged = self._open_staged(path)
+        if staged:
+            with staged as f:
+                while chunk := f.read(self.CHUNK_SIZE):
+                    yield chunk
+            return
+        with self._request("GET", self._url(path), stream=True) as resp:
+            if resp.status_code == 404:
+                raise FileNotFoundError(path)
+            resp.raise_for_status()
+            yield from resp.iter_content(self.CHUNK_SIZE)
+
+    def read_range(self, path: str, start: int, length: int):
+        if length <= 0:
+            return
+        staged = self._open_staged(path)
+        if staged:
+            with staged as f:
+                yield from FileRange(f, start, length, close_file=False)
+            return
+        headers = {"Range": f"bytes={start}-{start + length - 1}"}
+        with self._request("GET", self._url(path), headers=headers, stream=True) as resp:
+            if resp.status_code == 404:
+                raise FileNotFoundError(path)
+            resp.raise_for_status()
+            # Servers may ignore Range and answer 200 with the whole body
+            skip = start if resp.status_code == 200 else 0
+            remaining = length
+            for chunk in resp.iter_content(self.CHUNK_SIZE):
+                if skip:
+                    if len(chunk) <= skip:
+                        skip -= len(chunk)
+                        continue
+                    chunk, skip = chunk[skip:], 0
+                piece = chunk[:remaining]
+                remaining -= len(piece)
+                yield piece
+                if not remaining:
+                    break
+
+    # --- Writes ---
+
+    def write(self, path: str, data: bytes, offset: int = 0) -> bool:
+        """Patch `data` in at `offset` (zero-filling past the end); staged until flushed."""
+        key = path.strip('/')
+        with self._stage_lock(key):
+            staged = self._staged.get(key) or self._stage(key)
+            self.write_handles.write(staged, [data], offset)
+        return True
+
+    def write_stream(self, path: str, chunks, offset: Optional[int] = None) -> bool:
+        if offset is not None:
+            return self.write(path, b"".join(chunks), offset)
+        self._discard(path.strip('/'))
+        return self._put(path, chunks)
+
+    def _put(self, path: str, chunks) -> bool:
+        # A generator body goes out with chunked transfer encoding
+        resp = self._request("PUT", self._url(path), data=iter(chunks),
+                             headers={"Content-Type": "application/octet-stream"})
+        return resp.ok
+
+    def flush(self, path: str) -> bool:
+        """Upload staged offset writes to `path` now."""
+        staged = self._staged.get(path.strip('/'))
+        if staged is None:
+            return True
+        self.write_handles.close(staged, sync=False)  # Uploaded here, not by the hook
+        return self._upload(path.strip('/'))
+
+    def create(self, path: str, is_dir: bool = False) -> bool:
+        self._discard(path.strip('/'))
+        headers = {"Content-Type": "text/turtle"}
+        if is_dir:
+            headers["Link"] = '<http://www.w3.org/ns/ldp#BasicContainer>; rel="type"'
+        resp = self._request("PUT", self._url(path, is_dir), data=b"", headers=headers)
+        return resp.ok
+
+    def delete(self, path: str) -> bool:
+        self._discard(path.strip('/'))
+        for is_dir in (False, True):
+            resp = self._request("DELETE", self._url(path, is_dir))
+            if resp.ok:
+                return True
+        return False
+
+    def close(self):
+        for key in list(self._staged):
+            self.flush(key)
+        if self.staging_dir and not self._staged:
+            try:
+                os.rmdir(self.staging_dir)
+            except OSError:
+                pass  # Not ours to clear, or uploads failed and left files
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+class CachingProvider(BaseResourceProvider):
+    """
+    Read-through BlockCache tier in front of a remote provider.
+
+    Reads are served block by block from disk; runs of missing bytes are
+    fetched with one ranged read and stored as they stream past, so a Range
+    request only pulls what the cache lacks. Versions (mtime/size) are
+    revalidated after VERSION_TTL seconds; a new version drops old blocks.
+    get_attr/listings report proxion_status "cached" or "partial".
+    """
+    VERSION_TTL = 30.0
+
+    def __init__(self, name: str, inner: BaseResourceProvider, cache):
+        self.name = name
+        self.inner = inner
+        self.cache = cache
+        self.base_url = getattr(inner, "base_url", None)
+        self._versions: Dict[str, Tuple[str, int, float]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, path: str) -> str:
+        return f"{self.name}:{path.strip('/')}"
+
+    def _remember(self, path: str, attr: Dict[str, Any]) -> Tuple[str, int]:
+        version = metadata_etag(attr)
+        with self._lock:
+            self._versions[path.strip('/')] = (version, attr.get("st_size", 0), time.monotonic() + self.VERSION_TTL)
+        return version, attr.get("st_size", 0)
+
+    def _version(self, path: str) -> Optional[Tuple[str, int]]:
+        with self._lock:
+            known = self._versions.get(path.strip('/'))
+        if known and known[2] > time.monotonic():
+            return known[0], known[1]
+        attr = self.inner.get_attr(path)
+        if not attr or attr['st_mode'] & 0o40000:
+            return None
+        return self._remember(path, attr)
+
+    def _forget(self, path: str, recursive: bool = False):
+        sub = path.strip('/')
+        with self._lock:
+            for known in [k for k in self._versions if k == sub or (recursive and k.startswith(sub + '/'))]:
+                del self._versions[known]
+        self.cache.drop(self._key(path), recursive=recursive)
+
+    # --- Reads ---
+
+    def get_attr(self, path: str):
+        attr = self.inner.get_attr(path)
+        if attr and not attr['st_mode'] & 0o40000:
+            version, size = self._remember(path, attr)
+            status = self.cache.status(self._key(path), version, size)
+            if status:
+                attr = {**attr, "proxion_status": status}
+        return attr
+
+    def list_dir(self, path: str):
+        return self.inner.list_dir(path)
+
+    def list_dir_with_attrs(self, path: str):
+        entries = self.inner.list_dir_with_attrs(path)
+        objects = {}
+        for name, attr in entries:
+            if not attr['st_mode'] & 0o40000:
+                child = f"{path.strip('/')}/{name}".strip('/')
+                objects[self._key(child)] = self._remember(child, attr)
+        statuses = self.cache.statuses(objects)
+        if not statuses:
+            return entries
+        results = []
+        for name, attr in entries:
+            status = statuses.get(self._key(f"{path.strip('/')}/{name}".strip('/')))
+            results.append((name, {**attr, "proxion_status": status} if status else attr))
+        return results
+
+    def read_stream(self, path: str):
+        known = self._version(path)
+        if known is None:
+            raise FileNotFoundError(path)
+        yield from self.read_range(path, 0, known[1])
+
+    def read_range(self, path: str, start: int, length: int):
+        known = self._version(path)
+        if known is None:
+            raise FileNotFoundError(path)
+        version, size = known
+        end = min(start + length, size)
+        if start >= end:
+            return
+        key = self._key(path)
+        bs = self.cache.block_size
+        first, last = start // bs, (end - 1) // bs
+        fills = self.cache.fills(key, version, size, first, last)
+
+        def needed(block):
+            # In-block end offset this read requires from `block`
+            return min(end, (block + 1) * bs) - block * bs
+
+        pos, block = start, first
+        while block <= last:
+            if fills.get(block, 0) >= needed(block):
+                data = self.cache.read(key, block, pos - block * bs, needed(block))
+                if data is not None:
+                    yield data
+                    pos += len(data)
+                    block += 1
+                    continue
+                fills[block] = 0  # evicted underneath us; refetch
+
+            # Coalesce the run of blocks that need bytes into one remote read,
+            # starting at the first block's filled prefix to keep it contiguous.
+            run_last = block
+            while run_last < last and fills.get(run_last + 1, 0) < needed(run_last + 1):
+                run_last += 1
+            fetch_start = min(pos, block * bs + fills.get(block, 0))
+            fetch_end = min(end, (run_last + 1) * bs)
+
+            cursor = fetch_start  # absolute offset where `pending` begins
+            pending = bytearray()
+            for chunk in self.inner.read_range(path, fetch_start, fetch_end - fetch_start):
+                chunk_start = cursor + len(pending)
+                if chunk_start + len(chunk) > pos:
+                    yield chunk[max(0, pos - chunk_start):]
+                    pos = chunk_start + len(chunk)
+                view = memoryview(chunk)
+                while view:
+                    filled_to = cursor + len(pending)
+                    take = view[:(filled_to // bs + 1) * bs - filled_to]
+                    pending += take
+                    view = view[len(take):]
+                    if (cursor + len(pending)) % bs == 0:
+                        self.cache.append(key, version, cursor // bs, cursor % bs, bytes(pending))
+                        cursor += len(pending)
+                        pending.clear()
+            if pending:
+                self.cache.append(key, version, cursor // bs, cursor % bs, bytes(pending))
+            if pos < fetch_end:
+                raise IOError(f"Short read from {self.name}:{path} at byte {pos}")
+            block = run_last + 1
+
+    # --- Writes ---
+
+    def write(self, path: str, data: bytes, offset: int = 0) -> bool:
+        try:
+            return self.inner.write(path, data, offset)
+        finally:
+            self._forget(path)
+
+    def write_stream(self, path: str, chunks, offset: Optional[int] = None) -> bool:
+        try:
+            return self.inner.write_stream(path, chunks, offset)
+        finally:
+            self._forget(path)
+
+    def flush(self, path: str) -> bool:
+        try:
+            return self.inner.flush(path)
+        finally:
+            self._forget(path)
+
+    def create(self, path: str, is_dir: bool = False) -> bool:
+        try:
+            return self.inner.create(path, is_dir)
+        finally:
+            self._forget(path)
+
+    def delete(self, path: str) -> bool:
+        try:
+            return self.inner.delete(path)
+        finally:
+            self._forget(path, recursive=True)
+
+    def close(self):
+        close = getattr(self.inner, "close", None)
+        if close:
+            close()
+
+class AttrCache:
+    """Bounded LRU cache of provider attributes with TTL expiry.
+
+    Entries are keyed by (provider, subpath) so a resource reachable through
+    several hub paths (e.g. the auto-merged root) shares one entry. Missing
+    resources are cached too, since listings probe many absent sidecars.
+    get() hands out copies, so callers may modify what they receive.
+    """
+
+    def __init__(self, max_entries: int = 65536, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every invalidation; lets callers detect racing writes."""
+        return self._generation
+
+    def get(self, provider, subpath: str):
+        """Return (found, attr). attr may be None for a cached miss."""
+        key = (provider, subpath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, copy.copy(entry[1])
+
+    def put(self, provider, subpath: str, attr, generation: Optional[int] = None, ttl: Optional[float] = None):
+        """Store attr unless an invalidation happened since `generation`; `ttl` overrides the default."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[(provider, subpath)] = (time.monotonic() + (self.ttl if ttl is None else ttl), attr)
+            self._entries.move_to_end((provider, subpath))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, provider, subpath: str, recursive: bool = False):
+        """Drop a path and its parent (whose mtime/size changed with it)."""
+        subpath = subpath.strip('/')
+        parent = os.path.dirname(subpath)
+        with self._lock:
+            self._generation += 1
+            self._entries.pop((provider, subpath), None)
+            self._entries.pop((provider, parent), None)
+            if recursive:
+                prefix = subpath + "/" if subpath else ""
+                stale = [k for k in self._entries if k[0] is provider and k[1].startswith(prefix)]
+                for k in stale:
+                    del self._entries[k]
+
+    def clear(self, provider=None):
+        with self._lock:
+            self._generation += 1
+            if provider is None:
+                self._entries.clear()
+            else:
+                for k in [k for k in self._entries if k[0] is provider]:
+                    del self._entries[k]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0
+            }
+
+class InotifyWatcher:
+    """Linux inotify listener reporting changes under watched directories.
+
+    Watches are added lazily (one per directory the cache has touched) rather
+    than by walking the whole tree up front. On other platforms `available`
+    is False and callers fall back to TTL expiry alone.
+    """
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, on_change, max_watches: int = 8192):
+        """on_change(owner, abs_path, is_dir, kind) is called from the watcher
+        thread with kind "Create", "Update" or "Delete"; abs_path None means
+        events were lost and owner state must be dropped."""
+        self.on_change = on_change
+        self.max_watches = max_watches
+        self.available = False
+        self._fd = -1
+        self._libc = None
+        self._watches: Dict[int, tuple] = {}  # wd -> (directory, owner)
+        self._dirs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            import ctypes, ctypes.util
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if self._fd < 0:
+            return
+        self.available = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def watch(self, directory: str, owner) -> bool:
+        if not self.available:
+            return False
+        with self._lock:
+            if directory in self._dirs:
+                return True
+            if len(self._dirs) >= self.max_watches:
+                return False
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+            if wd < 0:
+                return False
+            self._watches[wd] = (directory, owner)
+            self._dirs[directory] = wd
+            return True
+
+    def watching(self, directory: str) -> bool:
+        with self._lock:
+            return directory in self._dirs
+
+    def close(self):
+        if self.available:
+            self.available = False
+            os.close(self._fd)
+
+    def _run(self):
+        while self.available:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except OSError:
+                break
+            offset = 0
+            while offset + self._EVENT.size <= len(buf):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(buf, offset)
+                offset += self._EVENT.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                self._dispatch(wd, mask, os.fsdecode(name))
+
+    def _dispatch(self, wd: int, mask: int, name: str):
+        if mask & self.IN_Q_OVERFLOW:
+            with self._lock:
+                owners = {o for _, o in self._watches.values()}
+            for owner in owners:
+                self.on_change(owner, None, True, "Update")
+            return
+        with self._lock:
+            watch = self._watches.get(wd)
+            if watch and mask & self.IN_IGNORED:
+                del self._watches[wd]
+                self._dirs.pop(watch[0], None)
+        if not watch:
+            return
+        directory, owner = watch
+        if mask & self.IN_IGNORED:
+            return
+        path = os.path.join(directory, name) if name else directory
+        is_dir = bool(mask & self.IN_ISDIR) or not name
+        if mask & (self.IN_DELETE | self.IN_MOVED_FROM | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+            kind = "Delete"
+        elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+            kind = "Create"
+        else:
+            kind = "Update"
+        self.on_change(owner, path, is_dir, kind)
+
+class MountTrie:
+    """Path-segment trie resolving the longest mounted prefix in O(depth).
+
+    Nested mounts (e.g. `media` and `media/archive` on different providers)
+    resolve to the deepest match. Lookups walk plain dicts without locking;
+    writers serialize in HybridHub.
+    """
+    class _Node:
+        __slots__ = ("children", "provider")
+
+        def __init__(self):
+            self.children: Dict[str, "MountTrie._Node"] = {}
+            self.provider: Optional[BaseResourceProvider] = None
+
     def __init__(self):
+        self._root = self._Node()
+
+    @staticmethod
+    def _segments(path: str) -> List[str]:
+        return [seg for seg in path.strip('/').split('/') if seg and seg != "."]
+
+    def insert(self, prefix: str, provider: BaseResourceProvider):
+        node = self._root
+        for seg in self._segments(prefix):
+            node = node.children.setdefault(seg, self._Node())
+        node.provider = provider
+
+    def remove(self, prefix: str) -> Optional[BaseResourceProvider]:
+        path = [self._root]
+        for seg in self._segments(prefix):
+            node = path[-1].children.get(seg)
+            if node is None:
+                return None
+            path.append(node)
+        provider, path[-1].provider = path[-1].provider, None
+        # Prune branches that no longer lead to any mount
+        segs = self._segments(prefix)
+        for depth in range(len(segs), 0, -1):
+            node = path[depth]
+            if node.provider or node.children:
+                break
+            del path[depth - 1].children[segs[depth - 1]]
+        return provider
+
+    def longest_match(self, path: str):
+        """Return (provider, remaining subpath) for the deepest mount, or (None, path)."""
+        segs = self._segments(path)
+        node, best, depth = self._root, None, 0
+        for i, seg in enumerate(segs):
+            node = node.children.get(seg)
+            if node is None:
+                break
+            if node.provider is not None:
+                best, depth = node.provider, i + 1
+        if best is None:
+            return None, "/".join(segs)
+        return best, "/".join(segs[depth:])
+
+    def node(self, path: str) -> Optional["MountTrie._Node"]:
+        node = self._root
+        for seg in self._segments(path):
+            node = node.children.get(seg)
+            if node is None:
+                return None
+        return node
+
+    def children(self, path: str) -> List[str]:
+        """Segment names directly below `path` that lead to a mount."""
+        node = self.node(path)
+        return list(node.children) if node else []
+
+class HybridHub(BaseResourceProvider):
+    """Multiplexes between Local and Remote providers based on path prefixes.
+
+    Attrs of providers with local directories (`root_path`, or `roots` for
+    pooled branches) are cached for the cache TTL and invalidated by inotify,
+    provided the directories that report their changes are actually watched.
+    Anything else (remote, dedup, no inotify, a failed watch or the watch
+    limit reached) is only cached for UNWATCHED_TTL seconds.
+    """
+    VIRTUAL_DIR = {"st_mode": 0o40755, "st_size": 0, "st_mtime": 0}
+    UNWATCHED_TTL = 2.0
+
+    def __init__(self, attr_cache: Optional[AttrCache] = None, watch: bool = True,
+                 notifier: Optional[ChangeNotifier] = None):
         self.mounts: Dict[str, BaseResourceProvider] = {}
-        self._root_entries = []
+        self._trie = MountTrie()
+        self._mount_lock = threading.Lock()
+        self.watcher = InotifyWatcher(self._on_fs_change) if watch else None
+        if attr_cache is None:
+            # Without inotify, stale entries can only age out; keep them short-lived.
+            live = self.watcher is not None and self.watcher.available
+            attr_cache = AttrCache(ttl=30.0 if live else self.UNWATCHED_TTL)
+        self.attr_cache = attr_cache
+        self.notifier = notifier or ChangeNotifier()
+        self.journals = None  # Optional ChangeJournals, attached by the server
 
     def mount(self, prefix: str, provider: BaseResourceProvider):
+        """Attach a provider at `prefix`; safe to call while serving requests."""
+        prefix = prefix.strip('/')
+        with self._mount_lock:
+            previous = self.mounts.get(prefix)
+            self.mounts[prefix] = provider
+            self._trie.insert(prefix, provider)
+        if previous is not None and previous is not provider:
+            self.attr_cache.clear(previous)
+
+    def unmount(self, prefix: str) -> Optional[BaseResourceProvider]:
+        """Detach the provider at `prefix`, returning it (None if not mounted)."""
         prefix = prefix.strip('/')
-        self.mounts[prefix] = provider
-        if prefix not in self._root_entries:
-            self._root_entries.append(prefix)
+        with self._mount_lock:
+            provider = self.mounts.pop(prefix, None)
+            if provider is None:
+                return None
+            self._trie.remove(prefix)
+            if getattr(self, 'primary_provider', None) is provider and provider not in self.mounts.values():
+                del self.primary_provider
+        self.attr_cache.clear(provider)
+        return provider
 
     def _route(self, path: str):
-        path = path.lstrip('/')
-        for prefix, provider in self.mounts.items():
-            if path == prefix:
-                return provider, ""
-            if path.startswith(prefix + "/"):
-                return provider, path[len(prefix)+1:]
+        provider, subpath = self._trie.longest_match(path)
+        if provider:
+            return provider, subpath
         
         # If no explicit mount found, and it's not the root, check if it's in primary
-        if path and hasattr(self, 'primary_provider'):
-             return self.primary_provider, path
+        if subpath and hasattr(self, 'primary_provider'):
+             return self.primary_provider, subpath
              
-        return None, path
+        return None, subpath
+
+    @staticmethod
+    def _local_roots(provider: BaseResourceProvider) -> List[str]:
+        """Local directories holding `provider`'s files (every branch of a pool)."""
+        roots = getattr(provider, 'roots', None)
+        if roots:
+            return list(roots)
+        root = getattr(provider, 'root_path', None)
+        return [root] if root else []
+
+    def _ttl(self, watched: bool) -> Optional[float]:
+        """Attr cache TTL: the default when inotify reports changes to the entry, else the short one."""
+        return None if watched else min(self.attr_cache.ttl, self.UNWATCHED_TTL)
+
+    def _watch(self, provider: BaseResourceProvider, subdir: str) -> bool:
+        """Watch `subdir` in every local root of `provider`; True only if all of them are watched."""
+        roots = self._local_roots(provider)
+        if not (roots and self.watcher):
+            return False
+        results = [self.watcher.watch(os.path.join(root, subdir) if subdir else root, provider) for root in roots]
+        return all(results)
+
+    def _watching(self, provider: BaseResourceProvider, subdir: str) -> bool:
+        roots = self._local_roots(provider)
+        return bool(roots and self.watcher) and all(
+            self.watcher.watching(os.path.join(root, subdir)) for root in roots)
+
+    def _cached_attr(self, provider: BaseResourceProvider, subpath: str):
+        subpath = subpath.strip('/')
+        found, attr = self.attr_cache.get(provider, subpath)
+        if found:
+            return attr
+        generation = self.attr_cache.generation
+        # Watch before stat so a change racing the stat still invalidates.
+        watched = self._watch(provider, posixpath.dirname(subpath))
+        attr = provider.get_attr(subpath)
+        if attr and attr['st_mode'] & 0o40000 and subpath:
+            watched = self._watch(provider, subpath) and watched
+        self.attr_cache.put(provider, subpath, attr, generation, self._ttl(watched))
+        return attr
+
+    def _put_listing(self, provider: BaseResourceProvider, subpath: str, entries, generation: int, watched: bool):
+        """Cache listed attrs; a child directory only gets the long TTL if it is watched itself."""
+        for name, attr in entries:
+            child = f"{subpath}/{name}" if subpath else name
+            live = watched and (not attr or not attr['st_mode'] & 0o40000 or self._watching(provider, child))
+            self.attr_cache.put(provider, child, attr, generation, self._ttl(live))
+
+    def _on_fs_change(self, provider, abs_path: Optional[str], is_dir: bool, kind: str = "Update"):
+        """inotify callback: translate a local path back to a cache key (and pod paths for subscribers)."""
+        if abs_path is None:
+            self.attr_cache.clear(provider)
+            self.notifier.reset()
+            return
+        root = next((r for r in self._local_roots(provider)
+                     if abs_path == r or abs_path.startswith(os.path.join(r, ''))), None)
+        if root is None:
+            return
+        rel = os.path.relpath(abs_path, root).replace("\\", "/")
+        if rel == ".":
+            rel = ""
+        self.attr_cache.invalidate(provider, rel, recursive=is_dir)
+        is_listed = getattr(provider, '_is_listed', None)
+        if rel and is_listed and not is_listed(posixpath.basename(rel)):
+            return  # Upload temp files, sidecars and excluded names
+        if self.journals:
+            self.journals.record(provider, rel, kind)
+        if self.notifier.active:
+            paths = [f"{prefix}/{rel}" if prefix and rel else prefix or rel for prefix in self._prefixes(provider)]
+            if is_dir and kind == "Create" and any(self.notifier.recursive_match(p) for p in paths):
+                self._watch_tree(provider, rel)  # Before publishing, so the client's re-list is covered
+            for path in paths:
+                self.notifier.publish(path, kind)
+
+    def _prefixes(self, provider: BaseResourceProvider) -> List[str]:
+        """Pod paths `provider` is reachable under ("" for the auto-merged root)."""
+        prefixes = [p for p, mounted in list(self.mounts.items()) if mounted is provider]
+        if getattr(self, 'primary_provider', None) is provider:
+            prefixes.append("")
+        return prefixes
+
+    def subscribe(self, path: str, recursive: bool = False) -> Subscription:
+        """Open a change subscription on `path`, watching it so local edits are seen too.
+
+        A recursive topic on a local mount gets every directory below it
+        watched, up to the watcher's limit; directories created under it
+        later are watched as they appear.
+        """
+        sub = self.notifier.subscribe(path, recursive)
+        self.get_attr(path)  # Adds inotify watches on the topic and its parent
+        if recursive:
+            if not path.strip('/.'):
+                provider, subpath = getattr(self, 'primary_provider', None), ""
+            else:
+                provider, subpath = self._route(path)
+            if provider:
+                self._watch_tree(provider, subpath.strip('/'))
+        return sub
+
+    def _watch_tree(self, provider: BaseResourceProvider, subpath: str) -> bool:
+        """Watch every directory under `subpath` in each local root; False once a watch fails."""
+        if not (self.watcher and self.watcher.available):
+            return False
+        is_listed = getattr(provider, '_is_listed', None)
+        for root in self._local_roots(provider):
+            for directory, children, _ in os.walk(os.path.join(root, subpath) if subpath else root):
+                if not self.watcher.watch(directory, provider):
+                    return False
+                if is_listed:
+                    children[:] = [name for name in children if is_listed(name)]
+        return True
+
+    def notify(self, path: str, kind: str):
+        """Report a change made outside the hub methods (e.g. an upload commit)."""
+        provider, subpath = self._route(path)
+        if provider:
+            self._changed(provider, subpath, path, kind)
+
+    def _changed(self, provider: BaseResourceProvider, subpath: str, path: str, kind: Optional[str]):
+        """Record a completed mutation in the change journal and tell subscribers.
+
+        `kind` is None when nobody is subscribed; the journal works out
+        Create vs Update itself.
+        """
+        if self.journals:
+            self.journals.record(provider, subpath, kind or "Update")
+        if kind:
+            self.notifier.publish(path, kind)
+
+    def _kind(self, path: str) -> Optional[str]:
+        """"Create" or "Update" for a write about to happen, when anyone is listening."""
+        if not self.notifier.active:
+            return None
+        return "Update" if self.get_attr(path) is not None else "Create"
 
     def get_attr(self, path: str):
         if not path or path == "/" or path == ".":
-            return {"st_mode": 0o40755, "st_size": 0, "st_mtime": 0}
+            return dict(self.VIRTUAL_DIR)
             
         provider, subpath = self._route(path)
-        if provider: 
-            return provider.get_attr(subpath)
-            
-        # Fallback to primary provider (Auto-Merge)
-        if hasattr(self, 'primary_provider'):
-            return self.primary_provider.get_attr(path)
-            
-        return None
+        attr = self._cached_attr(provider, subpath) if provider else None
+        if attr is None and self._trie.node(path) is not None:
+            # Intermediate segment of a nested mount (e.g. `media` for `media/archive`)
+            return dict(self.VIRTUAL_DIR)
+        return attr
+
+    def _mount_children(self, path: str):
+        """(name, attr) for mounts nested directly under `path`."""
+        prefix = path.strip('/')
+        children = []
+        for name in self._trie.children(prefix):
+            mounted = self.mounts.get(f"{prefix}/{name}" if prefix else name)
+            attr = self._cached_attr(mounted, "") if mounted else None
+            children.append((name, attr or dict(self.VIRTUAL_DIR)))
+        return children
 
     def list_dir(self, path: str):
-        if not path or path == "/" or path == ".":
-            entries = list(self._root_entries)
-            if hasattr(self, 'primary_provider'):
-                p_entries = self.primary_provider.list_dir("")
-                for e in p_entries:
-                    if e not in entries:
-                        entries.append(e)
-            return entries
-        provider, subpath = self._route(path)
-        if provider: return provider.list_dir(subpath)
-        return []
+        entries = self._trie.children(path)
+        if not path.strip('/.'):
+            provider, subpath = getattr(self, 'primary_provider', None), ""
+        else:
+            provider, subpath = self._route(path)
+        if provider:
+            seen = set(entries)
+            entries.extend(e for e in provider.list_dir(subpath) if e not in seen)
+        return entries
+
+    def list_dir_with_attrs(self, path: str):
+        """One provider sweep per container; results also prime the attr cache.
+
+        Mount points nested under `path` are listed first, then the backing
+        provider's entries (the primary provider for the auto-merged root).
+        """
+        entries = self._mount_children(path)
+        seen = {name for name, _ in entries}
+        if not path.strip('/.'):
+            provider, subpath = getattr(self, 'primary_provider', None), ""
+        else:
+            provider, subpath = self._route(path)
+        if provider:
+            entries.extend((name, attr) for name, attr in self._listing(provider, subpath) if name not in seen)
+        return entries
+
+    def list_dir_page(self, path: str, after: Optional[str], limit: int):
+        """Paged, name-sorted form of list_dir_with_attrs (mounts merged in order)."""
+        mounts = sorted((e for e in self._mount_children(path) if after is None or e[0] > after), key=lambda e: e[0])
+        shadowed = {name for name, _ in mounts}
+        if not path.strip('/.'):
+            provider, subpath = getattr(self, 'primary_provider', None), ""
+        else:
+            provider, subpath = self._route(path)
+        more = False
+        if provider:
+            subpath = subpath.strip('/')
+            generation = self.attr_cache.generation
+            watched = self._watch(provider, subpath)
+            page, more = provider.list_dir_page(subpath, after, limit)
+            self._put_listing(provider, subpath, page, generation, watched)
+            if more and page:
+                # Mount names beyond this page belong to a later one
+                mounts = [e for e in mounts if e[0] <= page[-1][0]]
+            mounts.extend(e for e in page if e[0] not in shadowed)
+            mounts.sort(key=lambda e: e[0])
+        return mounts[:limit], more or len(mounts) > limit
+
+    def _listing(self, provider: BaseResourceProvider, subpath: str):
+        subpath = subpath.strip('/')
+        generation = self.attr_cache.generation
+        watched = self._watch(provider, subpath)
+        entries = provider.list_dir_with_attrs(subpath)
+        self._put_listing(provider, subpath, entries, generation, watched)
+        return entries
 
     def read_stream(self, path: str):
         provider, subpath = self._route(path)
         if provider: return provider.read_stream(subpath)
         raise FileNotFoundError()
 
+    def read_range(self, path: str, start: int, length: int):
+        provider, subpath = self._route(path)
+        if provider: return provider.read_range(subpath, start, length)
+        raise FileNotFoundError()
+
+    def open_file(self, path: str):
+        provider, subpath = self._route(path)
+        if provider: return provider.open_file(subpath)
+        raise FileNotFoundError()
+
     def write(self, path: str, data: bytes, offset: int = 0):
         provider, subpath = self._route(path)
-        if provider: return provider.write(subpath, data, offset)
-        return False
+        if not provider: return False
+        kind = self._kind(path)
+        try:
+            written = provider.write(subpath, data, offset)
+        finally:
+            self.attr_cache.invalidate(provider, subpath)
+        if written:
+            self._changed(provider, subpath, path, kind)
+        return written
+
+    def write_stream(self, path: str, chunks, offset: Optional[int] = None):
+        provider, subpath = self._route(path)
+        if not provider: return False
+        kind = self._kind(path)
+        try:
+            written = provider.write_stream(subpath, chunks, offset)
+        finally:
+            self.attr_cache.invalidate(provider, subpath)
+        if written:
+            self._changed(provider, subpath, path, kind)
+        return written
 
     def create(self, path: str, is_dir: bool = False):
         provider, subpath = self._route(path)
-        if provider: return provider.create(subpath, is_dir)
-        return False
+        if not provider: return False
+        kind = self._kind(path)
+        try:
+            created = provider.create(subpath, is_dir)
+        finally:
+            self.attr_cache.invalidate(provider, subpath)
+        if created:
+            self._changed(provider, subpath, path, kind if kind == "Create" else None)
+        return created
+
+    def flush(self, path: str):
+        provider, subpath = self._route(path)
+        return provider.flush(subpath) if provider else False
 
     def delete(self, path: str):
         provider, subpath = self._route(path)
-        if provider: return provider.delete(subpath)
-        return False
+        if not provider: return False
+        try:
+            deleted = provider.delete(subpath)
+        finally:
+            self.attr_cache.invalidate(provider, subpath, recursive=True)
+        if deleted:
+            self._changed(provider, subpath, path, "Delete")
+        return deleted
+
+def metadata_etag(attr: Dict[str, Any]) -> str:
+    """Opaque (unquoted) validator from mtime and size, shared by /pod and WebDAV."""
+    return f"{int(attr.get('st_mtime', 0) * 1_000_000):x}-{attr.get('st_size', 0):x}"
+
+class ContentHashCache:
+    """Lazily computed content-digest ETags.
+
+    Keyed by (provider, subpath, mtime, size), so an entry can never be
+    served for changed content; stale keys simply age out of the LRU.
+    """
+    MAX_HASH_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._digests: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def digest(self, hub: "HybridHub", path: str, attr: Dict[str, Any]) -> Optional[str]:
+        """Return a content digest tag, or None if the resource is too large to hash."""
+        if attr.get("st_size", 0) > self.MAX_HASH_BYTES:
+            return None
+        provider, subpath = hub._route(path)
+        key = (provider, subpath.strip('/'), attr.get("st_mtime"), attr.get("st_size"))
+        with self._lock:
+            tag = self._digests.get(key)
+            if tag:
+                self._digests.move_to_end(key)
+                return tag
+        import hashlib, base64
+        h = hashlib.sha256()
+        for chunk in hub.read_stream(path):
+            h.update(chunk)
+        tag = "sha256-" + base64.urlsafe_b64encode(h.digest()[:18]).decode()
+        with self._lock:
+            self._digests[key] = tag
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+        return tag
 
 # WebDAV Integration
 from wsgidav.dav_provider import DAVProvider, DAVCollection, DAVNonCollection
 from wsgidav import util
 import io
 
-class GeneratorStream:
-    """Wraps a generator to provide a file-like read() method."""
-    def __init__(self, gen):
-        self.gen = gen
-        self.buf = b""
+class GeneratorStream(io.RawIOBase):
+    """File-like view over a chunk generator.
 
-    def read(self, size=-1):
-        if size == -1:
-            return self.buf + b"".join(self.gen)
-        
-        while len(self.buf) < size:
-            try:
-                self.buf += next(self.gen)
-            except StopIteration:
-                break
-        
-        res = self.buf[:size]
-        self.buf = self.buf[size:]
-        return res
+    Chunks are queued as memoryviews and consumed by offset, so small reads
+    never recopy the buffer. When `reopen(offset)` is given (a callable
+    returning a fresh chunk iterator starting at `offset`), the stream is
+    seekable: short forward seeks skip buffered data, anything else restarts
+    the provider stream at the target.
+    """
+    def __init__(self, gen, reopen=None, size: Optional[int] = None):
+        super().__init__()
+        self.gen = iter(gen)
+        self._reopen = reopen
+        self._size = size
+        self._chunks: "deque[memoryview]" = deque()
+        self._buffered = 0
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return self._reopen is not None
+
+    def _fill(self) -> bool:
+        for chunk in self.gen:
+            if chunk:
+                view = memoryview(chunk).cast('B')
+                self._chunks.append(view)
+                self._buffered += len(view)
+                return True
+        return False
+
+    def _take(self, limit: int) -> memoryview:
+        head = self._chunks[0]
+        if len(head) <= limit:
+            self._chunks.popleft()
+        else:
+            self._chunks[0] = head[limit:]
+            head = head[:limit]
+        self._buffered -= len(head)
+        self._pos += len(head)
+        return head
+
+    def readinto(self, b) -> int:
+        out = memoryview(b).cast('B')
+        n = 0
+        while n < len(out) and (self._chunks or self._fill()):
+            piece = self._take(len(out) - n)
+            out[n:n + len(piece)] = piece
+            n += len(piece)
+        return n
+
+    def read(self, size=-1) -> bytes:
+        if size is None or size < 0:
+            return self.readall()
+        parts = []
+        while size and (self._chunks or self._fill()):
+            piece = self._take(size)
+            parts.append(piece)
+            size -= len(piece)
+        if len(parts) == 1:
+            return parts[0].tobytes()
+        return b"".join(parts)
+
+    def readall(self) -> bytes:
+        parts = list(self._chunks)
+        parts.extend(self.gen)
+        self._chunks.clear()
+        self._buffered = 0
+        data = b"".join(parts)
+        self._pos += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            if self._size is None:
+                raise io.UnsupportedOperation("stream size unknown")
+            offset += self._size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        skip = offset - self._pos
+        if 0 <= skip <= self._buffered:
+            while skip:
+                skip -= len(self._take(skip))
+            return self._pos
+        if self._reopen is None:
+            raise io.UnsupportedOperation("provider stream is not seekable")
+        self._close_gen()
+        self.gen = iter(self._reopen(offset))
+        self._chunks.clear()
+        self._buffered = 0
+        self._pos = offset
+        return offset
+
+    def _close_gen(self):
+        close = getattr(self.gen, "close", None)
+        if close:
+            close()
 
     def close(self):
-        pass
+        if not self.closed:
+            self._close_gen()
+            self._chunks.clear()
+        super().close()
 
 class ProxionResource(DAVNonCollection):
-    def __init__(self, path, environ, hub):
+    def __init__(self, path, environ, hub, attr: Optional[Dict[str, Any]] = None):
         super().__init__(path, environ)
         self.hub = hub
-        self.attr = hub.get_attr(path) or {}
+        self.attr = attr if attr is not None else (hub.get_attr(path) or {})
 
     def get_content_length(self):
         return self.attr.get("st_size", 0)
@@ -248,10 +1739,23 @@ class ProxionResource(DAVNonCollection):
         return self.attr.get("st_mtime", 0)
 
     def get_content(self):
-        return GeneratorStream(self.hub.read_stream(self.path))
+        # Disk-backed providers hand WsgiDAV the real file
+        f = self.hub.open_file(self.path)
+        if f is not None:
+            return f
+        size = self.attr.get("st_size", 0)
+        return GeneratorStream(
+            self.hub.read_stream(self.path),
+            reopen=lambda offset: self.hub.read_range(self.path, offset, max(0, size - offset)),
+            size=size
+        )
 
     def get_etag(self):
-        return f"{self.attr.get('st_mtime', 0)}-{self.attr.get('st_size', 0)}"
+        return metadata_etag(self.attr)
+
+    def support_ranges(self):
+        # get_content() is always seekable: a real file or a reopenable stream
+        return True
 
     def support_etag(self):
         return True
@@ -262,32 +1766,46 @@ class ProxionResource(DAVNonCollection):
     def support_modified(self):
         return True
 
+def dav_resource(path, environ, hub, attr):
+    """Build the WsgiDAV resource for a path whose attrs are already known."""
+    if bool(attr['st_mode'] & 0o40000):
+        return ProxionCollection(path, environ, hub, attr)
+    return ProxionResource(path, environ, hub, attr)
+
 class ProxionCollection(DAVCollection):
-    def __init__(self, path, environ, hub):
+    def __init__(self, path, environ, hub, attr: Optional[Dict[str, Any]] = None):
         super().__init__(path, environ)
         self.hub = hub
+        self.attr = attr if attr is not None else (hub.get_attr(path) or {})
 
     def get_member_names(self):
         return self.hub.list_dir(self.path)
 
+    def get_member_list(self):
+        # PROPFIND Depth:1 path: one batched listing call, and every child
+        # is handed its attrs so property rendering never stats again.
+        return [
+            dav_resource(os.path.join(self.path, name).replace("\\", "/"), self.environ, self.hub, attr)
+            for name, attr in self.hub.list_dir_with_attrs(self.path)
+        ]
+
     def get_member(self, name):
         path = os.path.join(self.path, name).replace("\\", "/")
         attr = self.hub.get_attr(path)
         if not attr: return None
-        if bool(attr['st_mode'] & 0o40000):
-            return ProxionCollection(path, self.environ, self.hub)
-        return ProxionResource(path, self.environ, self.hub)
+        return dav_resource(path, self.environ, self.hub, attr)
 
     def get_creation_date(self):
-        attr = self.hub.get_attr(self.path) or {}
-        return attr.get("st_ctime", 0)
+        return self.attr.get("st_ctime", 0)
 
     def get_last_modified(self):
-        attr = self.hub.get_attr(self.path) or {}
-        return attr.get("st_mtime", 0)
+        return self.attr.get("st_mtime", 0)
+
+    def get_etag(self):
+        return metadata_etag(self.attr)
 
     def support_etag(self):
-        return False
+        return True
 
 class ProxionDAVProvider(DAVProvider):
     def __init__(self, hub):
@@ -298,9 +1816,50 @@ class ProxionDAVProvider(DAVProvider):
         # path is already normalized in WsgiDAV 4.x
         attr = self.hub.get_attr(path)
         if not attr: return None
-        if bool(attr['st_mode'] & 0o40000):
-            return ProxionCollection(path, environ, self.hub)
-        return ProxionResource(path, environ, self.hub)
+        return dav_resource(path, environ, self.hub, attr)
+
+class FileRange:
+    """WSGI body for a byte range of a real file.
+
+    Keeps `fileno()` visible so servers that special-case file bodies can
+    use it, and reads straight from the file object instead of going
+    through a provider generator. Closes the file when the body is closed.
+    """
+    BLOCK_SIZE = 1024 * 256
+
+    def __init__(self, f, start: int = 0, length: Optional[int] = None, close_file: bool = True):
+        self.f = f
+        self.start = start
+        self.length = length if length is not None else os.fstat(f.fileno()).st_size - start
+        self.close_file = close_file
+
+    def fileno(self):
+        return self.f.fileno()
+
+    def __iter__(self):
+        self.f.seek(self.start)
+        remaining = self.length
+        while remaining > 0:
+            chunk = self.f.read(min(self.BLOCK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    def close(self):
+        if self.close_file:
+            self.f.close()
+
+class ByteCounter:
+    """Iterable over byte chunks that counts what was consumed."""
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = chunks
+        self.count = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.count += len(chunk)
+            yield chunk
 
 class PodProxyServer:
     """
@@ -319,23 +1878,58 @@ class PodProxyServer:
         from .config import load_config
         self.config = load_config()
         self.hub = HybridHub()
+
+        # Offset-write handle reuse for local mounts (pod_write_handles config:
+        # enabled, idle_seconds, max_handles). Off by default on Windows, where
+        # an open handle blocks renames and deletes made outside the proxy.
+        handles = self.config.get("pod_write_handles", {})
+        self.write_handles = WRITE_HANDLES if handles.get("enabled", os.name != "nt") else None
+        WRITE_HANDLES.idle_timeout = float(handles.get("idle_seconds", WRITE_HANDLES.idle_timeout))
+        WRITE_HANDLES.max_handles = int(handles.get("max_handles", WRITE_HANDLES.max_handles))
         
         # 1. Primary mount (legacy/internal)
-        self.hub.mount("stash", LocalProvider(self.manager.pod_local_root))
+        self.hub.mount("stash", self._local_provider(self.manager.pod_local_root))
         
         # 2. Pooled sources from config
-        self.sources = self.config.get("stash_sources", [])
-        for s in self.sources:
-            name = s.get("name").replace(" ", "_")
-            path = s.get("path")
-            if path and os.path.exists(path):
-                self.hub.mount(name, LocalProvider(path))
+        self.journals = None
+        self.sources = []
+        self._source_mounts = set()
+        self.sync_sources(self.config.get("stash_sources", []))
         
-        # 3. Cloud mount
-        self.hub.mount("cloud", RemoteProvider("Mullvad-Solid-Bunker"))
+        # 3. Cloud mounts (remote Solid pods)
+        self._remote_mounts = set()
+        self.block_cache = None
+        self.sync_remotes(self.config.get("pod_remotes", []))
         
         # 4. Implement Auto-Merge Root in HybridHub
         self._setup_automerge_root()
+
+        # 5. Change journal per local mount (pod_journal config)
+        journal_cfg = self.config.get("pod_journal", {})
+        if journal_cfg.get("enabled", True):
+            default_dir = os.path.join(os.path.dirname(os.path.abspath(self.manager.pod_local_root)), "journal")
+            self.journals = ChangeJournals(
+                journal_cfg.get("path") or default_dir,
+                retention=float(journal_cfg.get("retention_days", 30)) * 86400
+            )
+            self.hub.journals = self.journals
+            self._sync_journals()
+        self.uploads = ChunkedUploads(self.hub)
+        self.archive_export = ArchiveExporter(self.hub)
+        self.archive_import = ArchiveImporter(self.hub, workers=int(self.config.get("pod_import_workers", 8)))
+        self.batch = BatchExecutor(self.hub, workers=int(self.config.get("pod_batch_workers", 8)))
+        # "metadata" (mtime/size) or "content" (lazy sha256 for files up to 64 MiB)
+        self.etag_mode = self.config.get("pod_etag", "metadata")
+        self.content_hashes = ContentHashCache()
+        # Container members per LDP page / JSON listing page; 0 lists whole
+        # containers unless the client asks for pages with ?limit= or ?page=
+        self.page_size = int(self.config.get("pod_page_size", 0))
+        
+        # Change notification streams (pod_notify config: max_subscribers, queue_size, coalesce_ms)
+        notify = self.config.get("pod_notify", {})
+        self.hub.notifier.max_subscribers = int(notify.get("max_subscribers", 16))
+        self.hub.notifier.max_pending = int(notify.get("queue_size", 256))
+        self.hub.notifier.window = float(notify.get("coalesce_ms", 250)) / 1000
         
         self.app = Flask(__name__)
         self._setup_routes()
@@ -357,9 +1951,135 @@ class PodProxyServer:
             "/dav": self.dav_app
         })
         
+    def sync_sources(self, sources: list):
+        """Mount/unmount pooled stash_sources to match `sources` at runtime.
+
+        Names may contain '/' to nest a source inside another mount. Sources
+        sharing a "pool" name are merged into one PooledProvider mounted under
+        that name; per-pool options come from the `stash_pools` config entry.
+        A source with "backend": "dedup" is mounted as a DedupProvider whose
+        chunk store and index live in `path`. "compress": "auto" | "zstd" |
+        "zlib" (on a source, or on its pool's options) stores files in
+        seekable compressed frames.
+        """
+        wanted = {}
+        dedup = {}
+        pools: Dict[str, List[str]] = {}
+        for s in sources:
+            name = (s.get("name") or "").replace(" ", "_").strip('/')
+            path = s.get("path")
+            if not (name and path and os.path.exists(path)):
+                continue
+            pool = (s.get("pool") or "").replace(" ", "_").strip('/')
+            if pool:
+                pools.setdefault(pool, []).append(os.path.abspath(path))
+            elif s.get("backend") == "dedup":
+                dedup[name] = os.path.abspath(path)
+            else:
+                wanted[name] = (os.path.abspath(path), s.get("compress") or None)
+
+        for name in self._source_mounts - set(wanted) - set(pools) - set(dedup):
+            self._close_provider(self.hub.mounts.get(name))
+            self.hub.unmount(name)
+        for name, (path, compress) in wanted.items():
+            current = self.hub.mounts.get(name)
+            if getattr(current, 'root_path', None) != path or getattr(current, 'codec_setting', None) != compress:
+                self._close_provider(current)
+                self.hub.mount(name, self._local_provider(path, compress))
+        for name, path in dedup.items():
+            from .pod_dedup import DedupProvider
+            current = self.hub.mounts.get(name)
+            if getattr(current, 'store_path', None) != path:
+                self._close_provider(current)
+                self.hub.mount(name, DedupProvider(path))
+        for name, roots in pools.items():
+            from .pod_pool import PooledProvider
+            options = self.config.get("stash_pools", {}).get(name, {})
+            policy = options.get("policy", "mfs")
+            compress = options.get("compress") or None
+            current = self.hub.mounts.get(name)
+            if (getattr(current, 'roots', None) != roots or getattr(current, 'policy_name', None) != policy
+                    or getattr(getattr(current, 'branches', [None])[0], 'codec_setting', None) != compress):
+                self._close_provider(current)
+                self.hub.mount(name, PooledProvider(
+                    roots,
+                    policy=policy,
+                    min_free=int(options.get("min_free_gb", 0) * 1024 ** 3),
+                    refresh_interval=float(options.get("refresh_seconds", 30)),
+                    branch_factory=lambda root, compress=compress: self._local_provider(root, compress)
+                ))
+
+        self._source_mounts = set(wanted) | set(pools) | set(dedup)
+        self.sources = sources
+        self._setup_automerge_root()
+        self._sync_journals()
+
+    def _local_provider(self, path: str, compress: Optional[str] = None) -> LocalProvider:
+        """LocalProvider, or its compressing variant for a "compress" codec setting."""
+        if not compress:
+            return LocalProvider(path, write_handles=self.write_handles)
+        from .pod_compress import CompressedLocalProvider
+        return CompressedLocalProvider(path, codec=compress)
+
+    def sync_remotes(self, remotes: list):
+        """Mount/unmount remote Solid pods ({"name", "url", "token"}) at runtime.
+
+        With none configured, "cloud" keeps the demo provider.
+        """
+        wanted = {}
+        for r in remotes:
+            name = (r.get("name") or "").replace(" ", "_").strip('/')
+            if name and r.get("url"):
+                wanted[name] = r
+        if not wanted:
+            wanted = {"cloud": None}
+
+        for name in self._remote_mounts - set(wanted):
+            self._close_provider(self.hub.mounts.get(name))
+            self.hub.unmount(name)
+        for name, remote in wanted.items():
+            current = self.hub.mounts.get(name)
+            if remote is None:
+                if not isinstance(current, DemoRemoteProvider):
+                    self._close_provider(current)
+                    self.hub.mount(name, DemoRemoteProvider("Mullvad-Solid-Bunker"))
+            elif getattr(current, "base_url", None) != remote["url"].rstrip('/') + '/':
+                self._close_provider(current)
+                provider = RemoteProvider(name, remote["url"], remote.get("token"))
+                cache = self._get_block_cache()
+                self.hub.mount(name, CachingProvider(name, provider, cache) if cache else provider)
+        self._remote_mounts = set(wanted)
+        self._sync_journals()
+
+    def _sync_journals(self):
+        """Keep one change journal per locally stored mount (remote pods keep their own history)."""
+        if self.journals:
+            self.journals.sync({name: p for name, p in self.hub.mounts.items() if name not in self._remote_mounts})
+
+    def _get_block_cache(self):
+        """Shared BlockCache for remote mounts, opened on first use (pod_block_cache config)."""
+        if self.block_cache is None:
+            cfg = self.config.get("pod_block_cache", {})
+            if not cfg.get("enabled", True):
+                return None
+            from .pod_cache import BlockCache
+            default_dir = os.path.join(os.path.dirname(os.path.abspath(self.manager.pod_local_root)), "cache", "pod_blocks")
+            self.block_cache = BlockCache(
+                cfg.get("path") or default_dir,
+                budget=int(cfg.get("budget_mb", 2048)) * 1024 * 1024,
+                block_size=int(cfg.get("block_kb", 1024)) * 1024
+            )
+        return self.block_cache
+
+    @staticmethod
+    def _close_provider(provider):
+        close = getattr(provider, "close", None)
+        if close:
+            close()
+
     def _setup_automerge_root(self):
         """Configure HybridHub to merge primary source into root listing."""
-        primary_name = next((s['name'].replace(" ", "_") for s in self.sources if s.get('primary')), "Default_Stash")
+        primary_name = next(((s.get('pool') or s['name']).replace(" ", "_").strip('/') for s in self.sources if s.get('primary')), "Default_Stash")
         if primary_name in self.hub.mounts:
             self.hub.primary_provider = self.hub.mounts[primary_name]
         elif "stash" in self.hub.mounts:
@@ -391,31 +2111,111 @@ class PodProxyServer:
             results = self.manager.lens.search(query)
             return jsonify(results)
 
+        @self.app.route('/pod/_batch', methods=['POST'])
+        def handle_batch():
+            """Run many small operations under one request (see BatchExecutor).
+
+            Every operation is authorized before anything executes (see
+            _authorize_batch); the batch is logged as a single event. Puts
+            that succeed are charged to the token's byte quotas.
+            """
+            token_json, proof, error = self._credentials()
+            if error:
+                return error
+            try:
+                ops = self.batch.parse(request.get_json(silent=True))
+            except BatchError as e:
+                return jsonify({"error": str(e)}), e.status
+
+            denied = self._authorize_batch(token_json, proof, ops)
+            self.manager.log_event(
+                action="BATCH",
+                resource=f"{len(ops)} operations ({len(denied)} rejected)",
+                subject="Solid Client",
+                type="error" if denied else "info"
+            )
+
+            results = self._charge_batch(token_json, ops, self.batch.run(ops, denied))
+            if 'multipart/mixed' in request.headers.get('Accept', ''):
+                boundary = new_boundary()
+                return Response(encode_multipart(results, boundary), mimetype=f"multipart/mixed; boundary={boundary}")
+            return Response(encode_ndjson(results), mimetype="application/x-ndjson")
+
+        @self.app.route('/pod/_notifications', methods=['GET'])
+        def handle_notifications():
+            """Server-sent stream of Solid-style change activities.
+
+            GET ?topic=<pod path>[&recursive=1] needs READ on the topic. Events
+            cover the topic and its members (Add/Remove/Update), or the whole
+            subtree when recursive. Edits made outside the hub are seen through
+            inotify on local mounts: the whole subtree is watched for recursive
+            topics, up to the watch limit. A "Reset" event means changes were
+            dropped and the client should re-list the topic.
+            """
+            token_json, proof, error = self._credentials()
+            if error:
+                return error
+            topic = request.args.get('topic', '').strip('/')
+            resource = "/" + topic
+            decision = self.manager.validate_token(token_json, self._request_context("READ", resource), proof)
+            if not decision.allowed:
+                self.manager.log_event(action="REJECTED SUBSCRIBE", resource=resource,
+                                       subject=decision.reason or "Unknown", type="error")
+                return jsonify({"error": f"Unauthorized: {decision.reason}"}), 403
+            try:
+                sub = self.hub.subscribe(topic, recursive=request.args.get('recursive') in ('1', 'true'))
+            except NotifyError as e:
+                return jsonify({"error": str(e)}), e.status
+            self.manager.log_event(action="SUBSCRIBE", resource=resource, subject="Solid Client", type="info")
+            return Response(self.hub.notifier.stream(sub, request.host_url + "pod/"),
+                            mimetype="text/event-stream",
+                            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+        @self.app.route('/pod/_changes', methods=['GET'])
+        def handle_changes():
+            """Incremental sync: GET ?since=<cursor>[&limit=n] -> changes after the cursor.
+
+            Without `since` only the current cursor is returned; take it before
+            a full scan. Mounts listed in "reset" must be rescanned. Only
+            mounts the token may READ are included.
+            """
+            if not self.journals:
+                return jsonify({"error": "Change journal disabled"}), 404
+            token_json, proof, error = self._credentials()
+            if error:
+                return error
+            decisions = {}
+
+            def allowed(name: str) -> bool:
+                if name not in decisions:
+                    decisions[name] = self.manager.validate_token(
+                        token_json, self._request_context("READ", "/" + name), proof
+                    ).allowed
+                return decisions[name]
+
+            try:
+                limit = max(1, min(int(request.args.get('limit', self.page_size or 1000)), self.MAX_PAGE_SIZE))
+                return jsonify(self.journals.changes(request.args.get('since'), limit, allowed))
+            except ValueError:
+                return jsonify({"error": "Invalid limit"}), 400
+            except JournalError as e:
+                return jsonify({"error": str(e)}), e.status
+
         @self.app.route('/pod/', defaults={'pod_path': ''}, methods=['GET', 'PUT', 'POST', 'DELETE'])
         @self.app.route('/pod/<path:pod_path>', methods=['GET', 'PUT', 'POST', 'DELETE'])
         def handle_pod_request(pod_path):
             """Proxy request to Hybrid Hub (Local or Remote)."""
             # 1. CAPABILITY ENFORCEMENT
-            auth_header = request.headers.get("Authorization")
-            dpop_header = request.headers.get("DPoP")
-
-            if not auth_header or not auth_header.startswith("Bearer "):
-                 return jsonify({"error": "Missing or invalid Authorization header"}), 401
-            if not dpop_header:
-                 return jsonify({"error": "Missing DPoP proof of possession"}), 401
-            
-            token_json = auth_header.split(" ", 1)[1]
-            try:
-                import json
-                proof = json.loads(dpop_header)
-            except:
-                return jsonify({"error": "Malformed DPoP proof"}), 400
+            token_json, proof, error = self._credentials()
+            if error:
+                return error
 
             method_map = {"GET": "READ", "PUT": "WRITE", "POST": "CREATE", "DELETE": "DELETE"}
-            ctx_data = {
-                "action": method_map.get(request.method, "READ"),
-                "resource": "/" + pod_path.lstrip('/')
-            }
+            ctx_data = self._request_context(
+                method_map.get(request.method, "READ"),
+                "/" + pod_path.lstrip('/'),
+                size=request.content_length
+            )
 
             decision = self.manager.validate_token(token_json, ctx_data, proof)
             if not decision.allowed:
@@ -436,6 +2236,11 @@ class PodProxyServer:
             )
 
             # 2. HYBRID HUB ROUTING
+            if 'upload' in request.args:
+                return self._handle_upload(pod_path, request.args['upload'], token_json, proof)
+            if 'archive' in request.args and request.method in ('GET', 'HEAD', 'POST'):
+                return self._handle_archive(pod_path, request.args['archive'], token_json, proof)
+
             try:
                 # 2.1 Virtual Sidecar Handling (.status)
                 if pod_path.endswith(".status"):
@@ -445,7 +2250,14 @@ class PodProxyServer:
                         status = attr.get("proxion_status", "unknown")
                         return Response(status, mimetype="text/plain")
 
-                if request.method == 'GET':
+                if request.method in ('PUT', 'DELETE') and self._has_preconditions():
+                    current = self.hub.get_attr(pod_path)
+                    etag, last_modified = self._validators(pod_path, current) if current else (None, None)
+                    failed = self._evaluate_preconditions(etag, last_modified, exists=current is not None)
+                    if failed is not None:
+                        return failed
+
+                if request.method in ('GET', 'HEAD'):
                     attr = self.hub.get_attr(pod_path)
                     if attr:
                         # Discovery Headers
@@ -459,32 +2271,77 @@ class PodProxyServer:
                         if is_dir:
                              links.append('<http://www.w3.org/ns/ldp#BasicContainer>; rel="type"')
                         
-                        resp_headers = {"Link": ", ".join(links)}
+                        resp_headers = {"Link": ", ".join(links), "Vary": "Accept"}
                         accept = request.headers.get('Accept', '')
-
                         if 'text/turtle' in accept or '*/*' in accept:
+                            variant = "turtle"
+                        elif 'application/json' in accept:
+                            variant = "json"
+                        else:
+                            variant = "raw"
+
+                        # Validators come from the same page the body is rendered from
+                        entries, after, next_cursor = None, None, None
+                        if is_dir and variant != "raw":
+                            try:
+                                after = self._decode_cursor(request.args.get('page'))
+                            except ValueError as e:
+                                return jsonify({"error": str(e)}), 400
+                            paged = self.page_size or 'limit' in request.args or 'page' in request.args
+                            if paged:
+                                limit = request.args.get('limit', type=int) or self.page_size or self.MAX_PAGE_SIZE
+                                entries, more = self.hub.list_dir_page(pod_path, after, max(1, min(limit, self.MAX_PAGE_SIZE)))
+                            else:
+                                entries, more = self.hub.list_dir_with_attrs(pod_path), False
+                            if more:
+                                from urllib.parse import urlencode
+                                next_cursor = self._encode_cursor(entries[-1][0])
+                                query = {"page": next_cursor, **({"limit": limit} if 'limit' in request.args else {})}
+                                links.append(f'<?{urlencode(query)}>; rel="next"')
+                            if more or after is not None:
+                                links.append('<http://www.w3.org/ns/ldp#Page>; rel="type"')
+                            resp_headers["Link"] = ", ".join(links)
+                        page_variant = variant if after is None else f"{variant}:{after}"
+                        etag, last_modified = self._validators(pod_path, attr, entries, page_variant)
+                        resp_headers["ETag"] = etag
+                        if last_modified:
+                            from werkzeug.http import http_date
+                            resp_headers["Last-Modified"] = http_date(last_modified)
+                        not_modified = self._evaluate_preconditions(etag, last_modified, exists=True, headers=resp_headers)
+                        if not_modified is not None:
+                            return not_modified
+
+                        if variant == "turtle" and is_dir:
+                            return Response(self._iter_turtle(pod_path, entries), mimetype='text/turtle', headers=resp_headers)
+
+                        if variant == "json":
                             if is_dir:
-                                entries = self.hub.list_dir(pod_path)
-                                turtle_data = self._render_turtle(pod_path, entries)
-                                return Response(turtle_data, mimetype='text/turtle', headers=resp_headers)
-
-                        if 'application/json' in accept:
-                            if is_dir:
-                                entries = self.hub.list_dir(pod_path)
-                                return jsonify({"entries": entries, **attr}), 200, resp_headers
+                                return jsonify({"entries": [name for name, _ in entries], **attr, "next": next_cursor}), 200, resp_headers
                             return jsonify(attr), 200, resp_headers
                         
                         if not is_dir:
                             mt = "application/octet-stream"
                             if pod_path.lower().endswith((".crt", ".pem", ".cer")): mt = "application/x-x509-ca-cert"
-                            return Response(self.hub.read_stream(pod_path), mimetype=mt, headers=resp_headers)
+                            return self._file_response(pod_path, attr, mt, resp_headers)
                         
                         return "@prefix ldp: <http://www.w3.org/ns/ldp#>.\n<> a ldp:BasicContainer.", 200, {**resp_headers, 'Content-Type': 'text/turtle'}
 
                 elif request.method == 'PUT':
-                    if self.hub.write(pod_path, request.get_data(), request.args.get('offset', 0, type=int)):
-                        return "", 201
+                    # Pulling from request.stream only as fast as the disk
+                    # accepts keeps memory flat and backpressures the client.
+                    offset = request.args.get('offset', type=int)
+                    body = ByteCounter(self._request_chunks())
+                    if self.hub.write_stream(pod_path, body, offset):
+                        # Quotas are charged what was written, once it succeeded
+                        self.manager.charge_quota(token_json, body.count)
+                        written = self.hub.get_attr(pod_path)
+                        headers = {"ETag": self._validators(pod_path, written)[0]} if written else {}
+                        return "", 201, headers
                 elif request.method == 'POST':
+                    if 'flush' in request.args:
+                        # FUSE fsync/release: make earlier offset writes durable
+                        self.hub.flush(pod_path)
+                        return "", 204
                     if self.hub.create(pod_path, is_dir=(request.args.get('type') == 'container')):
                         return "", 201
                 elif request.method == 'DELETE':
@@ -496,53 +2353,428 @@ class PodProxyServer:
 
             return jsonify({"error": "Not Found"}), 404
 
+    def _credentials(self):
+        """(token json, DPoP proof, None) from the request headers, or (None, None, error response)."""
+        auth_header = request.headers.get("Authorization")
+        dpop_header = request.headers.get("DPoP")
+
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return None, None, (jsonify({"error": "Missing or invalid Authorization header"}), 401)
+        if not dpop_header:
+            return None, None, (jsonify({"error": "Missing DPoP proof of possession"}), 401)
+
+        try:
+            proof = json.loads(dpop_header)
+        except ValueError:
+            return None, None, (jsonify({"error": "Malformed DPoP proof"}), 400)
+        return auth_header.split(" ", 1)[1], proof, None
+
+    def _request_context(self, action: str, resource: str, method: Optional[str] = None,
+                         size: Optional[int] = None) -> dict:
+        """ctx_data for validate_token, with the request facts caveats check."""
+        return {
+            "action": action,
+            "resource": resource,
+            "method": method or request.method,
+            "source_ip": request.remote_addr,
+            "size": size
+        }
+
+    def _authorize_batch(self, token_json: str, proof: dict, ops: List[BatchOperation]) -> Dict[int, str]:
+        """Map op index -> denial reason for the ops the token does not allow.
+
+        Each distinct (action, resource, method, size) is validated once. A
+        put is sized as everything the batch writes up to and including it,
+        so byte quotas see the whole batch rather than each put against the
+        same pre-batch usage.
+        """
+        decisions, denied = {}, {}
+        written = 0
+        for op in ops:
+            size = op.size
+            if size is not None:
+                written += size
+                size = written
+            key = (op.action, op.resource, op.method, size)
+            if key not in decisions:
+                decisions[key] = self.manager.validate_token(token_json, self._request_context(*key), proof)
+            if not decisions[key].allowed:
+                denied[op.index] = decisions[key].reason or "Unknown"
+        return denied
+
+    def _charge_batch(self, token_json: str, ops, results):
+        """Pass batch results through, charging each successful put to the token's quotas."""
+        for result in results:
+            op = ops[result["index"]]
+            if op.op == "put" and result["status"] == 201:
+                self.manager.charge_quota(token_json, op.size)
+            yield result
+
+    def _handle_upload(self, pod_path: str, upload_id: str, token_json: str, proof: dict):
+        """Resumable chunked uploads (see ChunkedUploads).
+
+        POST   ?upload=new            (Upload-Length, Upload-Chunk-Size) -> 201 session
+        PUT    ?upload=<id>&chunk=<n>  chunk body                         -> 204
+        GET    ?upload=<id>            session status incl. missing chunks
+        POST   ?upload=<id>&commit     atomically publish                 -> 201
+        DELETE ?upload=<id>            abort                              -> 204
+
+        The request itself was authorized as CREATE; a commit that replaces an
+        existing resource must also be allowed to WRITE it.
+        """
+        def authorize(action: str, path: str, size: Optional[int]) -> bool:
+            ctx_data = self._request_context(action, "/" + path.lstrip('/'), size=size)
+            decision = self.manager.validate_token(token_json, ctx_data, proof)
+            if not decision.allowed:
+                self.manager.log_event(
+                    action=f"REJECTED {action}",
+                    resource=ctx_data['resource'],
+                    subject=decision.reason or "Unknown",
+                    type="error"
+                )
+            return decision.allowed
+
+        try:
+            if request.method == 'POST' and upload_id == 'new':
+                length = request.headers.get('Upload-Length', type=int)
+                if length is None:
+                    return jsonify({"error": "Missing Upload-Length"}), 400
+                session = self.uploads.create(pod_path, length, request.headers.get('Upload-Chunk-Size', type=int))
+                location = f"/pod/{pod_path.lstrip('/')}?upload={session['upload_id']}"
+                return jsonify(session), 201, {"Location": location}
+            if request.method == 'PUT':
+                index = request.args.get('chunk', type=int)
+                if index is None:
+                    return jsonify({"error": "Missing chunk index"}), 400
+                received = self.uploads.put_chunk(pod_path, upload_id, index, self._request_chunks())
+                self.manager.charge_quota(token_json, received)
+                return "", 204
+            if request.method == 'GET':
+                return jsonify(self.uploads.status(pod_path, upload_id)), 200
+            if request.method == 'POST' and 'commit' in request.args:
+                self.uploads.commit(pod_path, upload_id, authorize)
+                return "", 201
+            if request.method == 'DELETE':
+                self.uploads.abort(pod_path, upload_id)
+                return "", 204
+        except UploadError as e:
+            return jsonify({"error": str(e), **e.details}), e.status
+        except PermissionError as e:
+            return jsonify({"error": str(e)}), 403
+        return jsonify({"error": "Unsupported upload operation"}), 400
+
+    def _handle_archive(self, pod_path: str, kind: str, token_json: str, proof: dict):
+        """Whole-container transfer in one request.
+
+        GET  ?archive=tar|zip  stream the subtree as an archive
+        POST ?archive=tar|zip  extract the request body into the container -> 201 summary
+
+        The container grant alone is not enough: every member is authorized
+        like a request of its own (READ when exporting, CREATE or WRITE when
+        importing). Exports leave out what the token may not read; imports
+        are refused whole (403) if any member is denied.
+        """
+        if kind not in ARCHIVE_TYPES:
+            return jsonify({"error": f"Unsupported archive type: {kind}"}), 400
+        # Export bodies stream after this request context ends, so capture it now
+        facts = self._request_context("READ", "/" + pod_path.lstrip('/'))
+        decisions = {}
+
+        def authorize(action: str, path: str, size: Optional[int]) -> bool:
+            key = (action, path, size)
+            if key not in decisions:
+                ctx_data = dict(facts, action=action, resource="/" + path.lstrip('/'), size=size)
+                decisions[key] = self.manager.validate_token(token_json, ctx_data, proof).allowed
+            return decisions[key]
+
+        try:
+            if request.method == 'POST':
+                attr = self.hub.get_attr(pod_path)
+                if attr and not attr['st_mode'] & 0o40000:
+                    return jsonify({"error": "Archives can only be extracted into a container"}), 409
+                summary = self.archive_import.extract(pod_path, kind, request.stream, authorize)
+                self.manager.charge_quota(token_json, summary["bytes"])
+                return jsonify(summary), 201
+
+            attr = self.hub.get_attr(pod_path)
+            if not attr:
+                return jsonify({"error": "Not Found"}), 404
+            if not attr['st_mode'] & 0o40000:
+                return jsonify({"error": "Only containers can be exported as archives"}), 400
+            name = os.path.basename(pod_path.rstrip('/')) or "pod"
+            headers = {"Content-Disposition": f'attachment; filename="{name}.{kind}"'}
+            return Response(self.archive_export.stream(pod_path, kind, authorize),
+                            mimetype=ARCHIVE_TYPES[kind], headers=headers)
+        except ArchiveError as e:
+            return jsonify({"error": str(e), **e.details}), e.status
+        except PermissionError as e:
+            return jsonify({"error": str(e)}), 403
+
+    UPLOAD_CHUNK = 1024 * 1024
+    MAX_RANGES = 32
+    MAX_PAGE_SIZE = 10000
+
+    def _validators(self, pod_path: str, attr: dict, entries: Optional[list] = None, variant: str = "raw"):
+        """Return (ETag header value, Last-Modified timestamp) for a representation.
+
+        Files get a strong mtime/size tag (or a content digest in "content"
+        mode), downgraded to weak while the mtime is too fresh to trust.
+        Containers hash their listing, so a child changing size or mtime
+        changes the tag; each representation (Turtle, JSON) gets its own tag.
+        """
+        mtime = attr.get("st_mtime", 0)
+        if attr['st_mode'] & 0o40000:
+            import hashlib
+            h = hashlib.sha1(f"{variant}:{mtime}".encode())
+            for name, child in entries or []:
+                h.update(f"\0{name}\0{child.get('st_mode', 0)}\0{child.get('st_mtime', 0)}\0{child.get('st_size', 0)}".encode())
+                mtime = max(mtime, child.get("st_mtime", 0))
+            return f'W/"{h.hexdigest()[:24]}"', mtime or None
+
+        tag = None
+        if self.etag_mode == "content" and variant == "raw":
+            tag = self.content_hashes.digest(self.hub, pod_path, attr)
+        if tag is None:
+            tag = metadata_etag(attr)
+            if variant != "raw":
+                tag += f"-{variant}"
+            # Same-second rewrites can keep mtime/size identical (RFC 9110 §8.8.1)
+            if time.time() - mtime < 1:
+                return f'W/"{tag}"', mtime or None
+        return f'"{tag}"', mtime or None
+
+    def _has_preconditions(self) -> bool:
+        return any(h in request.headers for h in ("If-Match", "If-None-Match", "If-Unmodified-Since"))
+
+    def _evaluate_preconditions(self, etag: Optional[str], last_modified: Optional[float], exists: bool, headers: Optional[dict] = None):
+        """RFC 9110 §13.2.2 precondition evaluation; returns a 304/412 response or None."""
+        from werkzeug.http import parse_etags, parse_date, unquote_etag
+        tag, weak = unquote_etag(etag) if etag else (None, False)
+        safe = request.method in ('GET', 'HEAD')
+
+        if_match = request.headers.get("If-Match")
+        if if_match is not None:
+            etags = parse_etags(if_match)
+            # Strong comparison: a weak current tag never matches a listed tag
+            if not exists or not (etags.star_tag or (tag and not weak and etags.contains(tag))):
+                return Response(status=412, headers=headers)
+        elif request.headers.get("If-Unmodified-Since") and exists and last_modified:
+            since = parse_date(request.headers["If-Unmodified-Since"])
+            if since and int(last_modified) > since.timestamp():
+                return Response(status=412, headers=headers)
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            etags = parse_etags(if_none_match)
+            if exists and (etags.star_tag or (tag and etags.contains_weak(tag))):
+                return Response(status=304 if safe else 412, headers=headers)
+        elif safe and request.headers.get("If-Modified-Since") and exists and last_modified:
+            since = parse_date(request.headers["If-Modified-Since"])
+            if since and int(last_modified) <= since.timestamp():
+                return Response(status=304, headers=headers)
+        return None
+
+    def _request_chunks(self):
+        stream = request.stream
+        while chunk := stream.read(self.UPLOAD_CHUNK):
+            yield chunk
+
+    def _file_response(self, pod_path: str, attr: dict, mimetype: str, headers: dict):
+        """Serve a file body honoring Range/If-Range (RFC 9110 §14).
+
+        Local files are handed to the server as real file objects
+        (`wsgi.file_wrapper` when the server offers one, enabling sendfile);
+        other providers go through `read_range`.
+        """
+        f = self.hub.open_file(pod_path)
+        handed_off = False  # Set once the response body is responsible for closing f
+        try:
+            size = os.fstat(f.fileno()).st_size if f else attr.get("st_size", 0)
+            headers = {**headers, "Accept-Ranges": "bytes"}
+
+            ranges = self._requested_ranges(size, headers.get("ETag"), attr.get("st_mtime", 0))
+            if ranges == []:
+                return Response(status=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+            if ranges is None:
+                if not f:
+                    return Response(self.hub.read_stream(pod_path), mimetype=mimetype, headers=headers)
+                body = self._wrap_file(f, 0, size, size)
+                handed_off = True
+                return Response(body, mimetype=mimetype,
+                                headers={**headers, "Content-Length": str(size)}, direct_passthrough=True)
+
+            if len(ranges) == 1:
+                start, end = ranges[0]
+                headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+                if not f:
+                    return Response(self.hub.read_range(pod_path, start, end - start), 206, mimetype=mimetype, headers=headers)
+                body = self._wrap_file(f, start, end - start, size)
+                handed_off = True
+                return Response(body, 206, mimetype=mimetype,
+                                headers={**headers, "Content-Length": str(end - start)}, direct_passthrough=True)
+
+            import secrets
+            boundary = secrets.token_hex(16)
+            part_heads = [
+                f"--{boundary}\r\nContent-Type: {mimetype}\r\nContent-Range: bytes {start}-{end - 1}/{size}\r\n\r\n".encode()
+                for start, end in ranges
+            ]
+            tail = f"--{boundary}--\r\n".encode()
+
+            def multipart():
+                for head, (start, end) in zip(part_heads, ranges):
+                    yield head
+                    if f:
+                        yield from FileRange(f, start, end - start, close_file=False)
+                    else:
+                        yield from self.hub.read_range(pod_path, start, end - start)
+                    yield b"\r\n"
+                yield tail
+
+            if f:
+                headers["Content-Length"] = str(
+                    sum(len(h) + (end - start) + 2 for h, (start, end) in zip(part_heads, ranges)) + len(tail)
+                )
+            response = Response(multipart(), 206, headers=headers,
+                                content_type=f"multipart/byteranges; boundary={boundary}")
+            if f:
+                # A generator that never started can't close f itself (e.g. HEAD)
+                response.call_on_close(f.close)
+                handed_off = True
+            return response
+        finally:
+            if f and not handed_off:
+                f.close()
+
+    def _requested_ranges(self, size: int, etag: Optional[str], mtime: float):
+        """Parse Range into sorted, merged [start, end) pairs.
+
+        None means serve the whole entity (no/ignored Range, or a stale
+        If-Range); an empty list means the range is unsatisfiable.
+        """
+        from werkzeug.http import parse_date
+        header = request.headers.get("Range", "")
+        units, _, spec = header.partition("=")
+        if units.strip().lower() != "bytes" or not spec:
+            return None
+
+        if_range = request.headers.get("If-Range")
+        if if_range:
+            if if_range.startswith(('"', 'W/')):
+                # Strong comparison only: weak tags never satisfy If-Range
+                if if_range.startswith('W/') or not etag or etag.startswith('W/') or if_range != etag:
+                    return None
+            else:
+                since = parse_date(if_range)
+                if not since or int(since.timestamp()) != int(mtime):
+                    return None
+
+        spans = []
+        for item in spec.split(","):
+            first, dash, last = item.strip().partition("-")
+            if not dash or not (first or last) or (first and not first.isdigit()) or (last and not last.isdigit()):
+                return None  # Malformed: ignore the header entirely
+            if not first:
+                start, stop = max(0, size - int(last)), size
+            else:
+                start = int(first)
+                stop = min(int(last) + 1, size) if last else size
+                if last and int(last) < start:
+                    return None
+            if start < stop:
+                spans.append((start, stop))
+        spans.sort()
+        merged = []
+        for start, stop in spans:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+            else:
+                merged.append((start, stop))
+        if len(merged) > self.MAX_RANGES:
+            return None
+        return merged
+
+    def _wrap_file(self, f, start: int, length: int, size: int):
+        # Server file wrappers read to EOF, so they're only safe for tail ranges
+        wrapper = request.environ.get("wsgi.file_wrapper")
+        if wrapper and start + length == size:
+            f.seek(start)
+            return wrapper(f, FileRange.BLOCK_SIZE)
+        return FileRange(f, start, length)
+
     def _render_turtle(self, pod_path: str, entries: list) -> str:
-        """Render a directory listing as a Solid LDP Basic Container (Turtle)."""
+        """Render a directory listing as a Solid LDP Basic Container (Turtle).
+
+        `entries` are (name, attr) pairs from `HybridHub.list_dir_with_attrs`.
+        """
+        return "".join(self._iter_turtle(pod_path, entries))
+
+    def _iter_turtle(self, pod_path: str, entries: list, buffer_size: int = 64 * 1024):
+        """Stream the Turtle document in ~buffer_size pieces for large pages."""
+        buf, size = [], 0
+        for i, line in enumerate(self._turtle_lines(entries)):
+            piece = line if i == 0 else "\n" + line
+            buf.append(piece)
+            size += len(piece)
+            if size >= buffer_size:
+                yield "".join(buf)
+                buf, size = [], 0
+        if buf:
+            yield "".join(buf)
+
+    @staticmethod
+    def _turtle_lines(entries: list):
         from datetime import datetime
-        
-        turtle = [
-            "@prefix ldp: <http://www.w3.org/ns/ldp#>.",
-            "@prefix terms: <http://purl.org/dc/terms/>.",
-            "@prefix stat: <http://www.w3.org/ns/posix/stat#>.",
-            "",
-            "<> a ldp:BasicContainer;"
-        ]
 
-        if entries:
-            for e in entries:
-                full_p = os.path.join(pod_path, e)
-                attr = self.hub.get_attr(full_p)
-                is_dir = attr and bool(attr['st_mode'] & 0o40000)
-                safe_e = e + "/" if is_dir else e
-                turtle.append(f"<> ldp:contains <{safe_e}> .")
-        else:
-            turtle[-1] = turtle[-1].replace(";", ".")
+        yield "@prefix ldp: <http://www.w3.org/ns/ldp#>."
+        yield "@prefix terms: <http://purl.org/dc/terms/>."
+        yield "@prefix stat: <http://www.w3.org/ns/posix/stat#>."
+        yield ""
+        yield "<> a ldp:BasicContainer;" if entries else "<> a ldp:BasicContainer."
 
-        for e in entries:
-            full_p = os.path.join(pod_path, e)
-            attr = self.hub.get_attr(full_p)
-            if not attr: continue
-            is_dir = bool(attr['st_mtime'] != 0) # Simple heuristic for mock
-            
-            uri = e + "/" if bool(attr['st_mode'] & 0o40000) else e
+        for e, attr in entries:
+            is_dir = bool(attr['st_mode'] & 0o40000)
+            safe_e = e + "/" if is_dir else e
+            yield f"<> ldp:contains <{safe_e}> ."
+
+        for e, attr in entries:
+            is_dir = bool(attr['st_mode'] & 0o40000)
+            uri = e + "/" if is_dir else e
             mtime = datetime.fromtimestamp(attr['st_mtime']).isoformat() + "Z" if attr['st_mtime'] else datetime.now().isoformat() + "Z"
             
-            turtle.append("")
-            turtle.append(f"<{uri}> a ldp:{'Container, ldp:BasicContainer' if bool(attr['st_mode'] & 0o40000) else 'Resource'};")
-            turtle.append(f"   terms:modified \"{mtime}\";")
-            if not bool(attr['st_mode'] & 0o40000):
-                turtle.append(f"   stat:size {attr['st_size']}.")
+            yield ""
+            yield f"<{uri}> a ldp:{'Container, ldp:BasicContainer' if is_dir else 'Resource'};"
+            if not is_dir:
+                yield f"   terms:modified \"{mtime}\";"
+                yield f"   stat:size {attr['st_size']}."
             else:
-                turtle[-1] = turtle[-1].replace(";", ".")
-
-        return "\n".join(turtle)
+                yield f"   terms:modified \"{mtime}\"."
+
+    @staticmethod
+    def _encode_cursor(name: str) -> str:
+        import base64
+        return base64.urlsafe_b64encode(name.encode("utf-8")).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Optional[str]:
+        """Opaque page cursor -> last name of the previous page (ValueError if malformed)."""
+        if not cursor:
+            return None
+        import base64, binascii
+        try:
+            return base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError):
+            raise ValueError("Invalid page cursor")
 
     def run(self, port=8889):
         print(f"Pod Proxy running on http://0.0.0.0:{port}")
         print(f"Solid API: http://localhost:{port}/pod")
         print(f"WebDAV API: http://localhost:{port}/dav")
         from cheroot import wsgi
-        server = wsgi.Server(("0.0.0.0", port), self.combined_app)
+        # Each notification stream holds a worker thread; leave room for requests
+        threads = int(self.config.get("pod_server_threads", 16)) + self.hub.notifier.max_subscribers
+        server = wsgi.Server(("0.0.0.0", port), self.combined_app, numthreads=threads)
         try:
             server.start()
         except KeyboardInterrupt:
@@ -0,0 +1,247 @@
+import os
+import json
+import re
+import secrets
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# (action, pod path, size) -> whether the caller may do it
+Authorize = Callable[[str, str, Optional[int]], bool]
+
+class UploadError(Exception):
+    """Raised for upload session failures; `status` is the HTTP code to return."""
+    def __init__(self, message: str, status: int = 400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+class ChunkedUploads:
+    """
+    Resumable, parallel chunked upload sessions for plain LocalProvider targets
+    (subclasses such as CompressedLocalProvider store files in their own
+    format, which a raw os.replace would bypass).
+
+    A session is staged next to its target as three hidden files sharing the
+    LocalProvider upload suffix (so listings never show them):
+      - data:  preallocated to the final length, chunks land at index * chunk_size
+      - map:   one byte per chunk, set (and fsynced) only after that chunk is
+               fsynced; a chunk already set is not counted again
+      - state: JSON metadata (length, chunk size, expiry)
+    Everything lives on disk, so sessions survive proxy restarts and clients on
+    flaky links only resend the chunks the map reports missing. Commit is an
+    atomic os.replace over the target; with `authorize`, replacing an existing
+    target also needs WRITE.
+    """
+    DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+    MIN_CHUNK_SIZE = 64 * 1024
+    MAX_CHUNK_SIZE = 64 * 1024 * 1024
+    SESSION_TTL = 24 * 3600
+    _ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+    def __init__(self, hub):
+        self.hub = hub
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self._committing = set()
+
+    # --- Session Lifecycle ---
+
+    def create(self, pod_path: str, length: int, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Open a session and preallocate the staging file."""
+        if length < 0:
+            raise UploadError("Upload-Length must be non-negative")
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        if not self.MIN_CHUNK_SIZE <= chunk_size <= self.MAX_CHUNK_SIZE:
+            raise UploadError(f"Chunk size must be between {self.MIN_CHUNK_SIZE} and {self.MAX_CHUNK_SIZE}")
+
+        provider, subpath, target = self._resolve(pod_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        self._purge_expired(provider, os.path.dirname(target))
+
+        session_id = secrets.token_hex(16)
+        files = self._files(provider, target, session_id)
+        chunk_count = max(1, -(-length // chunk_size))
+
+        with open(files["data"], "wb") as f:
+            self._preallocate(f, length)
+        with open(files["map"], "wb") as f:
+            f.write(b"\0" * chunk_count)
+        state = {
+            "upload_id": session_id,
+            "path": pod_path,
+            "length": length,
+            "chunk_size": chunk_size,
+            "chunk_count": chunk_count,
+            "expires": time.time() + self.SESSION_TTL
+        }
+        with open(files["state"], "w") as f:
+            json.dump(state, f)
+        return state
+
+    def put_chunk(self, pod_path: str, session_id: str, index: int, chunks) -> int:
+        """Write one chunk. Safe to call concurrently for different indices.
+
+        Returns the bytes newly received: the chunk size, or 0 when the map
+        already recorded it (a resend after a lost response), so quotas
+        charge each chunk once.
+        """
+        state, files = self._load(pod_path, session_id)
+        if not 0 <= index < state["chunk_count"]:
+            raise UploadError(f"Chunk index {index} out of range")
+        start = index * state["chunk_size"]
+        expected = min(state["chunk_size"], state["length"] - start)
+
+        with self._lock:
+            if session_id in self._committing:
+                raise UploadError("Session is being committed", status=409)
+            self._in_flight[session_id] = self._in_flight.get(session_id, 0) + 1
+        try:
+            written = 0
+            with open(files["data"], "r+b") as f:
+                f.seek(start)
+                for chunk in chunks:
+                    written += len(chunk)
+                    if written > expected:
+                        raise UploadError(f"Chunk {index} exceeds {expected} bytes")
+                    f.write(chunk)
+                if written != expected:
+                    raise UploadError(f"Chunk {index} is {written} bytes, expected {expected}")
+                f.flush()
+                os.fsync(f.fileno())
+            # Only mark complete once the bytes are durable; the lock makes
+            # concurrent resends of one chunk agree on which one was first
+            with self._lock, open(files["map"], "r+b") as m:
+                m.seek(index)
+                if m.read(1) == b"\1":
+                    return 0
+                m.seek(index)
+                m.write(b"\1")
+                m.flush()
+                os.fsync(m.fileno())
+            return expected
+        finally:
+            with self._lock:
+                self._in_flight[session_id] -= 1
+                if not self._in_flight[session_id]:
+                    del self._in_flight[session_id]
+
+    def status(self, pod_path: str, session_id: str) -> Dict[str, Any]:
+        state, files = self._load(pod_path, session_id)
+        missing = self._missing(files)
+        return {
+            **state,
+            "received": state["chunk_count"] - len(missing),
+            "missing": missing
+        }
+
+    def commit(self, pod_path: str, session_id: str, authorize: Optional[Authorize] = None) -> None:
+        """Atomically publish the assembled file over the target."""
+        state, files = self._load(pod_path, session_id)
+        with self._lock:
+            if self._in_flight.get(session_id):
+                raise UploadError("Chunks still in flight", status=409)
+            self._committing.add(session_id)
+        try:
+            missing = self._missing(files)
+            if missing:
+                raise UploadError("Upload incomplete", status=409, missing=missing)
+            provider, subpath, target = self._resolve(pod_path)
+            provider.flush(subpath)  # Retire any cached write handle on the old file
+            existed = os.path.exists(target)
+            if existed and authorize is not None and not authorize("WRITE", pod_path, state["length"]):
+                raise UploadError("Not authorized to overwrite the target", status=403)
+            os.replace(files["data"], target)
+            self._remove(files, keep_data=True)
+            self.hub.attr_cache.invalidate(provider, subpath)
+            self.hub.notify(pod_path, "Update" if existed else "Create")
+        finally:
+            with self._lock:
+                self._committing.discard(session_id)
+
+    def abort(self, pod_path: str, session_id: str) -> None:
+        _, files = self._load(pod_path, session_id)
+        self._remove(files)
+
+    # --- Internals ---
+
+    def _resolve(self, pod_path: str):
+        from .pod_proxy import LocalProvider  # pod_proxy imports this module
+        provider, subpath = self.hub._route(pod_path)
+        if type(provider) is not LocalProvider:
+            raise UploadError("Chunked uploads need a plain local mount", status=501)
+        return provider, subpath, provider._safe_path(subpath)
+
+    def _files(self, provider, target: str, session_id: str) -> Dict[str, str]:
+        stem = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.{session_id}")
+        suffix = provider.UPLOAD_SUFFIX
+        return {
+            "data": f"{stem}{suffix}",
+            "map": f"{stem}.map{suffix}",
+            "state": f"{stem}.state{suffix}"
+        }
+
+    def _load(self, pod_path: str, session_id: str):
+        if not self._ID_PATTERN.match(session_id or ""):
+            raise UploadError("Malformed upload id")
+        provider, _, target = self._resolve(pod_path)
+        files = self._files(provider, target, session_id)
+        try:
+            with open(files["state"], "r") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            raise UploadError("Unknown upload session", status=404)
+        if state["path"].strip('/') != pod_path.strip('/'):
+            raise UploadError("Unknown upload session", status=404)
+        if time.time() > state["expires"]:
+            self._remove(files)
+            raise UploadError("Upload session expired", status=404)
+        return state, files
+
+    def _missing(self, files: Dict[str, str]) -> List[int]:
+        with open(files["map"], "rb") as m:
+            bitmap = m.read()
+        return [i for i, b in enumerate(bitmap) if not b]
+
+    def _remove(self, files: Dict[str, str], keep_data: bool = False):
+        for kind, path in files.items():
+            if keep_data and kind == "data":
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _purge_expired(self, provider, directory: str):
+        """Drop abandoned sessions in a directory whenever a new one starts there."""
+        now = time.time()
+        marker = ".state" + provider.UPLOAD_SUFFIX
+        try:
+            names = [n for n in os.listdir(directory) if n.endswith(marker)]
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "r") as f:
+                    expires = json.load(f).get("expires", 0)
+            except (OSError, ValueError):
+                continue
+            if now > expires:
+                stem = path[:-len(marker)]
+                self._remove({
+                    "data": stem + provider.UPLOAD_SUFFIX,
+                    "map": stem + ".map" + provider.UPLOAD_SUFFIX,
+                    "state": path
+                })
+
+    @staticmethod
+    def _preallocate(f, length: int):
+        """Reserve blocks up front so parallel chunks don't fragment the file."""
+        if length and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, length)
+                return
+            except OSError:
+                pass  # e.g. filesystems without fallocate support
+        f.truncate(length)
@@ -9,16 +9,18 @@ import sys
 import secrets
 import time
 import json
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, g
 from flask_cors import CORS
 import threading
 
 from .os_adapter_init import adapter
 from .service import ResourceServer, WireGuardConfig
 from ..manager import KeyringManager
-from ..pod_proxy import PodProxyServer
+from ..pod_proxy import PodProxyServer, WRITE_HANDLES
 from ..identity import derive_app_password, load_or_create_identity_key
 from ..config import load_config, save_config
+from ..core.permissions import compile_permissions
+from ..core.token_cache import TokenRevoked, VerifiedTokenCache
 
 # Global Manager
 manager = KeyringManager()
@@ -93,11 +95,36 @@ atexit.register(cleanup)
 
 # Initialize Serializer
 SERIALIZER = TokenSerializer(issuer="https://proxion-keyring.example/fortress")
+# Verified Proxion-Tokens (EdDSA decode + caveat rehydration is the hot path for dashboard polling)
+TOKEN_CACHE = VerifiedTokenCache(manager.revocation_list)
+manager.identity.keys.on_rotate(TOKEN_CACHE.clear)
 
 
 from functools import wraps
 from datetime import datetime, timedelta, timezone
 
+def verified_token(token_str: str, audience: str = None):
+    """Verify a root-signed Proxion-Token once per request, reusing TOKEN_CACHE across requests.
+
+    The signature is checked without an audience and `audience` is compared
+    here, so require_capability and require_approval share one verification.
+    Raises TokenRevoked for revoked tokens and ValueError for invalid ones.
+    """
+    if not token_str:
+        raise ValueError("Missing Proxion-Token")
+    tokens = g.setdefault("proxion_tokens", {})
+    token = tokens.get(token_str)
+    if token is None:
+        token = TOKEN_CACHE.get_or_verify(
+            token_str, lambda: SERIALIZER.verify(token_str, manager.public_key, audience=None)
+        )
+        tokens[token_str] = token
+    if audience is not None:
+        aud = token.aud if isinstance(token.aud, (list, tuple)) else [token.aud]
+        if audience not in aud:
+            raise ValueError(f"Invalid Token: audience {token.aud!r} is not {audience!r}")
+    return token
+
 def require_capability(action: str, resource: str):
     """Decorator to enforce Proxion Capability Tokens."""
     def decorator(f):
@@ -110,25 +137,18 @@ def require_capability(action: str, resource: str):
                 return jsonify({"error": "Missing Proxion-Token"}), 401
             
             try:
-                # 2. Verify JWT Integrity and Reconstruct Token
+                # 2. Verify JWT Integrity and Reconstruct Token (cached), then
+                # 3. Revocation Check (Fortress Registry) on every use
                 # Use manager.public_key for root-signed tokens
                 # Relax audience for local dashboard development
-                token = SERIALIZER.verify(token_str, manager.public_key, audience=None)
-                
-                # 3. Revocation Check (Fortress Registry)
-                if manager.revocation_list.is_revoked(token, datetime.now(timezone.utc)):
-                    return jsonify({"error": "Token Revoked"}), 403
+                token = verified_token(token_str)
 
                 # 4. Expiration Check
                 if datetime.now(timezone.utc) >= token.exp:
                     return jsonify({"error": "Token Expired"}), 403
                 
-                # 5. Permission Check (allow * wildcard)
-                has_permission = False
-                for perm_action, perm_resource in token.permissions:
-                    if perm_action == "*" or (perm_action == action and (perm_resource == "*" or perm_resource == resource)):
-                        has_permission = True
-                        break
+                # 5. Permission Check (compiled once per cached token)
+                has_permission = compile_permissions(token).allows(action, resource)
                 
                 # Special Case: 'manage' on 'system:suite' often comes in as 'manage' on '*' or broadly
                 if not has_permission:
@@ -143,6 +163,8 @@ def require_capability(action: str, resource: str):
                 
                 # Success
                 return f(*args, **kwargs)
+            except TokenRevoked:
+                return jsonify({"error": "Token Revoked"}), 403
             except Exception as e:
                 import traceback
                 print(f"RS: Authorization Failed for {action} on {resource}: {e}")
@@ -159,9 +181,10 @@ def require_approval(action: str):
             # 1. Skip if called by Root/Admin device directly
             token_str = request.headers.get("Proxion-Token")
             try:
-                token = SERIALIZER.verify(token_str, manager.public_key, audience="fortress:rs")
+                token = verified_token(token_str, audience="fortress:rs")
                 # Dashboard/Admin have ('*', '*') or 'gateway.authorize'
-                is_root = any(p[0] == "*" or p[0] == "gateway.authorize" for p in token.permissions)
+                permissions = compile_permissions(token)
+                is_root = permissions.has_action("*") or permissions.has_action("gateway.authorize")
                 if is_root:
                     return f(*args, **kwargs)
             except:
@@ -481,29 +504,43 @@ def relay_status():
         "bandwidth_kbps": 850
     }), 200
 
+_source_space = None  # FreeSpaceCache for stash sources outside any pool
+
 @app.route("/storage/stats", methods=["GET"])
 @require_capability("read", "system:host")
 def storage_stats():
     """Fetch metrics for the Unified P: Drive (Pooled across physical disks)."""
-    import shutil
+    global _source_space
     from datetime import datetime, timezone
+    from ..pod_pool import FreeSpaceCache
     config = load_config()
-    sources = config.get("stash_sources", [])
-    
+    paths = [os.path.abspath(s["path"]) for s in config.get("stash_sources", []) if s.get("path")]
+    pod_proxy = getattr(manager, "pod_proxy", None)
+
+    # Pools already keep cached disk usage for their branches; the other
+    # sources share one cache here, so polling stats never hits every disk
+    caches = {
+        root: provider.free_space
+        for provider in (pod_proxy.hub.mounts.values() if pod_proxy else [])
+        if hasattr(provider, "free_space")
+        for root in provider.free_space.roots
+    }
+    unpooled = [path for path in dict.fromkeys(paths) if path not in caches]
+    if _source_space is None or _source_space.roots != unpooled:
+        _source_space = FreeSpaceCache(unpooled)
+
     pooled_usage = {"total": 0, "used": 0, "free": 0, "percent": 0}
     active_sources_count = 0
 
-    for source in sources:
-        path = source.get("path")
-        if path and os.path.exists(path):
-            try:
-                total, used, free = shutil.disk_usage(path)
-                pooled_usage["total"] += total
-                pooled_usage["used"] += used
-                pooled_usage["free"] += free
-                active_sources_count += 1
-            except Exception as e:
-                print(f"Error checking stats for {path}: {e}")
+    for path in paths:
+        usage = caches.get(path, _source_space).usage(path)
+        if usage is None:
+            continue  # Missing or unreadable source
+        total, used, free = usage
+        pooled_usage["total"] += total
+        pooled_usage["used"] += used
+        pooled_usage["free"] += free
+        active_sources_count += 1
 
     if pooled_usage["total"] > 0:
         pooled_usage["percent"] = (pooled_usage["used"] / pooled_usage["total"]) * 100
@@ -515,11 +552,25 @@ def storage_stats():
     is_mounted = os.path.exists("P:")
     print(f"[Backend] P: drive exists check: {is_mounted}")
 
+    attr_cache = pod_proxy.hub.attr_cache.stats() if pod_proxy else None
+    notifications = pod_proxy.hub.notifier.stats() if pod_proxy else None
+    block_cache = getattr(pod_proxy, "block_cache", None)
+    pools = {
+        name: provider.stats()
+        for name, provider in (pod_proxy.hub.mounts.items() if pod_proxy else [])
+        if hasattr(provider, "policy_name")
+    }
+
     return jsonify({
         "is_mounted": is_mounted,
         "usage": pooled_usage,
         "active_sources": active_sources_count,
         "cache_health": "OPTIMAL",
+        "attr_cache": attr_cache,
+        "block_cache": block_cache.stats() if block_cache else None,
+        "pools": pools,
+        "write_handles": WRITE_HANDLES.stats(),
+        "notifications": notifications,
         "last_sync": datetime.now(timezone.utc).isoformat()
     }), 200
 
@@ -541,6 +592,9 @@ def storage_config():
         success = save_config(config)
         
         if success:
+            if getattr(manager, "pod_proxy", None):
+                # Apply new mounts to the running proxy (Solid + WebDAV share the hub)
+                manager.pod_proxy.sync_sources(sources)
             print(f"[Backend] Storage configuration synchronized successfully.")
             return jsonify(config), 200
         
@@ -1198,9 +1252,8 @@ def authorize_session():
     ip = data.get("ip") or request.remote_addr
     expires_in = int(data.get("expires_in", 3600))
 
-    # Re-verify token to capture token_id and subject for session record
-    token_str = request.headers.get("Proxion-Token")
-    token = SERIALIZER.verify(token_str, manager.public_key, audience=None)
+    # Token already verified by require_capability for this request
+    token = verified_token(request.headers.get("Proxion-Token"))
 
     rs._active_sessions[ip] = {
         "token_id": token.token_id,
@@ -0,0 +1,85 @@
+import sys
+import os
+import random
+import shutil
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proxion_keyring.pod_dedup import DedupProvider
+from proxion_keyring.pod_proxy import LocalProvider
+
+BASE_FILES = 4
+FILE_SIZE = 4 * 1024 * 1024
+CHUNK = 256 * 1024
+
+def make_corpus():
+    """Base files plus typical near-duplicates: verbatim copies, an insertion
+    near the start (shifts every later byte) and an appended tail."""
+    rng = random.Random(7)
+    corpus = {}
+    for i in range(BASE_FILES):
+        data = rng.randbytes(FILE_SIZE)
+        corpus[f"base/file_{i}.bin"] = data
+        corpus[f"copies/file_{i}.bin"] = data
+        corpus[f"edited/file_{i}.bin"] = data[:1000] + b"inserted" * 100 + data[1000:]
+        corpus[f"appended/file_{i}.bin"] = data + rng.randbytes(64 * 1024)
+    return corpus
+
+def pieces(data: bytes):
+    for i in range(0, len(data), CHUNK):
+        yield data[i:i + CHUNK]
+
+def timed_write(provider, corpus):
+    start = time.perf_counter()
+    for path, data in corpus.items():
+        provider.write_stream(path, pieces(data))
+    return time.perf_counter() - start
+
+def timed_read(provider, corpus):
+    start = time.perf_counter()
+    for path in corpus:
+        for _ in provider.read_stream(path):
+            pass
+    return time.perf_counter() - start
+
+def disk_usage(root: str) -> int:
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files)
+
+def run_benchmark():
+    corpus = make_corpus()
+    logical = sum(len(d) for d in corpus.values())
+    mib = logical / 1024 ** 2
+    print(f"--- DedupProvider vs LocalProvider ({len(corpus)} files, {mib:.0f} MiB logical) ---")
+
+    tmp = tempfile.mkdtemp()
+    try:
+        local = LocalProvider(os.path.join(tmp, "local"))
+        os.makedirs(local.root_path, exist_ok=True)
+        dedup = DedupProvider(os.path.join(tmp, "dedup"))
+
+        for label, provider, root in (("LocalProvider", local, local.root_path),
+                                      ("DedupProvider", dedup, dedup.store_path)):
+            write = timed_write(provider, corpus)
+            read = timed_read(provider, corpus)
+            print(f"{label}: write {mib / write:.1f} MiB/s, read {mib / read:.1f} MiB/s, "
+                  f"on disk {disk_usage(root) / 1024 ** 2:.1f} MiB")
+
+        stats = dedup.stats()
+        print(f"Dedup ratio: {stats['dedup_ratio']}x ({stats['unique_chunks']} unique chunks, "
+              f"{stats['stored_bytes'] / 1024 ** 2:.1f} MiB stored)")
+
+        for path in [p for p in corpus if p.startswith("edited/")]:
+            dedup.delete(path)
+        start = time.perf_counter()
+        collected = dedup.gc()
+        print(f"GC after deleting edited files: {collected['chunks']} chunks "
+              f"({collected['bytes'] / 1024:.0f} KiB) freed in {time.perf_counter() - start:.3f}s")
+        dedup.close()
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    run_benchmark()
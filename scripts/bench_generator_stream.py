@@ -0,0 +1,57 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proxion_keyring.pod_proxy import GeneratorStream
+
+TOTAL = 64 * 1024 * 1024
+PROVIDER_CHUNK = 1024 * 1024
+
+class LegacyGeneratorStream:
+    """The previous bytes-concatenating implementation, kept for comparison."""
+    def __init__(self, gen):
+        self.gen = gen
+        self.buf = b""
+
+    def read(self, size=-1):
+        while len(self.buf) < size:
+            try:
+                self.buf += next(self.gen)
+            except StopIteration:
+                break
+        res = self.buf[:size]
+        self.buf = self.buf[size:]
+        return res
+
+def provider_chunks():
+    block = b"\xab" * PROVIDER_CHUNK
+    for _ in range(TOTAL // PROVIDER_CHUNK):
+        yield block
+
+def drain_read(stream, size):
+    while stream.read(size):
+        pass
+
+def drain_readinto(stream, size):
+    buf = bytearray(size)
+    while stream.readinto(buf):
+        pass
+
+def measure(label, factory, drain, size):
+    start = time.perf_counter()
+    drain(factory(), size)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {size // 1024:>3} KiB reads: {TOTAL / elapsed / 1e6:10.1f} MB/s")
+
+def run_benchmark():
+    print(f"--- GeneratorStream throughput ({TOTAL // (1024 * 1024)} MiB, {PROVIDER_CHUNK // 1024} KiB provider chunks) ---")
+    for size in (4 * 1024, 64 * 1024):
+        measure("legacy read()", lambda: LegacyGeneratorStream(provider_chunks()), drain_read, size)
+        measure("GeneratorStream.read()", lambda: GeneratorStream(provider_chunks()), drain_read, size)
+        measure("GeneratorStream.readinto()", lambda: GeneratorStream(provider_chunks()), drain_readinto, size)
+
+if __name__ == "__main__":
+    run_benchmark()
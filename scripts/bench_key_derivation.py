@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from proxion_keyring.core.keys import key_derivation
+
+ROUNDS = 20000
+
+def signing_key_inline(master_key):
+    """What Identity.get_signing_key did on every token mint and check."""
+    seed = master_key.private_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PrivateFormat.Raw,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b"proxion:token:signing")
+    key = hkdf.derive(seed)
+    master_key.public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw
+    ).hex()
+    return key
+
+def signing_key_memoized(master_key):
+    keys = key_derivation(master_key)
+    key = keys.derive(b"proxion:token:signing")
+    keys.public_key_hex
+    return key
+
+def run_benchmark():
+    master = ed25519.Ed25519PrivateKey.generate()
+    print(f"--- Signing key + public key hex, {ROUNDS} lookups ---")
+    for label, fn in (("inline HKDF", signing_key_inline), ("memoized", signing_key_memoized)):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            fn(master)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>12}: {elapsed:.3f}s ({elapsed / ROUNDS * 1e6:.1f} us/lookup)")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,40 @@
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proxion_keyring.core.permissions import compile_permissions
+
+CHECKS = 20000
+
+def allows_scan(permissions, action, resource):
+    """The linear scan require_capability / validate_request used to do."""
+    res_suffix = resource.split(":")[1] if ":" in resource else resource
+    for act, res in permissions:
+        if act == action or act == "*":
+            if res == resource or res == "*" or res == res_suffix:
+                return True
+    return False
+
+def run_benchmark():
+    for count in (1, 100, 1000):
+        permissions = [("READ", f"/share/{i}") for i in range(count)]
+        token = SimpleNamespace(permissions=permissions)
+        resource = f"/share/{count - 1}"
+        print(f"--- {count} permissions, {CHECKS} checks (worst case) ---")
+        start = time.perf_counter()
+        for _ in range(CHECKS):
+            allows_scan(permissions, "READ", resource)
+        scan = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(CHECKS):
+            compile_permissions(token).allows("READ", resource)
+        compiled = time.perf_counter() - start
+        print(f"{'linear scan':>14}: {scan / CHECKS * 1e6:.2f} us/check")
+        print(f"{'compiled set':>14}: {compiled / CHECKS * 1e6:.2f} us/check")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,52 @@
+import sys
+import os
+import time
+
+# Add project root (and the tests dir for the LDP stand-in) to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "tests"))
+
+import requests
+from ldp_server import LDPStandIn
+from proxion_keyring.ldp import parse_container
+from proxion_keyring.pod_proxy import RemoteProvider
+
+MEMBERS = 300
+LATENCY = 0.005
+
+def naive_listing(base_url: str):
+    """One connection per request, members HEADed one after another."""
+    resp = requests.get(base_url + "bench/", headers={"Accept": "text/turtle"})
+    attrs = {}
+    for url, _ in parse_container(resp.text, resp.headers["Content-Type"], resp.url):
+        head = requests.head(url, headers={"Connection": "close"})
+        attrs[url] = int(head.headers.get("Content-Length", 0))
+    return attrs
+
+def run_benchmark():
+    print(f"--- RemoteProvider listing ({MEMBERS} members, {LATENCY * 1000:.0f} ms server latency) ---")
+    for inline in (False, True):
+        server = LDPStandIn(inline_metadata=inline, latency=LATENCY).start()
+        for i in range(MEMBERS):
+            server.put(f"bench/file_{i:04d}.bin", b"x" * i)
+        label = "inline metadata" if inline else "bare listing"
+
+        start = time.perf_counter()
+        naive_listing(server.url)
+        naive = time.perf_counter() - start
+
+        provider = RemoteProvider("bench", server.url)
+        server.connections.clear()
+        start = time.perf_counter()
+        listing = provider.list_dir_with_attrs("bench")
+        pooled = time.perf_counter() - start
+        assert len(listing) == MEMBERS
+
+        print(f"{label:<16} naive: {naive:6.2f}s   RemoteProvider: {pooled:6.2f}s   "
+              f"connections: {len(server.connections)}")
+        provider.close()
+        server.stop()
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,43 @@
+import sys
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proxion_keyring.core.revocation import RevocationList
+
+REVOKED = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+LOOKUPS = 200_000
+
+def run_benchmark():
+    now = datetime.now(timezone.utc)
+    print(f"--- {REVOKED} revoked ids, {LOOKUPS} lookups ---")
+    tracemalloc.start()
+    crl = RevocationList(capacity=REVOKED)
+    start = time.perf_counter()
+    for i in range(REVOKED):
+        crl.revoke(f"jti-{i:012d}", now)
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{'revoke':>16}: {elapsed / REVOKED * 1e6:.2f} us/id, {memory / REVOKED:.0f} bytes/id")
+    for label, prefix in (("not revoked", "live-"), ("revoked", "jti-")):
+        ids = [f"{prefix}{i:012d}" for i in range(LOOKUPS)]
+        start = time.perf_counter()
+        for tid in ids:
+            crl.is_revoked(tid, now)
+        print(f"{label:>16}: {(time.perf_counter() - start) / LOOKUPS * 1e6:.2f} us/lookup")
+    start = time.perf_counter()
+    crl.snapshot()
+    full = time.perf_counter() - start
+    version = crl.version
+    crl.revoke("one-more", now)
+    start = time.perf_counter()
+    diff = crl.diff(version, crl.epoch)
+    print(f"{'snapshot':>16}: {full * 1e3:.1f} ms; diff of {len(diff.revoked)}: {(time.perf_counter() - start) * 1e6:.0f} us")
+
+if __name__ == "__main__":
+    run_benchmark()
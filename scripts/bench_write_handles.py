@@ -0,0 +1,40 @@
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proxion_keyring.pod_proxy import LocalProvider, WriteHandleCache
+
+FILE_SIZE = 64 * 1024 * 1024
+CHUNK = 64 * 1024
+FILES = 4
+
+def write_sequential(provider):
+    """FUSE-style upload: every file arrives as consecutive offset writes."""
+    data = os.urandom(CHUNK)
+    start = time.perf_counter()
+    for i in range(FILES):
+        for offset in range(0, FILE_SIZE, CHUNK):
+            provider.write(f"f{i}.bin", data, offset)
+    if provider.write_handles:
+        provider.write_handles.close_all()  # Include the deferred fsyncs
+    return time.perf_counter() - start
+
+def run_benchmark():
+    total_mib = FILES * FILE_SIZE / (1024 * 1024)
+    print(f"--- Sequential offset writes: {FILES} x {FILE_SIZE // (1024 * 1024)} MiB in {CHUNK // 1024} KiB chunks ---")
+    for label, handles in (("open per write", None), ("write-handle cache", WriteHandleCache())):
+        root = tempfile.mkdtemp()
+        try:
+            elapsed = write_sequential(LocalProvider(root, write_handles=handles))
+            opens = handles.opens if handles else FILES * (FILE_SIZE // CHUNK)
+            print(f"{label:>20}: {elapsed:.2f}s ({total_mib / elapsed:.0f} MiB/s, {opens} opens)")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    run_benchmark()
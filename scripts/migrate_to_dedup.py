@@ -0,0 +1,37 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proxion_keyring.pod_dedup import DedupProvider, migrate_local_root
+from proxion_keyring.pod_proxy import LocalProvider
+
+def migrate(source_root: str, store_path: str):
+    """Copy a plain stash directory into a dedup store; the source is not modified."""
+    if not os.path.isdir(source_root):
+        print(f"Error: Source {source_root} not found.")
+        return
+
+    print(f"--- Dedup Migration: {source_root} -> {store_path} ---")
+    target = DedupProvider(store_path)
+    start = time.perf_counter()
+    totals = migrate_local_root(LocalProvider(source_root), target,
+                                on_file=lambda path, size: print(f"  {path} ({size} bytes)"))
+    elapsed = time.perf_counter() - start
+    stats = target.stats()
+    target.close()
+
+    print(f"\nFiles migrated:  {totals['files']}")
+    print(f"Logical bytes:   {stats['logical_bytes']}")
+    print(f"Stored bytes:    {stats['stored_bytes']} in {stats['unique_chunks']} chunks")
+    print(f"Dedup ratio:     {stats['dedup_ratio']}x")
+    print(f"Throughput:      {totals['bytes'] / 1024 ** 2 / max(elapsed, 1e-9):.1f} MiB/s")
+    print('\nMount it with {"name": ..., "path": "%s", "backend": "dedup"} in stash_sources.' % store_path)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python scripts/migrate_to_dedup.py <local stash root> <dedup store dir>")
+        sys.exit(1)
+    migrate(sys.argv[1], sys.argv[2])
@@ -23,6 +23,9 @@ class MockHub:
             return {"st_mode": 0o40755}
         return {"st_mode": 0o100644, "proxion_status": "mock"}
 
+    def list_dir_with_attrs(self, path):
+        return [(e, self.get_attr(os.path.join(path, e).replace("\\", "/"))) for e in self.list_dir(path)]
+
 def test_debug():
     lens = Lens(data_dir=".")
     hub = MockHub()
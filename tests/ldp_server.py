@@ -0,0 +1,170 @@
+"""
+Stand-in Solid/LDP server for offline RemoteProvider tests and benchmarks.
+
+Serves an in-memory tree over HTTP/1.1 keep-alive: containers are paths
+ending in '/', listed as Turtle (or JSON-LD on request) with ldp:contains.
+`inline_metadata=False` omits member size/mtime from listings, forcing
+clients to HEAD each member; `latency` adds a per-request delay so
+connection reuse and fan-out show up in timings.
+"""
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+
+class LDPStandIn:
+    def __init__(self, inline_metadata: bool = True, latency: float = 0.0):
+        self.inline_metadata = inline_metadata
+        self.latency = latency
+        self.resources = {"/": (None, time.time())}  # path -> (bytes | None for containers, mtime)
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/"
+
+    def start(self) -> "LDPStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def put(self, path: str, data: bytes = None, mtime: float = None):
+        """Add a document (or a container when path ends in '/'), creating parents."""
+        path = "/" + path.lstrip("/")
+        with self._lock:
+            parts = path.rstrip("/").split("/")[1:-1]
+            for i in range(len(parts)):
+                parent = "/" + "/".join(parts[:i + 1]) + "/"
+                self.resources.setdefault(parent, (None, time.time()))
+            self.resources[path] = (None if path.endswith("/") else (data or b""), mtime or time.time())
+
+    def _children(self, container: str):
+        depth = container.count("/")
+        return sorted(p for p in self.resources
+                      if p != container and p.startswith(container) and p.rstrip("/").count("/") == depth)
+
+    def _listing(self, container: str, as_json: bool) -> bytes:
+        children = self._children(container)
+        if as_json:
+            graph = [{"@id": "", "@type": ["http://www.w3.org/ns/ldp#BasicContainer"],
+                      "http://www.w3.org/ns/ldp#contains": [{"@id": quote(c[len(container):])} for c in children]}]
+            if self.inline_metadata:
+                for c in children:
+                    data, mtime = self.resources[c]
+                    graph.append({"@id": quote(c[len(container):]),
+                                  "http://www.w3.org/ns/posix/stat#size": len(data or b""),
+                                  "http://www.w3.org/ns/posix/stat#mtime": int(mtime)})
+            return json.dumps({"@graph": graph}).encode()
+
+        lines = ["@prefix ldp: <http://www.w3.org/ns/ldp#>.",
+                 "@prefix posix: <http://www.w3.org/ns/posix/stat#>.", ""]
+        members = ", ".join(f"<{quote(c[len(container):])}>" for c in children)
+        lines.append("<> a ldp:Container, ldp:BasicContainer" + (f";\n    ldp:contains {members}." if members else "."))
+        if self.inline_metadata:
+            for c in children:
+                data, mtime = self.resources[c]
+                kind = "ldp:BasicContainer" if data is None else "ldp:Resource"
+                lines.append(f"<{quote(c[len(container):])}> a {kind}; posix:size {len(data or b'')}; posix:mtime {int(mtime)}.")
+        return "\n".join(lines).encode()
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _path(self):
+                return unquote(urlsplit(self.path).path)
+
+            def _record(self):
+                with fixture._lock:
+                    fixture.requests.append((self.command, self._path()))
+                    fixture.connections.add(self.client_address)
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+
+            def _send(self, status, body=b"", headers=None, head=False):
+                self.send_response(status)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+
+            def _resource(self, head=False):
+                self._record()
+                path = self._path()
+                if path not in fixture.resources:
+                    return self._send(404, head=head)
+                data, mtime = fixture.resources[path]
+                headers = {"Last-Modified": formatdate(mtime, usegmt=True)}
+                if data is None:
+                    as_json = "json" in self.headers.get("Accept", "") and "turtle" not in self.headers.get("Accept", "")
+                    headers["Content-Type"] = "application/ld+json" if as_json else "text/turtle"
+                    headers["Link"] = '<http://www.w3.org/ns/ldp#BasicContainer>; rel="type"'
+                    return self._send(200, fixture._listing(path, as_json), headers, head)
+                headers["Content-Type"] = "application/octet-stream"
+                rng = self.headers.get("Range", "")
+                if rng.startswith("bytes=") and not head:
+                    start, _, end = rng[6:].partition("-")
+                    start, end = int(start), min(int(end or len(data) - 1), len(data) - 1)
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                    return self._send(206, data[start:end + 1], headers)
+                if head:
+                    self.send_response(200)
+                    for k, v in headers.items():
+                        self.send_header(k, v)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    return
+                return self._send(200, data, headers)
+
+            def do_GET(self):
+                self._resource()
+
+            def do_HEAD(self):
+                self._resource(head=True)
+
+            def do_PUT(self):
+                self._record()
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    body = bytearray()
+                    while True:
+                        size = int(self.rfile.readline().strip(), 16)
+                        if not size:
+                            self.rfile.readline()
+                            break
+                        body += self.rfile.read(size)
+                        self.rfile.readline()
+                    body = bytes(body)
+                else:
+                    body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                path = self._path()
+                existed = path in fixture.resources
+                fixture.put(path, body)
+                self._send(204 if existed else 201)
+
+            def do_DELETE(self):
+                self._record()
+                path = self._path()
+                with fixture._lock:
+                    if path not in fixture.resources or (path.endswith("/") and fixture._children(path)):
+                        return self._send(404 if path not in fixture.resources else 409)
+                    del fixture.resources[path]
+                self._send(204)
+
+        return Handler
@@ -0,0 +1,106 @@
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from proxion_keyring.core.caveats import (
+    CaveatRegistry, CompiledCaveat, MethodSet, PathPrefix, Unsatisfiable, request_facts,
+)
+from proxion_keyring.core.identity import Identity
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+def ctx(action="READ", resource="/docs/a.txt", now=NOW):
+    return SimpleNamespace(action=action, resource=resource, now=now)
+
+class TestCaveatRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = CaveatRegistry()
+
+    def check(self, caveat_id, context=None, **facts):
+        with request_facts(**facts):
+            return self.registry.compile(caveat_id).check(context or ctx(), "t1")
+
+    def test_path_prefix_is_segment_aware(self):
+        self.assertTrue(self.check("path_prefix:/docs", ctx(resource="/docs/a.txt")))
+        self.assertTrue(self.check("path_prefix:/docs/", ctx(resource="/docs")))
+        self.assertFalse(self.check("path_prefix:/docs", ctx(resource="/docsX/a.txt")))
+        self.assertTrue(self.check("path_prefix:/", ctx(resource="/anything")))
+
+    def test_time_window(self):
+        self.assertTrue(self.check("time_window:2026-06-01T00:00:00Z/2026-06-02T00:00:00Z"))
+        self.assertFalse(self.check("time_window:2026-06-01T13:00:00Z/"))
+        self.assertFalse(self.check("time_window:/2026-06-01T12:00:00+00:00"))
+
+    def test_source_cidr_and_methods_use_request_facts(self):
+        self.assertTrue(self.check("source_cidr:10.0.0.0/8,fd00::/8", source_ip="10.1.2.3"))
+        self.assertTrue(self.check("source_cidr:10.0.0.0/8,fd00::/8", source_ip="fd00::1"))
+        self.assertFalse(self.check("source_cidr:10.0.0.0/8", source_ip="192.168.1.1"))
+        self.assertFalse(self.check("source_cidr:10.0.0.0/8"))  # No source: fail closed
+        self.assertTrue(self.check("methods:GET,HEAD", method="get"))
+        self.assertFalse(self.check("methods:GET,HEAD", method="PUT"))
+        self.assertTrue(self.check("methods:READ"))
+
+    def test_byte_quota_admits_what_fits_and_charges_after(self):
+        write = ctx(action="WRITE")
+        self.assertTrue(self.check("byte_quota:100", write, size=60))
+        self.assertEqual(self.registry.usage.used("t1", "byte_quota:100"), 0)  # Checking is free
+        self.registry.charge("t1", ["path_prefix:/docs", "byte_quota:100"], 60)
+        self.assertFalse(self.check("byte_quota:100", write, size=60))
+        self.assertTrue(self.check("byte_quota:100", write, size=40))
+        self.assertTrue(self.check("byte_quota:100", write))  # Unknown size while quota remains
+        self.registry.charge("t1", ["byte_quota:100"], 40)
+        self.assertFalse(self.check("byte_quota:100", write))
+        self.assertTrue(self.check("byte_quota:100", ctx(action="READ"), size=60))  # Reads are not limited
+
+    def test_unknown_and_malformed_fail_closed(self):
+        for caveat_id in ("bogus:1", "byte_quota:lots", "source_cidr:nope", "time_window:soon", None):
+            self.assertIsInstance(self.registry.compile(caveat_id), Unsatisfiable)
+            self.assertFalse(self.check(caveat_id))
+
+    def test_compiled_once_and_ordered_by_cost(self):
+        self.assertIs(self.registry.compile("methods:GET"), self.registry.compile("methods:GET"))
+        compiled = self.registry.compile_all(["byte_quota:10", "path_prefix:/docs", "methods:READ"])
+        self.assertEqual([type(c) for c in compiled[:2]], [MethodSet, PathPrefix])
+        with self.assertRaises(TypeError):
+            CompiledCaveat("x")  # check() is abstract
+
+class TestIdentityCaveats(unittest.TestCase):
+    def test_validate_token_enforces_caveats(self):
+        identity = Identity(ed25519.Ed25519PrivateKey.generate())
+        token_json = json.dumps({
+            "token_id": "pod-cav",
+            "permissions": [["READ", "/stash/shared/a"], ["READ", "/stash/other"]],
+            "caveats": ["source_cidr:127.0.0.0/8", "path_prefix:/stash/shared"],
+            "exp": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+            "aud": identity.get_public_key_hex(),
+            "holder_key_fingerprint": "fp",
+            "signature": "sig",
+        })
+        local = {"action": "READ", "resource": "/stash/shared/a", "source_ip": "127.0.0.1"}
+        self.assertTrue(identity.validate_token(token_json, local, {}).allowed)
+        self.assertFalse(identity.validate_token(token_json, dict(local, resource="/stash/other"), {}).allowed)
+        self.assertFalse(identity.validate_token(token_json, dict(local, source_ip="10.0.0.1"), {}).allowed)
+
+    def test_quota_is_charged_by_the_caller(self):
+        identity = Identity(ed25519.Ed25519PrivateKey.generate())
+        token_json = json.dumps({
+            "token_id": "pod-quota",
+            "permissions": [["WRITE", "/stash/q"]],
+            "caveats": ["byte_quota:10"],
+            "exp": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+            "aud": identity.get_public_key_hex(),
+            "holder_key_fingerprint": "fp",
+            "signature": "sig",
+        })
+        write = {"action": "WRITE", "resource": "/stash/q", "size": 8}
+        self.assertTrue(identity.validate_token(token_json, write, {}).allowed)
+        self.assertTrue(identity.validate_token(token_json, write, {}).allowed)  # Nothing charged yet
+        identity.charge_quota(token_json, 8)
+        self.assertFalse(identity.validate_token(token_json, write, {}).allowed)
+        self.assertTrue(identity.validate_token(token_json, dict(write, size=2), {}).allowed)
+
+if __name__ == "__main__":
+    unittest.main()
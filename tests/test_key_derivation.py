@@ -0,0 +1,96 @@
+import unittest
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from proxion_keyring.core import keys
+from proxion_keyring.core.identity import Identity
+from proxion_keyring.core.keys import KeyDerivation, key_derivation
+from proxion_keyring.identity import derive_app_password, derive_child_key
+
+def hkdf(master_key, info, length=32):
+    seed = master_key.private_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PrivateFormat.Raw,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    return HKDF(algorithm=hashes.SHA256(), length=length, salt=None, info=info).derive(seed)
+
+class TestKeyDerivation(unittest.TestCase):
+    def setUp(self):
+        self.master = ed25519.Ed25519PrivateKey.generate()
+        self.keys = KeyDerivation(self.master)
+
+    def test_matches_plain_hkdf(self):
+        self.assertEqual(self.keys.derive(b"proxion:token:signing"), hkdf(self.master, b"proxion:token:signing"))
+        self.assertEqual(self.keys.derive(b"app:password:x", 16), hkdf(self.master, b"app:password:x", 16))
+        raw = self.master.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        self.assertEqual(self.keys.public_key_hex, raw.hex())
+
+    def test_memoizes_and_invalidates(self):
+        self.keys.derive(b"a")
+        self.keys.derive(b"b")
+        held = self.keys._derived[(b"a", 32)]
+        self.keys.invalidate(b"a")
+        self.assertEqual(held, bytearray(32))  # Zeroized in place
+        self.assertEqual(list(self.keys._derived), [(b"b", 32)])
+        self.assertEqual(self.keys.derive(b"a"), hkdf(self.master, b"a"))
+
+    def test_rotate_wipes_and_runs_hooks(self):
+        calls = []
+        self.keys.on_rotate(lambda: calls.append(1))
+        self.keys.derive(b"a")
+        seed, held = self.keys._seed, self.keys._derived[(b"a", 32)]
+        new = ed25519.Ed25519PrivateKey.generate()
+        self.keys.rotate(new)
+        self.assertEqual(calls, [1])
+        self.assertEqual(seed, bytearray(32))
+        self.assertEqual(held, bytearray(32))
+        self.assertEqual(self.keys.derive(b"a"), hkdf(new, b"a"))
+
+class TestSharedDerivation(unittest.TestCase):
+    def test_shared_per_master_key(self):
+        master = ed25519.Ed25519PrivateKey.generate()
+        self.assertIs(key_derivation(master), key_derivation(master))
+        self.assertEqual(derive_app_password(master, "adguard"), hkdf(master, b"app:password:adguard", 16).hex()[:16])
+        child = derive_child_key(master, "mesh:peer")
+        self.assertEqual(child.private_bytes(serialization.Encoding.Raw, serialization.PrivateFormat.Raw,
+                                             serialization.NoEncryption()), hkdf(master, b"mesh:peer"))
+
+    def test_eviction_wipes_service(self):
+        first = key_derivation(ed25519.Ed25519PrivateKey.generate())
+        first.derive(b"a")
+        held = first._derived[(b"a", 32)]
+        for _ in range(keys._MAX_SERVICES):
+            key_derivation(ed25519.Ed25519PrivateKey.generate())
+        self.assertEqual(held, bytearray(32))
+        with self.assertRaises(RuntimeError):
+            first.derive(b"a")
+
+    def test_reloaded_keys_cannot_evict_identity(self):
+        raw = ed25519.Ed25519PrivateKey.generate().private_bytes(
+            serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption())
+        identity = Identity(ed25519.Ed25519PrivateKey.from_private_bytes(raw))
+        signing = identity.get_signing_key()
+        # A reloaded copy of the same key shares the identity's service
+        reloaded = ed25519.Ed25519PrivateKey.from_private_bytes(raw)
+        self.assertIs(key_derivation(reloaded), identity.keys)
+        for _ in range(keys._MAX_SERVICES * 2):
+            key_derivation(ed25519.Ed25519PrivateKey.generate())
+        self.assertEqual(identity.get_signing_key(), signing)
+        self.assertEqual(signing, hkdf(reloaded, b"proxion:token:signing"))
+
+    def test_identity_rotation_clears_token_cache(self):
+        identity = Identity(ed25519.Ed25519PrivateKey.generate())
+        old = identity.get_signing_key()
+        identity.token_cache._entries["x"] = (object(), float("inf"))
+        new = ed25519.Ed25519PrivateKey.generate()
+        identity.rotate(new)
+        self.assertEqual(identity.token_cache.stats()["entries"], 0)
+        self.assertNotEqual(identity.get_signing_key(), old)
+        self.assertEqual(identity.get_signing_key(), hkdf(new, b"proxion:token:signing"))
+        self.assertIs(key_derivation(new), identity.keys)
+
+if __name__ == "__main__":
+    unittest.main()
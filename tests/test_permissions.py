@@ -0,0 +1,47 @@
+import unittest
+from types import SimpleNamespace
+
+from proxion_keyring.core.permissions import PermissionSet, compile_permissions
+
+class TestPermissionSet(unittest.TestCase):
+    def test_exact_and_wildcards(self):
+        perms = PermissionSet([("read", "system:host"), ("manage", "*"), ("*", "fortress:stash")])
+        self.assertTrue(perms.allows("read", "system:host"))
+        self.assertFalse(perms.allows("read", "system:suite"))
+        self.assertTrue(perms.allows("manage", "anything"))
+        self.assertTrue(perms.allows("search", "fortress:stash"))
+        self.assertFalse(perms.allows("search", "fortress:perimeter"))
+        self.assertTrue(PermissionSet([("*", "*")]).allows("x", "y"))
+
+    def test_resource_suffix(self):
+        perms = PermissionSet([("connect", "wg0")])
+        self.assertTrue(perms.allows("connect", "rs:wg0"))
+        self.assertFalse(perms.allows("connect", "rs:wg1"))
+
+    def test_matches_validate_request(self):
+        # /pod authorizes with validate_request's scan; "/*" is not a prefix grant there
+        perms = PermissionSet([("READ", "/docs/*"), ("READ", "/notes.txt"), ("WRITE", "b")])
+        self.assertTrue(perms.allows("READ", "/docs/*"))
+        self.assertFalse(perms.allows("READ", "/docs/a/b.txt"))
+        self.assertFalse(perms.allows("READ", "/notes.txt/x"))
+        self.assertTrue(perms.allows("WRITE", "a:b:c"))
+        self.assertFalse(perms.allows("WRITE", "a:x:c"))
+        self.assertFalse(perms.allows("WRITE", "b:c"))
+
+    def test_many_delegated_permissions(self):
+        perms = PermissionSet([("READ", f"/share/{i}") for i in range(500)] + [("WRITE", f"/f{i}") for i in range(500)])
+        self.assertTrue(perms.allows("READ", "/share/499"))
+        self.assertTrue(perms.allows("WRITE", "/f250"))
+        self.assertFalse(perms.allows("WRITE", "/share/1/x"))
+        self.assertTrue(perms.has_action("WRITE"))
+        self.assertFalse(perms.has_action("*"))
+
+    def test_compiled_once_per_token(self):
+        token = SimpleNamespace(permissions=[("read", "a")])
+        compiled = compile_permissions(token)
+        self.assertIs(compile_permissions(token), compiled)
+        token.permissions = [("read", "b")]
+        self.assertTrue(compile_permissions(token).allows("read", "b"))
+
+if __name__ == "__main__":
+    unittest.main()
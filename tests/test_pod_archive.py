@@ -0,0 +1,135 @@
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from proxion_keyring.pod_archive import ArchiveError, ArchiveExporter, ArchiveImporter
+from proxion_keyring.pod_proxy import HybridHub, LocalProvider
+
+class TestPodArchives(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "docs", "sub"))
+        self.files = {"docs/a.txt": b"A" * 1000, "docs/sub/b.bin": os.urandom(300000), "docs/empty.txt": b""}
+        for name, data in self.files.items():
+            with open(os.path.join(self.root, name), "wb") as f:
+                f.write(data)
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", LocalProvider(self.root))
+        self.exporter = ArchiveExporter(self.hub)
+        self.importer = ArchiveImporter(self.hub, workers=4, buffer_limit=64 * 1024)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _export(self, kind):
+        return b"".join(self.exporter.stream("stash/docs", kind))
+
+    def _assert_copied(self, target):
+        for name, data in self.files.items():
+            copied = os.path.join(self.root, target, os.path.relpath(name, "docs"))
+            with open(copied, "rb") as f:
+                self.assertEqual(f.read(), data)
+
+    def test_tar_round_trip(self):
+        body = self._export("tar")
+        with tarfile.open(fileobj=io.BytesIO(body)) as tar:
+            self.assertEqual(tar.getnames(), ["a.txt", "empty.txt", "sub", "sub/b.bin"])
+        result = self.importer.extract("stash/copy", "tar", io.BytesIO(body))
+        self.assertEqual(result, {"files": 3, "directories": 1, "bytes": 301000})
+        self._assert_copied("copy")
+
+    def test_zip_round_trip(self):
+        body = self._export("zip")
+        with zipfile.ZipFile(io.BytesIO(body)) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.namelist(), ["a.txt", "empty.txt", "sub/", "sub/b.bin"])
+        self.importer.extract("stash/copy", "zip", io.BytesIO(body))
+        self._assert_copied("copy")
+
+    def test_export_is_a_stream(self):
+        chunks = list(self.exporter.stream("stash/docs", "tar"))
+        self.assertLess(max(len(c) for c in chunks), 300000)
+
+    def test_unsafe_members_rejected(self):
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tar:
+            info = tarfile.TarInfo("../escape.txt")
+            info.size = 1
+            tar.addfile(info, io.BytesIO(b"x"))
+        with self.assertRaises(ArchiveError):
+            self.importer.extract("stash/copy", "tar", io.BytesIO(buf.getvalue()))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "escape.txt")))
+
+    def test_unsafe_member_rejected_before_anything_is_written(self):
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tar:
+            for name in ("first.txt", "../escape.txt"):
+                info = tarfile.TarInfo(name)
+                info.size = 1
+                tar.addfile(info, io.BytesIO(b"x"))
+        with self.assertRaises(ArchiveError):
+            self.importer.extract("stash/copy", "tar", io.BytesIO(buf.getvalue()))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "copy")))
+
+    def test_members_are_authorized(self):
+        checked = []
+
+        def authorize(action, path, size):
+            checked.append((action, path))
+            return not path.startswith("stash/docs/sub")
+
+        body = b"".join(self.exporter.stream("stash/docs", "tar", authorize))
+        self.assertEqual(sorted(tarfile.open(fileobj=io.BytesIO(body)).getnames()), ["a.txt", "empty.txt"])
+
+        os.makedirs(os.path.join(self.root, "copy"))
+        with open(os.path.join(self.root, "copy", "a.txt"), "wb") as f:
+            f.write(b"old")
+        checked.clear()
+        with self.assertRaises(ArchiveError) as raised:
+            self.importer.extract("stash/copy", "tar", io.BytesIO(self._export("tar")),
+                                  lambda action, path, size: authorize(action, path, size) and action != "WRITE")
+        self.assertEqual(raised.exception.status, 403)
+        self.assertEqual(raised.exception.details["denied"], ["stash/copy/a.txt"])
+        self.assertIn(("CREATE", "stash/copy/sub/b.bin"), checked)
+        with open(os.path.join(self.root, "copy", "a.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"old")
+        self.assertFalse(os.path.exists(os.path.join(self.root, "copy", "sub")))
+
+    def test_member_sizes_accumulate_for_quotas(self):
+        sizes = {}
+
+        def authorize(action, path, size):
+            sizes[path] = size
+            return size is None or size <= 300500  # Every file fits alone, not all of them together
+
+        with self.assertRaises(ArchiveError) as raised:
+            self.importer.extract("stash/copy", "tar", io.BytesIO(self._export("tar")), authorize)
+        self.assertEqual(raised.exception.details["denied"], ["stash/copy/sub/b.bin"])
+        self.assertIsNone(sizes["stash/copy/sub"])
+        self.assertEqual(max(s for s in sizes.values() if s is not None), 301000)
+        self.assertFalse(os.path.exists(os.path.join(self.root, "copy")))
+
+    def test_links_are_skipped(self):
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tar:
+            link = tarfile.TarInfo("passwd")
+            link.type = tarfile.SYMTYPE
+            link.linkname = "/etc/passwd"
+            tar.addfile(link)
+        result = self.importer.extract("stash/copy", "tar", io.BytesIO(buf.getvalue()))
+        self.assertEqual(result["files"], 0)
+        self.assertFalse(os.path.lexists(os.path.join(self.root, "copy", "passwd")))
+
+    def test_gzipped_tar_import(self):
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+            tar.add(os.path.join(self.root, "docs"), arcname=".")
+        self.importer.extract("stash/copy", "tar", io.BytesIO(buf.getvalue()))
+        self._assert_copied("copy")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import base64
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from flask import Flask
+
+from proxion_keyring.core.identity import Identity
+from proxion_keyring.pod_batch import BatchError, BatchExecutor, encode_multipart, encode_ndjson
+from proxion_keyring.pod_proxy import HybridHub, LocalProvider, PodProxyServer
+
+class TestBatchExecutor(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "thumbs"))
+        for i in range(4):
+            with open(os.path.join(self.root, "thumbs", f"{i}.jpg"), "wb") as f:
+                f.write(bytes([i]) * 10)
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", LocalProvider(self.root))
+        self.batch = BatchExecutor(self.hub, workers=4, max_body=64)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _run(self, ops, denied=None):
+        return {r["index"]: r for r in self.batch.run(self.batch.parse({"operations": ops}), denied or {})}
+
+    def test_mixed_operations(self):
+        results = self._run([
+            {"op": "get", "path": "stash/thumbs/1.jpg", "id": "t1"},
+            {"op": "attr", "path": "stash/thumbs"},
+            {"op": "put", "path": "stash/new/a.txt", "body": base64.b64encode(b"hi").decode()},
+            {"op": "mkdir", "path": "stash/albums"},
+            {"op": "delete", "path": "stash/thumbs/3.jpg"},
+            {"op": "get", "path": "stash/missing.jpg"},
+        ])
+        self.assertEqual(results[0]["body"], b"\x01" * 10)
+        self.assertEqual(results[0]["id"], "t1")
+        self.assertTrue(results[1]["attr"]["st_mode"] & 0o40000)
+        self.assertEqual([results[i]["status"] for i in range(6)], [200, 200, 201, 201, 204, 404])
+        with open(os.path.join(self.root, "new", "a.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"hi")
+        self.assertTrue(os.path.isdir(os.path.join(self.root, "albums")))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "thumbs", "3.jpg")))
+
+    def test_related_paths_run_in_submission_order(self):
+        b64 = lambda data: base64.b64encode(data).decode()
+        ops = self.batch.parse({"operations": [
+            {"op": "mkdir", "path": "stash/docs"},
+            {"op": "put", "path": "stash/docs/a.txt", "body": b64(b"one")},
+            {"op": "attr", "path": "stash/thumbs/0.jpg"},
+            {"op": "delete", "path": "stash/docs/a.txt"},
+            {"op": "put", "path": "stash/docs/a.txt", "body": b64(b"two")},
+            {"op": "get", "path": "stash/docs"},
+        ]})
+        chains = sorted([op.index for op in chain] for chain in BatchExecutor._chains(ops))
+        self.assertEqual(chains, [[0, 1, 3, 4, 5], [2]])
+        for _ in range(20):
+            results = {r["index"]: r for r in self.batch.run(ops, {})}
+            self.assertEqual([results[i]["status"] for i in range(6)], [201, 201, 200, 204, 201, 200])
+            self.assertEqual(results[5]["entries"], ["a.txt"])
+            self.hub.delete("stash/docs/a.txt")
+            self.hub.delete("stash/docs")
+
+    def test_denied_operations_never_run(self):
+        results = self._run([{"op": "delete", "path": "stash/thumbs/0.jpg"}, {"op": "attr", "path": "stash/thumbs/0.jpg"}],
+                            denied={0: "Insufficient permissions"})
+        self.assertEqual(results[0]["status"], 403)
+        self.assertEqual(results[1]["status"], 200)
+        self.assertTrue(os.path.exists(os.path.join(self.root, "thumbs", "0.jpg")))
+
+    def test_large_bodies_are_refused(self):
+        with open(os.path.join(self.root, "big.bin"), "wb") as f:
+            f.write(b"x" * 100)
+        self.assertEqual(self._run([{"op": "get", "path": "stash/big.bin"}])[0]["status"], 413)
+
+    def test_malformed_payloads(self):
+        for payload in (None, {"operations": "x"}, [{"op": "chmod", "path": "a"}], [{"op": "put", "path": "a", "body": "!!"}]):
+            with self.assertRaises(BatchError):
+                self.batch.parse(payload)
+        with self.assertRaises(BatchError) as ctx:
+            self.batch.parse([{"op": "attr", "path": "a"}] * (BatchExecutor.MAX_OPERATIONS + 1))
+        self.assertEqual(ctx.exception.status, 413)
+
+    def test_encodings(self):
+        ops = self.batch.parse([{"op": "get", "path": "stash/thumbs/2.jpg"}])
+        line = b"".join(encode_ndjson(self.batch.run(ops, {})))
+        self.assertIn(base64.b64encode(b"\x02" * 10), line)
+        self.assertTrue(line.endswith(b"\n"))
+        body = b"".join(encode_multipart(self.batch.run(ops, {}), "b0"))
+        self.assertIn(b"Content-Type: application/octet-stream\r\nContent-ID: <0>\r\nX-Status: 200\r\n", body)
+        self.assertIn(b"\r\n\r\n" + b"\x02" * 10 + b"\r\n--b0--\r\n", body)
+
+class TestBatchAuthorization(unittest.TestCase):
+    def test_quota_covers_the_whole_batch(self):
+        identity = Identity(ed25519.Ed25519PrivateKey.generate())
+        token_json = json.dumps({
+            "token_id": "batch-quota",
+            "permissions": [["WRITE", "/stash"]],
+            "caveats": ["byte_quota:25"],
+            "exp": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+            "aud": identity.get_public_key_hex(),
+            "holder_key_fingerprint": "fp",
+            "signature": "sig",
+        })
+        # Authorization only needs the manager and the request context
+        server = PodProxyServer.__new__(PodProxyServer)
+        server.manager = identity
+        ops = BatchExecutor(None).parse([
+            {"op": "put", "path": "stash", "body": base64.b64encode(b"x" * 10).decode()} for _ in range(4)
+        ])
+        with Flask(__name__).test_request_context("/pod/_batch", method="POST"):
+            denied = server._authorize_batch(token_json, {}, ops)
+        # Each put fits the quota alone, but only the first two fit together
+        self.assertEqual(sorted(denied), [2, 3])
+
+if __name__ == "__main__":
+    unittest.main()
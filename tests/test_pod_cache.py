@@ -0,0 +1,107 @@
+import shutil
+import tempfile
+import unittest
+
+from ldp_server import LDPStandIn
+
+from proxion_keyring.pod_cache import BlockCache
+from proxion_keyring.pod_proxy import CachingProvider, RemoteProvider
+
+class TestBlockCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = BlockCache(self.dir, budget=40, block_size=16)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_partial_fill_extends_prefix(self):
+        self.cache.fills("k", "v1", 32, 0, 1)
+        self.assertTrue(self.cache.append("k", "v1", 0, 0, b"abcd"))
+        # Gaps are refused, overlaps are trimmed
+        self.assertFalse(self.cache.append("k", "v1", 0, 8, b"ij"))
+        self.assertTrue(self.cache.append("k", "v1", 0, 2, b"cdef"))
+        self.assertEqual(self.cache.fills("k", "v1", 32, 0, 1), {0: 6})
+        self.assertEqual(self.cache.read("k", 0, 1, 6), b"bcdef")
+        self.assertEqual(self.cache.status("k", "v1", 32), "partial")
+
+    def test_version_change_drops_blocks(self):
+        self.cache.fills("k", "v1", 16, 0, 0)
+        self.cache.append("k", "v1", 0, 0, b"x" * 16)
+        self.assertEqual(self.cache.status("k", "v1", 16), "cached")
+        self.assertEqual(self.cache.fills("k", "v2", 16, 0, 0), {})
+        self.assertIsNone(self.cache.status("k", "v2", 16))
+        self.assertEqual(self.cache.used, 0)
+
+    def test_lru_eviction_under_budget(self):
+        for key in ("a", "b", "c"):
+            self.cache.fills(key, "v", 16, 0, 0)
+            self.cache.append(key, "v", 0, 0, b"x" * 16)
+            if key == "b":
+                self.cache.read("a", 0, 0, 1)  # a is now more recent than b
+        self.assertLessEqual(self.cache.used, 40)
+        self.assertEqual(self.cache.status("a", "v", 16), "cached")
+        self.assertIsNone(self.cache.status("b", "v", 16))
+
+    def test_eviction_runs_down_to_target(self):
+        self.cache.budget = 100
+        for i in range(7):
+            self.cache.fills(str(i), "v", 16, 0, 0)
+            self.cache.append(str(i), "v", 0, 0, b"x" * 16)
+        # 112 bytes > 100: evicted in one pass to <= 90, leaving room for the next block
+        self.assertEqual(self.cache.used, 80)
+        self.assertIsNone(self.cache.status("1", "v", 16))
+        self.assertEqual(self.cache.status("2", "v", 16), "cached")
+
+    def test_block_shorter_than_index_is_rewritten(self):
+        self.cache.fills("k", "v", 16, 0, 0)
+        self.cache.append("k", "v", 0, 0, b"abcdefgh")
+        # Simulate a crash that lost unsynced block bytes but kept the index row
+        with open(self.cache._block_path("k", 0), "r+b") as f:
+            f.truncate(3)
+        self.assertIsNone(self.cache.read("k", 0, 0, 8))
+        self.assertTrue(self.cache.append("k", "v", 0, 0, b"abcdefgh"))
+        self.assertEqual(self.cache.read("k", 0, 0, 8), b"abcdefgh")
+        self.assertEqual(self.cache.used, 8)
+
+class TestCachingProvider(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.server = LDPStandIn().start()
+        self.data = bytes(range(256)) * 40  # 10240 bytes
+        self.server.put("media/clip.bin", self.data, mtime=1700000000)
+        self.cache = BlockCache(self.dir, budget=1 << 20, block_size=4096)
+        self.provider = CachingProvider("remote", RemoteProvider("remote", self.server.url), self.cache)
+
+    def tearDown(self):
+        self.provider.close()
+        self.cache.close()
+        self.server.stop()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _gets(self):
+        return [r for r in self.server.requests if r[0] == "GET"]
+
+    def test_range_then_full_read_fetches_each_byte_once(self):
+        self.assertEqual(self.provider.get_attr("media/clip.bin")["proxion_status"], "cloud-only")
+        self.assertEqual(b"".join(self.provider.read_range("media/clip.bin", 5000, 100)), self.data[5000:5100])
+        self.assertEqual(self.provider.get_attr("media/clip.bin")["proxion_status"], "partial")
+        self.assertEqual(b"".join(self.provider.read_stream("media/clip.bin")), self.data)
+        self.assertEqual(self.provider.get_attr("media/clip.bin")["proxion_status"], "cached")
+        gets = len(self._gets())
+        self.assertEqual(b"".join(self.provider.read_range("media/clip.bin", 100, 9000)), self.data[100:9100])
+        self.assertEqual(len(self._gets()), gets)
+
+    def test_listing_reports_cache_state(self):
+        b"".join(self.provider.read_stream("media/clip.bin"))
+        listing = dict(self.provider.list_dir_with_attrs("media"))
+        self.assertEqual(listing["clip.bin"]["proxion_status"], "cached")
+
+    def test_write_invalidates(self):
+        b"".join(self.provider.read_stream("media/clip.bin"))
+        self.provider.write_stream("media/clip.bin", iter([b"new"]))
+        self.assertEqual(b"".join(self.provider.read_stream("media/clip.bin")), b"new")
+
+if __name__ == '__main__':
+    unittest.main()
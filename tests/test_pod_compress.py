@@ -0,0 +1,145 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from proxion_keyring.pod_compress import CompressedLocalProvider, SeekableFormat
+from proxion_keyring.pod_pool import PooledProvider
+
+class TestCompressedLocalProvider(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.provider = CompressedLocalProvider(self.root, codec="zlib", frame_size=4096)
+        self.text = b"".join(b"line %06d of a very compressible note\n" % i for i in range(2000))
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _disk(self, name):
+        with open(os.path.join(self.root, name), "rb") as f:
+            return f.read()
+
+    def test_text_is_compressed_and_reports_logical_size(self):
+        self.provider.write_stream("notes/a.txt", iter([self.text]))
+        self.assertTrue(self._disk("notes/a.txt").startswith(SeekableFormat.MAGIC))
+        self.assertLess(len(self._disk("notes/a.txt")), len(self.text) // 4)
+        self.assertEqual(self.provider.get_attr("notes/a.txt")["st_size"], len(self.text))
+        self.assertEqual(dict(self.provider.list_dir_with_attrs("notes"))["a.txt"]["st_size"], len(self.text))
+        self.assertEqual(b"".join(self.provider.read_stream("notes/a.txt")), self.text)
+        self.assertIsNone(self.provider.open_file("notes/a.txt"))
+
+    def test_range_reads_cross_frames(self):
+        self.provider.write_stream("a.txt", iter([self.text]))
+        for start, length in ((0, 10), (4090, 20), (10000, 9000), (len(self.text) - 3, 50)):
+            self.assertEqual(b"".join(self.provider.read_range("a.txt", start, length)),
+                             self.text[start:start + length])
+
+    def test_offset_writes_patch_frames(self):
+        self.provider.write_stream("a.txt", iter([self.text]))
+        expected = bytearray(self.text)
+        expected[5000:5010] = b"X" * 10
+        self.provider.write("a.txt", b"X" * 10, offset=5000)
+        expected += b"\0" * 100 + b"tail"
+        self.provider.write("a.txt", b"tail", offset=len(self.text) + 100)
+        self.assertEqual(b"".join(self.provider.read_stream("a.txt")), bytes(expected))
+        self.assertEqual(self.provider.get_attr("a.txt")["st_size"], len(expected))
+
+    def test_appends_leave_earlier_frames_in_place(self):
+        self.provider.write_stream("a.txt", iter([self.text[:10000]]))
+        with open(os.path.join(self.root, "a.txt"), "rb") as f:
+            first = SeekableFormat.read_index(f).lengths[0]
+        head = self._disk("a.txt")[:SeekableFormat.HEADER.size + first]
+        for pos in range(10000, len(self.text), 1500):
+            self.provider.write("a.txt", self.text[pos:pos + 1500], offset=pos)
+        self.assertEqual(self._disk("a.txt")[:len(head)], head)
+        self.assertEqual(b"".join(self.provider.read_stream("a.txt")), self.text)
+        self.provider.write("a.txt", b"", offset=len(self.text) + 50)  # Empty write does not extend
+        self.assertEqual(self.provider.get_attr("a.txt")["st_size"], len(self.text))
+
+    def test_mid_file_patch_replaces_atomically(self):
+        self.provider.write_stream("a.txt", iter([self.text]))
+        inode = os.stat(os.path.join(self.root, "a.txt")).st_ino
+        reader = self.provider.read_stream("a.txt")
+        first = next(reader)
+        self.provider.write("a.txt", b"X" * 10, offset=5000)
+        self.assertNotEqual(os.stat(os.path.join(self.root, "a.txt")).st_ino, inode)
+        # A read already under way keeps decoding the old file
+        self.assertEqual(first + b"".join(reader), self.text)
+        self.provider.write("a.txt", b"tail", offset=len(self.text))
+        self.assertEqual(b"".join(self.provider.read_range("a.txt", len(self.text) - 1, 5)), b"\ntail")
+
+    def test_reader_follows_appends(self):
+        self.provider.write_stream("a.txt", iter([self.text[:6000]]))
+        reader = self.provider.read_stream("a.txt")
+        first = next(reader)
+        inode = os.stat(os.path.join(self.root, "a.txt")).st_ino
+        self.provider.write("a.txt", self.text[6000:7000], offset=6000)  # Re-encodes frame 1 in place
+        self.assertEqual(os.stat(os.path.join(self.root, "a.txt")).st_ino, inode)
+        self.assertEqual(first + b"".join(reader), self.text[:7000])
+
+    def test_concurrent_writes_to_different_files(self):
+        from concurrent.futures import ThreadPoolExecutor
+        names = [f"f{i}.txt" for i in range(8)]
+        for name in names:
+            self.provider.write_stream(name, iter([self.text[:4096]]))
+
+        def append(name):
+            for pos in range(4096, 40960, 4096):
+                self.provider.write(name, self.text[pos:pos + 4096], offset=pos)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(append, names))
+        for name in names:
+            self.assertEqual(b"".join(self.provider.read_stream(name)), self.text[:40960])
+        self.assertEqual(self.provider._write_locks, {})
+
+    def test_listing_reuses_cached_indexes(self):
+        for i in range(5):
+            self.provider.write_stream(f"d/{i}.txt", iter([self.text]))
+        self.provider.list_dir_with_attrs("d")
+        opened = []
+        real_open = open
+        import builtins
+        builtins.open = lambda *a, **k: (opened.append(a[0]), real_open(*a, **k))[1]
+        try:
+            attrs = dict(self.provider.list_dir_with_attrs("d"))
+            page, _ = self.provider.list_dir_page("d", None, 10)
+        finally:
+            builtins.open = real_open
+        self.assertEqual(opened, [])
+        self.assertEqual({a["st_size"] for a in attrs.values()} | {a["st_size"] for _, a in page}, {len(self.text)})
+
+    def test_media_and_incompressible_data_stay_plain(self):
+        noise = random.Random(1).randbytes(20000)
+        self.provider.write_stream("photo.jpg", iter([self.text]))
+        self.provider.write_stream("noise.bin", iter([noise]))
+        self.assertEqual(self._disk("photo.jpg"), self.text)
+        self.assertEqual(self._disk("noise.bin"), noise)
+        self.assertIsNotNone(self.provider.open_file("noise.bin"))
+        self.provider.write("noise.bin", b"abc", offset=5)
+        self.assertEqual(self._disk("noise.bin")[5:8], b"abc")
+
+    def test_existing_plain_files_are_read_transparently(self):
+        with open(os.path.join(self.root, "old.txt"), "wb") as f:
+            f.write(SeekableFormat.MAGIC + b" just looks like a header")
+        self.assertEqual(self.provider.get_attr("old.txt")["st_size"], 33)
+        self.assertEqual(b"".join(self.provider.read_range("old.txt", 8, 5)), b" just")
+
+    def test_empty_file(self):
+        self.provider.write_stream("empty.txt", iter([]))
+        self.assertEqual(self.provider.get_attr("empty.txt")["st_size"], 0)
+        self.assertEqual(b"".join(self.provider.read_stream("empty.txt")), b"")
+
+    def test_pool_branches_compress(self):
+        other = tempfile.mkdtemp()
+        try:
+            pool = PooledProvider([self.root, other], branch_factory=lambda r: CompressedLocalProvider(r, codec="zlib"))
+            pool.write_stream("state.json", iter([self.text]))
+            self.assertEqual(pool.get_attr("state.json")["st_size"], len(self.text))
+            self.assertEqual(b"".join(pool.read_stream("state.json")), self.text)
+        finally:
+            shutil.rmtree(other, ignore_errors=True)
+
+if __name__ == "__main__":
+    unittest.main()
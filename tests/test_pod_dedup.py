@@ -0,0 +1,167 @@
+import errno
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from proxion_keyring.pod_dedup import ContentChunker, DedupProvider, migrate_local_root
+from proxion_keyring.pod_proxy import LocalProvider
+
+class TestContentChunker(unittest.TestCase):
+    def setUp(self):
+        self.chunker = ContentChunker(min_size=1024, avg_size=4096, max_size=16384)
+        self.data = random.Random(1).randbytes(256 * 1024)
+
+    def test_chunks_reassemble_within_bounds(self):
+        chunks = list(self.chunker.split(iter([self.data])))
+        self.assertEqual(b"".join(chunks), self.data)
+        self.assertTrue(all(len(c) <= 16384 for c in chunks))
+        self.assertTrue(all(len(c) >= 1024 for c in chunks[:-1]))
+
+    def test_boundaries_ignore_input_piece_sizes(self):
+        whole = list(self.chunker.split(iter([self.data])))
+        pieces = list(self.chunker.split(self.data[i:i + 777] for i in range(0, len(self.data), 777)))
+        self.assertEqual(whole, pieces)
+
+    def test_insertion_only_disturbs_nearby_chunks(self):
+        before = set(self.chunker.split(iter([self.data])))
+        after = set(self.chunker.split(iter([self.data[:5000] + b"insert" + self.data[5000:]])))
+        self.assertLessEqual(len(after - before), 3)
+
+class TestDedupProvider(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DedupProvider(os.path.join(self.tmp, "store"),
+                                   ContentChunker(min_size=1024, avg_size=4096, max_size=16384))
+        self.data = random.Random(2).randbytes(64 * 1024)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _chunk_files(self):
+        return sum(len(files) for _, _, files in os.walk(self.store.chunk_dir))
+
+    def test_identical_files_share_chunks(self):
+        self.store.write_stream("a/one.bin", iter([self.data]))
+        stored = self._chunk_files()
+        self.store.write_stream("b/two.bin", iter([self.data]))
+        self.assertEqual(self._chunk_files(), stored)
+        stats = self.store.stats()
+        self.assertEqual(stats["logical_bytes"], 2 * len(self.data))
+        self.assertEqual(stats["dedup_ratio"], 2.0)
+        self.assertEqual(b"".join(self.store.read_stream("b/two.bin")), self.data)
+
+    def test_namespace_and_attrs(self):
+        self.store.write("docs/notes.txt", b"hello")
+        self.store.create("empty", is_dir=True)
+        self.assertEqual(self.store.list_dir(""), ["docs", "empty"])
+        self.assertEqual(self.store.get_attr("docs/notes.txt")["st_size"], 5)
+        self.assertTrue(self.store.get_attr("docs")["st_mode"] & 0o40000)
+        self.assertIsNone(self.store.get_attr("missing"))
+        page, more = self.store.list_dir_page("", None, 1)
+        self.assertEqual([n for n, _ in page], ["docs"])
+        self.assertTrue(more)
+
+    def test_read_range_spans_chunks(self):
+        self.store.write_stream("f.bin", iter([self.data]))
+        self.assertEqual(b"".join(self.store.read_range("f.bin", 3000, 20000)), self.data[3000:23000])
+        self.assertEqual(b"".join(self.store.read_range("f.bin", len(self.data) - 5, 100)), self.data[-5:])
+
+    def test_offset_write_patches_content(self):
+        self.store.write("f.bin", b"0123456789")
+        self.store.write("f.bin", b"abc", offset=4)
+        self.assertEqual(b"".join(self.store.read_stream("f.bin")), b"0123abc789")
+
+    def test_offset_writes_match_local_patch_semantics(self):
+        self.store.write_stream("f.bin", iter([self.data]))
+        expected = bytearray(self.data)
+        rng = random.Random(2)
+        for _ in range(20):
+            offset = rng.randrange(len(expected) + 5000)
+            data = rng.randbytes(rng.randrange(1, 3000))
+            expected.extend(b"\0" * max(0, offset - len(expected)))
+            expected[offset:offset + len(data)] = data
+            self.store.write("f.bin", data, offset)
+        self.store.write("f.bin", b"HEAD", 0)  # Offset 0 patches too, it does not truncate
+        expected[0:4] = b"HEAD"
+        self.assertEqual(b"".join(self.store.read_stream("f.bin")), bytes(expected))
+        self.assertEqual(self.store.get_attr("f.bin")["st_size"], len(expected))
+
+    def test_offset_write_reads_only_affected_chunks(self):
+        self.store.write_stream("f.bin", iter([self.data]))
+        read = []
+        real_read_chunk = self.store._read_chunk
+        self.store._read_chunk = lambda digest: (read.append(digest), real_read_chunk(digest))[1]
+        self.store.write("f.bin", b"x", 100000)
+        self.assertLessEqual(len(read), 2)
+        self.assertLess(len(read), len(self.store._manifest("f.bin")))
+
+    def test_excluded_names_are_inaccessible(self):
+        with self.assertRaises(PermissionError):
+            self.store.write("keys/identity_private.pem", b"secret")
+        with self.assertRaises(PermissionError):
+            self.store.read_stream("server.pem")
+        with self.assertRaises(PermissionError):
+            self.store.delete(".git")
+        self.store.write("notes.txt.acl", b"sidecar")  # Hidden, not excluded
+        self.assertEqual(b"".join(self.store.read_stream("notes.txt.acl")), b"sidecar")
+        # Listings hide what a LocalProvider hides, and nothing more
+        self.store.write("myThumbs.db", b"x")
+        self.assertEqual(self.store.list_dir(""), ["myThumbs.db"])
+
+    def test_gc_only_collects_unreferenced_chunks(self):
+        self.store.write_stream("keep.bin", iter([self.data]))
+        self.store.write_stream("copy.bin", iter([self.data]))
+        self.store.write_stream("other.bin", iter([random.Random(3).randbytes(32 * 1024)]))
+        before = self._chunk_files()
+        self.assertTrue(self.store.delete("copy.bin"))
+        self.assertEqual(self.store.gc()["chunks"], 0)
+        self.store.delete("other.bin")
+        collected = self.store.gc()
+        self.assertEqual(collected["bytes"], 32 * 1024)
+        self.assertEqual(self._chunk_files(), before - collected["chunks"])
+        self.assertEqual(b"".join(self.store.read_stream("keep.bin")), self.data)
+
+    def test_overwrite_releases_old_chunks(self):
+        self.store.write("f.bin", b"old" * 1000)
+        self.store.write("f.bin", b"new" * 1000)
+        self.assertGreater(self.store.stats()["garbage_chunks"], 0)
+        self.store.gc()
+        self.assertEqual(self.store.stats()["garbage_chunks"], 0)
+        self.assertEqual(b"".join(self.store.read_stream("f.bin")), b"new" * 1000)
+
+    def test_non_empty_directory_delete_fails(self):
+        self.store.write("d/f.txt", b"x")
+        with self.assertRaises(OSError) as ctx:
+            self.store.delete("d")
+        self.assertEqual(ctx.exception.errno, errno.ENOTEMPTY)
+        self.store.delete("d/f.txt")
+        self.assertTrue(self.store.delete("d"))
+
+    def test_traversal_rejected(self):
+        with self.assertRaises(PermissionError):
+            self.store.write("../escape", b"x")
+
+    def test_index_survives_reopen(self):
+        self.store.write_stream("f.bin", iter([self.data]))
+        self.store.close()
+        self.store = DedupProvider(self.store.store_path)
+        self.assertEqual(b"".join(self.store.read_stream("f.bin")), self.data)
+
+    def test_migrate_local_root(self):
+        src = os.path.join(self.tmp, "src")
+        os.makedirs(os.path.join(src, "photos"))
+        for name in ("photos/a.jpg", "photos/a_copy.jpg"):
+            with open(os.path.join(src, name), "wb") as f:
+                f.write(self.data)
+        os.utime(os.path.join(src, "photos/a.jpg"), (1_000_000, 1_000_000))
+        totals = migrate_local_root(LocalProvider(src), self.store)
+        self.assertEqual(totals, {"files": 2, "bytes": 2 * len(self.data)})
+        self.assertEqual(self.store.get_attr("photos/a.jpg")["st_mtime"], 1_000_000)
+        self.assertEqual(b"".join(self.store.read_stream("photos/a_copy.jpg")), self.data)
+        self.assertEqual(self.store.stats()["dedup_ratio"], 2.0)
+
+if __name__ == "__main__":
+    unittest.main()
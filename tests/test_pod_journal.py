@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from proxion_keyring.pod_journal import ChangeJournal, ChangeJournals, JournalError
+from proxion_keyring.pod_proxy import HybridHub, LocalProvider
+
+class TestChangeJournals(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.data = tempfile.mkdtemp()
+        with open(os.path.join(self.root, "existing.txt"), "wb") as f:
+            f.write(b"old")
+        self.hub = HybridHub(watch=False)
+        self.provider = LocalProvider(self.root)
+        self.hub.mount("stash", self.provider)
+        self.journals = self._open()
+
+    def _open(self):
+        journals = ChangeJournals(os.path.join(self.data, "journal"))
+        journals.sync(self.hub.mounts, reconcile=False)
+        journals._journals["stash"].reconcile()
+        self.hub.journals = journals
+        return journals
+
+    def tearDown(self):
+        self.journals.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+        shutil.rmtree(self.data, ignore_errors=True)
+
+    def _ops(self, page):
+        return [(c["path"], c["op"]) for c in page["changes"]]
+
+    def test_startup_scan_then_incremental_changes(self):
+        self.assertEqual(self._ops(self.journals.changes(self.journals.encode_cursor({}))),
+                         [("stash/existing.txt", "Create")])
+        cursor = self.journals.changes(None)["cursor"]
+        self.hub.create("stash/docs", is_dir=True)
+        self.hub.write_stream("stash/docs/a.txt", [b"one"])
+        for i in range(5):
+            self.hub.write("stash/docs/a.txt", b"x", 3 + i)  # Coalesced into one Update
+        self.hub.delete("stash/existing.txt")
+        page = self.journals.changes(cursor)
+        self.assertEqual(self._ops(page), [
+            ("stash/docs", "Create"), ("stash/docs/a.txt", "Create"), ("stash/existing.txt", "Delete")
+        ])
+        self.assertEqual(page["changes"][1]["size"], 8)
+        self.assertEqual(self.journals.changes(page["cursor"])["changes"], [])
+
+    def test_reconcile_finds_offline_changes(self):
+        cursor = self.journals.changes(None)["cursor"]
+        self.journals.close()
+        os.remove(os.path.join(self.root, "existing.txt"))
+        with open(os.path.join(self.root, "offline.txt"), "wb") as f:
+            f.write(b"new")
+        self.journals = self._open()
+        self.assertEqual(sorted(self._ops(self.journals.changes(cursor))),
+                         [("stash/existing.txt", "Delete"), ("stash/offline.txt", "Create")])
+
+    def test_directory_moved_in_from_outside_journals_its_contents(self):
+        self.hub.create("stash/a", is_dir=True)
+        self.hub.create("stash/a/deep", is_dir=True)
+        self.hub.write_stream("stash/a/deep/f.txt", [b"one"])
+        cursor = self.journals.changes(None)["cursor"]
+        os.rename(os.path.join(self.root, "a"), os.path.join(self.root, "b"))
+        # What inotify reports for the rename: IN_MOVED_FROM and IN_MOVED_TO on the directory only
+        self.hub._on_fs_change(self.provider, os.path.join(self.root, "a"), True, "Delete")
+        self.hub._on_fs_change(self.provider, os.path.join(self.root, "b"), True, "Create")
+        self.assertEqual(sorted(self._ops(self.journals.changes(cursor))), [
+            ("stash/a", "Delete"), ("stash/a/deep", "Delete"), ("stash/a/deep/f.txt", "Delete"),
+            ("stash/b", "Create"), ("stash/b/deep", "Create"), ("stash/b/deep/f.txt", "Create"),
+        ])
+
+    def test_paging_and_limit(self):
+        cursor = self.journals.changes(None)["cursor"]
+        for i in range(5):
+            self.hub.write_stream(f"stash/f{i}.txt", [b"x"])
+        seen = []
+        while True:
+            page = self.journals.changes(cursor, limit=2)
+            seen.extend(self._ops(page))
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+        self.assertEqual([p for p, _ in seen], [f"stash/f{i}.txt" for i in range(5)])
+
+    def test_compaction_keeps_latest_and_expires_tombstones(self):
+        cursor = self.journals.changes(None)["cursor"]
+        self.hub.write_stream("stash/a.txt", [b"1"])
+        self.journals._journals["stash"].flush()
+        self.hub.write_stream("stash/a.txt", [b"22"])
+        self.hub.delete("stash/existing.txt")
+        journal = self.journals._journals["stash"]
+        self.assertEqual(journal.compact(retention=3600), 2)  # Both first rows are superseded
+        self.assertEqual(self._ops(self.journals.changes(cursor)),
+                         [("stash/a.txt", "Update"), ("stash/existing.txt", "Delete")])
+        journal.compact(retention=0)
+        page = self.journals.changes(cursor)
+        self.assertEqual(page["reset"], ["stash"])
+        self.assertEqual(self.journals.changes(page["cursor"])["changes"], [])
+
+    def test_remapped_mount_starts_new_epoch(self):
+        cursor = self.journals.changes(None)["cursor"]
+        other = tempfile.mkdtemp()
+        try:
+            self.hub.mount("stash", LocalProvider(other))
+            self.journals.sync(self.hub.mounts, reconcile=False)
+            self.assertEqual(self.journals.changes(cursor)["reset"], ["stash"])
+        finally:
+            shutil.rmtree(other, ignore_errors=True)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(JournalError):
+            self.journals.changes("not-a-cursor")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from proxion_keyring.pod_notify import ChangeNotifier, NotifyError, Subscription
+from proxion_keyring.pod_proxy import HybridHub, LocalProvider
+
+class TestSubscription(unittest.TestCase):
+    def test_matches_topic_and_members(self):
+        sub = Subscription("stash/photos")
+        self.assertTrue(sub.matches("stash/photos"))
+        self.assertTrue(sub.matches("stash/photos/a.jpg"))
+        self.assertFalse(sub.matches("stash/photos/2024/a.jpg"))
+        self.assertFalse(sub.matches("stash/photoshop"))
+        self.assertTrue(Subscription("stash", recursive=True).matches("stash/photos/2024/a.jpg"))
+
+    def test_bursts_coalesce_per_path(self):
+        sub = Subscription("docs")
+        for _ in range(50):
+            sub.offer("docs/a.txt", "Update")
+        sub.offer("docs/b.txt", "Create")
+        sub.offer("docs/b.txt", "Update")
+        sub.offer("docs/tmp", "Create")
+        sub.offer("docs/tmp", "Delete")
+        self.assertEqual(sub.take(1), [("docs/a.txt", "Update"), ("docs/b.txt", "Create")])
+        self.assertIsNone(sub.take(0.01))
+
+    def test_overflow_becomes_single_reset(self):
+        sub = Subscription("docs", max_pending=3)
+        for i in range(10):
+            sub.offer(f"docs/{i}", "Create")
+        self.assertEqual(sub.take(1), [("", "Reset")])
+        sub.offer("docs/after", "Create")
+        self.assertEqual(sub.take(1), [("docs/after", "Create")])
+
+class TestChangeNotifier(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.hub = HybridHub(watch=False, notifier=ChangeNotifier(max_subscribers=2, window=0))
+        self.hub.mount("stash", LocalProvider(self.root))
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_hub_mutations_publish_solid_activities(self):
+        sub = self.hub.subscribe("stash/docs")
+        self.hub.create("stash/docs", is_dir=True)
+        self.hub.write_stream("stash/docs/a.txt", [b"one"])
+        self.assertEqual(sub.take(1), [("stash/docs", "Create"), ("stash/docs/a.txt", "Create")])
+        self.hub.write_stream("stash/docs/a.txt", [b"two"])
+        self.assertEqual(sub.take(1), [("stash/docs/a.txt", "Update")])
+        self.hub.delete("stash/docs/a.txt")
+        path, kind = sub.take(1)[0]
+        event = self.hub.notifier.activity(sub, path, kind, "http://localhost/pod/")
+        self.assertEqual(event["type"], "Remove")
+        self.assertEqual(event["object"], "http://localhost/pod/stash/docs/a.txt")
+        self.assertEqual(event["target"], "http://localhost/pod/stash/docs")
+
+    def test_subscriber_limit(self):
+        self.hub.subscribe("a")
+        sub = self.hub.subscribe("b")
+        with self.assertRaises(NotifyError) as ctx:
+            self.hub.subscribe("c")
+        self.assertEqual(ctx.exception.status, 503)
+        self.hub.notifier.unsubscribe(sub)
+        self.hub.subscribe("c")
+
+    def test_stream_emits_sse_and_unsubscribes(self):
+        sub = self.hub.subscribe("stash")
+        stream = self.hub.notifier.stream(sub, "http://localhost/pod/")
+        self.assertEqual(next(stream), ": subscribed\n\n")
+        self.hub.write_stream("stash/n.txt", [b"x"])
+        frame = next(stream)
+        self.assertIn("event: Add\n", frame)
+        self.assertIn('"object": "http://localhost/pod/stash/n.txt"', frame)
+        stream.close()
+        self.assertFalse(self.hub.notifier.active)
+
+class TestInotifyNotifications(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.hub = HybridHub(notifier=ChangeNotifier(window=0.05))
+        if not self.hub.watcher.available:
+            self.skipTest("inotify not available")
+        self.hub.mount("stash", LocalProvider(self.root))
+
+    def tearDown(self):
+        self.hub.watcher.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_external_edits_are_published(self):
+        sub = self.hub.subscribe("stash")
+        with open(os.path.join(self.root, "ext.txt"), "wb") as f:
+            for _ in range(20):
+                f.write(b"chunk")
+                f.flush()
+        with open(os.path.join(self.root, "ext.txt.proxion-upload"), "wb") as f:
+            f.write(b"temp")
+        events = []
+        deadline = time.monotonic() + 5
+        while not events and time.monotonic() < deadline:
+            events = sub.take(0.5, self.hub.notifier.window) or []
+        self.assertEqual(events, [("stash/ext.txt", "Create")])
+
+    def _wait_for(self, sub, path):
+        seen = []
+        deadline = time.monotonic() + 5
+        while path not in seen and time.monotonic() < deadline:
+            seen.extend(p for p, _ in sub.take(0.5, self.hub.notifier.window) or [])
+        return seen
+
+    def test_recursive_topics_see_deep_external_edits(self):
+        os.makedirs(os.path.join(self.root, "a", "b"))
+        sub = self.hub.subscribe("stash", recursive=True)
+        with open(os.path.join(self.root, "a", "b", "deep.txt"), "wb") as f:
+            f.write(b"x")
+        self.assertIn("stash/a/b/deep.txt", self._wait_for(sub, "stash/a/b/deep.txt"))
+        # Directories created later are watched too
+        os.makedirs(os.path.join(self.root, "a", "new"))
+        self._wait_for(sub, "stash/a/new")
+        with open(os.path.join(self.root, "a", "new", "later.txt"), "wb") as f:
+            f.write(b"y")
+        self.assertIn("stash/a/new/later.txt", self._wait_for(sub, "stash/a/new/later.txt"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from proxion_keyring.pod_pool import FreeSpaceCache, PooledProvider, register_policy
+from proxion_keyring.pod_proxy import DemoRemoteProvider, HybridHub
+
+class TestPooledProvider(unittest.TestCase):
+    def setUp(self):
+        self.roots = [tempfile.mkdtemp() for _ in range(3)]
+        os.makedirs(os.path.join(self.roots[1], "photos"))
+        with open(os.path.join(self.roots[1], "photos", "a.jpg"), "wb") as f:
+            f.write(b"jpeg")
+        with open(os.path.join(self.roots[2], "notes.txt"), "wb") as f:
+            f.write(b"notes")
+
+    def tearDown(self):
+        for root in self.roots:
+            shutil.rmtree(root, ignore_errors=True)
+
+    def _pool(self, policy, free=None):
+        pool = PooledProvider(self.roots, policy=policy)
+        if free is not None:
+            # Pin the free-space cache so placement is deterministic
+            pool.free_space._free = dict(zip(pool.roots, free))
+            pool.free_space.interval = 3600
+            pool.free_space._refreshed = float("inf")
+        return pool
+
+    def _branch_of(self, path):
+        return [i for i, r in enumerate(self.roots) if os.path.exists(os.path.join(r, path))]
+
+    def test_union_namespace(self):
+        pool = self._pool("mfs")
+        self.assertEqual(set(pool.list_dir("")), {"photos", "notes.txt"})
+        self.assertEqual(b"".join(pool.read_stream("photos/a.jpg")), b"jpeg")
+        self.assertEqual(pool.get_attr("notes.txt")["st_size"], 5)
+
+    def test_most_free_space_placement(self):
+        pool = self._pool("mfs", free=[10, 500, 100])
+        pool.write_stream("new.bin", iter([b"x" * 8]))
+        self.assertEqual(self._branch_of("new.bin"), [1])
+        self.assertEqual(pool.free_space.free(pool.roots[1]), 492)
+
+    def test_existing_files_are_updated_in_place(self):
+        pool = self._pool("mfs", free=[1000, 0, 0])
+        pool.write_stream("notes.txt", iter([b"changed"]))
+        self.assertEqual(self._branch_of("notes.txt"), [2])
+
+    def test_round_robin(self):
+        pool = self._pool("rr", free=[100, 100, 100])
+        for i in range(3):
+            pool.write(f"f{i}.txt", b"x")
+        self.assertEqual([self._branch_of(f"f{i}.txt") for i in range(3)], [[0], [1], [2]])
+
+    def test_path_preserving_keeps_directory_together(self):
+        pool = self._pool("epmfs", free=[900, 10, 900])
+        pool.write("photos/b.jpg", b"jpeg")
+        self.assertEqual(self._branch_of("photos/b.jpg"), [1])
+
+    def test_min_free_skips_full_branches(self):
+        pool = self._pool("epmfs", free=[900, 10, 900])
+        pool.min_free = 100
+        pool.write("photos/c.jpg", b"jpeg")
+        self.assertNotIn(1, self._branch_of("photos/c.jpg"))
+
+    def test_location_index_repairs_after_external_move(self):
+        pool = self._pool("mfs")
+        pool.get_attr("notes.txt")
+        shutil.move(os.path.join(self.roots[2], "notes.txt"), os.path.join(self.roots[0], "notes.txt"))
+        self.assertEqual(b"".join(pool.read_stream("notes.txt")), b"notes")
+
+    def test_delete_directory_from_all_branches(self):
+        os.makedirs(os.path.join(self.roots[0], "empty"))
+        os.makedirs(os.path.join(self.roots[2], "empty"))
+        pool = self._pool("mfs")
+        self.assertTrue(pool.delete("empty"))
+        self.assertEqual(self._branch_of("empty"), [])
+
+    def test_delete_directory_checks_every_branch_first(self):
+        os.makedirs(os.path.join(self.roots[0], "photos"))
+        pool = self._pool("mfs")
+        with self.assertRaises(OSError):
+            pool.delete("photos")  # Not empty on branch 1, so branch 0 keeps its copy too
+        self.assertEqual(self._branch_of("photos"), [0, 1])
+
+    def test_hub_watches_every_branch(self):
+        hub = HybridHub()
+        self.addCleanup(lambda: hub.watcher and hub.watcher.close())
+        pool = self._pool("mfs")
+        hub.mount("pool", pool)
+        remote = DemoRemoteProvider("remote")
+        hub.mount("cloud", remote)
+        hub.get_attr("cloud/cloud_data.txt")
+        self.assertLessEqual(hub.attr_cache._entries[(remote, "cloud_data.txt")][0] - time.monotonic(),
+                             HybridHub.UNWATCHED_TTL)
+        if not (hub.watcher and hub.watcher.available):
+            self.skipTest("inotify not available")
+        self.assertEqual(hub.get_attr("pool/notes.txt")["st_size"], 5)
+        self.assertGreater(hub.attr_cache._entries[(pool, "notes.txt")][0] - time.monotonic(),
+                           HybridHub.UNWATCHED_TTL)
+        with open(os.path.join(self.roots[2], "notes.txt"), "ab") as f:
+            f.write(b"!")
+        deadline = time.time() + 2
+        while time.time() < deadline and hub.get_attr("pool/notes.txt")["st_size"] != 6:
+            time.sleep(0.02)
+        self.assertEqual(hub.get_attr("pool/notes.txt")["st_size"], 6)
+
+    def test_custom_policy_and_unknown_policy(self):
+        class Last:
+            def choose(self, pool, path, branches):
+                return branches[-1]
+        register_policy("last", Last)
+        pool = self._pool("last", free=[100, 100, 100])
+        pool.write("z.txt", b"z")
+        self.assertEqual(self._branch_of("z.txt"), [2])
+        with self.assertRaises(ValueError):
+            PooledProvider(self.roots, policy="nope")
+
+class TestFreeSpaceCache(unittest.TestCase):
+    def test_refresh_is_rate_limited(self):
+        root = tempfile.mkdtemp()
+        try:
+            cache = FreeSpaceCache([root], interval=3600)
+            first = cache.free(root)
+            self.assertGreater(first, 0)
+            total, used, _ = cache.usage(root)
+            cache.debit(root, 1)
+            self.assertEqual(cache.free(root), first - 1)
+            self.assertEqual(cache.usage(root), (total, used + 1, first - 1))
+            self.assertIsNone(cache.usage(os.path.join(root, "missing")))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from proxion_keyring.pod_proxy import AttrCache, HybridHub, LocalProvider
+
+class TestAttrCache(unittest.TestCase):
+    def test_hit_miss_counters(self):
+        cache = AttrCache(max_entries=10, ttl=60)
+        provider = object()
+        self.assertEqual(cache.get(provider, "a.txt"), (False, None))
+        cache.put(provider, "a.txt", {"st_size": 1})
+        self.assertEqual(cache.get(provider, "a.txt"), (True, {"st_size": 1}))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru_bound(self):
+        cache = AttrCache(max_entries=2, ttl=60)
+        provider = object()
+        cache.put(provider, "a", 1)
+        cache.put(provider, "b", 2)
+        cache.get(provider, "a")
+        cache.put(provider, "c", 3)
+        self.assertFalse(cache.get(provider, "b")[0])
+        self.assertTrue(cache.get(provider, "a")[0])
+
+    def test_ttl_expiry(self):
+        cache = AttrCache(ttl=0.01)
+        provider = object()
+        cache.put(provider, "a", 1)
+        time.sleep(0.02)
+        self.assertFalse(cache.get(provider, "a")[0])
+
+    def test_invalidate_drops_parent_and_children(self):
+        cache = AttrCache(ttl=60)
+        provider = object()
+        for p in ("dir", "dir/a", "dir/sub/b", "other"):
+            cache.put(provider, p, p)
+        cache.invalidate(provider, "dir/a")
+        self.assertFalse(cache.get(provider, "dir")[0])
+        cache.invalidate(provider, "dir", recursive=True)
+        self.assertFalse(cache.get(provider, "dir/sub/b")[0])
+        self.assertTrue(cache.get(provider, "other")[0])
+
+    def test_get_returns_a_copy(self):
+        cache = AttrCache(ttl=60)
+        provider = object()
+        cache.put(provider, "a", {"st_size": 1})
+        cache.get(provider, "a")[1]["st_size"] = 99
+        self.assertEqual(cache.get(provider, "a"), (True, {"st_size": 1}))
+
+    def test_stale_put_discarded(self):
+        cache = AttrCache(ttl=60)
+        provider = object()
+        generation = cache.generation
+        cache.invalidate(provider, "a")
+        cache.put(provider, "a", {"old": True}, generation)
+        self.assertFalse(cache.get(provider, "a")[0])
+
+class TestHybridHubCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        with open(os.path.join(self.root, "a.txt"), "wb") as f:
+            f.write(b"1234")
+        self.hub = HybridHub()
+        self.provider = LocalProvider(self.root)
+        self.hub.mount("stash", self.provider)
+        self.hub.primary_provider = self.provider
+
+    def tearDown(self):
+        if self.hub.watcher:
+            self.hub.watcher.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_repeated_get_attr_hits_cache(self):
+        self.hub.get_attr("stash/a.txt")
+        self.hub.get_attr("stash/a.txt")
+        # Auto-merged root path shares the same provider entry
+        self.hub.get_attr("a.txt")
+        stats = self.hub.attr_cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+
+    def test_hub_mutations_invalidate(self):
+        self.assertIsNone(self.hub.get_attr("stash/new.txt"))
+        self.hub.write("stash/new.txt", b"hello")
+        self.assertEqual(self.hub.get_attr("stash/new.txt")["st_size"], 5)
+        self.hub.delete("stash/new.txt")
+        self.assertIsNone(self.hub.get_attr("stash/new.txt"))
+
+    def test_failed_watch_gets_short_ttl(self):
+        if not (self.hub.watcher and self.hub.watcher.available):
+            self.skipTest("inotify not available")
+        self.hub.watcher.max_watches = 0  # As if the watch limit were reached
+        self.hub.get_attr("stash/a.txt")
+        expires = self.hub.attr_cache._entries[(self.provider, "a.txt")][0]
+        self.assertLessEqual(expires - time.monotonic(), HybridHub.UNWATCHED_TTL)
+
+    def test_external_change_invalidates_via_inotify(self):
+        if not (self.hub.watcher and self.hub.watcher.available):
+            self.skipTest("inotify not available")
+        self.assertEqual(self.hub.get_attr("stash/a.txt")["st_size"], 4)
+        with open(os.path.join(self.root, "a.txt"), "ab") as f:
+            f.write(b"56")
+        deadline = time.time() + 2
+        while time.time() < deadline:
+            if self.hub.get_attr("stash/a.txt")["st_size"] == 6:
+                break
+            time.sleep(0.02)
+        self.assertEqual(self.hub.get_attr("stash/a.txt")["st_size"], 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from flask import Flask
+
+from proxion_keyring.pod_proxy import (
+    ContentHashCache, HybridHub, LocalProvider, PodProxyServer, metadata_etag
+)
+
+class TestValidators(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        with open(os.path.join(self.root, "a.txt"), "wb") as f:
+            f.write(b"hello")
+        old = time.time() - 100
+        os.utime(os.path.join(self.root, "a.txt"), (old, old))
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", LocalProvider(self.root))
+        # Validators never touch config, Flask or WsgiDAV state
+        self.server = PodProxyServer.__new__(PodProxyServer)
+        self.server.hub = self.hub
+        self.server.etag_mode = "metadata"
+        self.server.content_hashes = ContentHashCache()
+        self.app = Flask(__name__)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_metadata_etag_tracks_size_and_mtime(self):
+        attr = self.hub.get_attr("stash/a.txt")
+        self.assertEqual(metadata_etag(attr), metadata_etag(dict(attr)))
+        self.assertNotEqual(metadata_etag(attr), metadata_etag({**attr, "st_size": 6}))
+        self.assertNotIn('"', metadata_etag(attr))
+
+    def test_file_tag_is_strong_unless_fresh(self):
+        attr = self.hub.get_attr("stash/a.txt")
+        etag, last_modified = self.server._validators("stash/a.txt", attr)
+        self.assertEqual(etag, f'"{metadata_etag(attr)}"')
+        self.assertEqual(last_modified, attr["st_mtime"])
+        fresh, _ = self.server._validators("stash/a.txt", {**attr, "st_mtime": time.time()})
+        self.assertTrue(fresh.startswith('W/'))
+
+    def test_container_tag_follows_children_and_variant(self):
+        attr = self.hub.get_attr("stash")
+        entries = self.hub.list_dir_with_attrs("stash")
+        turtle, _ = self.server._validators("stash", attr, entries, "turtle")
+        json_tag, _ = self.server._validators("stash", attr, entries, "json")
+        self.assertNotEqual(turtle, json_tag)
+        grown = [(n, {**a, "st_size": a["st_size"] + 1}) for n, a in entries]
+        self.assertNotEqual(turtle, self.server._validators("stash", attr, grown, "turtle")[0])
+
+    def test_content_digest_is_cached_per_version(self):
+        self.server.etag_mode = "content"
+        attr = self.hub.get_attr("stash/a.txt")
+        etag, _ = self.server._validators("stash/a.txt", attr)
+        self.assertTrue(etag.startswith('"sha256-'))
+        self.assertEqual(len(self.server.content_hashes._digests), 1)
+        self.server._validators("stash/a.txt", attr)
+        self.assertEqual(len(self.server.content_hashes._digests), 1)
+
+    def _check(self, method, headers, etag='"v1"', last_modified=1000.0, exists=True):
+        with self.app.test_request_context("/", method=method, headers=headers):
+            resp = self.server._evaluate_preconditions(etag, last_modified, exists)
+            return resp.status_code if resp is not None else None
+
+    def test_if_none_match(self):
+        self.assertEqual(self._check("GET", {"If-None-Match": '"v1"'}), 304)
+        self.assertEqual(self._check("GET", {"If-None-Match": '"v1"'}, etag='W/"v1"'), 304)
+        self.assertIsNone(self._check("GET", {"If-None-Match": '"v2"'}))
+        self.assertEqual(self._check("PUT", {"If-None-Match": "*"}), 412)
+        self.assertIsNone(self._check("PUT", {"If-None-Match": "*"}, exists=False))
+
+    def test_if_match_uses_strong_comparison(self):
+        self.assertIsNone(self._check("PUT", {"If-Match": '"v1"'}))
+        self.assertEqual(self._check("PUT", {"If-Match": '"v1"'}, etag='W/"v1"'), 412)
+        self.assertEqual(self._check("DELETE", {"If-Match": "*"}, exists=False), 412)
+
+    def test_date_preconditions(self):
+        self.assertEqual(self._check("GET", {"If-Modified-Since": "Thu, 01 Jan 1970 00:16:40 GMT"}), 304)
+        self.assertIsNone(self._check("GET", {"If-Modified-Since": "Thu, 01 Jan 1970 00:16:39 GMT"}))
+        self.assertEqual(self._check("PUT", {"If-Unmodified-Since": "Thu, 01 Jan 1970 00:16:39 GMT"}), 412)
+        # If-None-Match takes precedence over If-Modified-Since
+        self.assertIsNone(self._check("GET", {
+            "If-None-Match": '"v2"', "If-Modified-Since": "Thu, 01 Jan 1970 00:16:40 GMT"}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from proxion_keyring.pod_proxy import (
+    DemoRemoteProvider, HybridHub, LocalProvider, PodProxyServer, ProxionCollection, ProxionDAVProvider
+)
+
+class TestListDirWithAttrs(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "sub"))
+        for name, data in (("a.txt", b"abc"), ("a.txt.acl", b"acl"), ("identity_private.pem", b"key")):
+            with open(os.path.join(self.root, name), "wb") as f:
+                f.write(data)
+        self.provider = LocalProvider(self.root)
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", self.provider)
+        self.hub.mount("cloud", DemoRemoteProvider("test"))
+        self.hub.primary_provider = self.provider
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_local_listing_filters_and_stats(self):
+        listing = dict(self.provider.list_dir_with_attrs(""))
+        self.assertEqual(set(listing), {"a.txt", "sub"})
+        self.assertEqual(listing["a.txt"]["st_size"], 3)
+        self.assertTrue(listing["sub"]["st_mode"] & 0o40000)
+        self.assertEqual(set(listing), set(self.provider.list_dir("")))
+
+    def test_hub_root_merges_mounts_and_primary(self):
+        names = [name for name, _ in self.hub.list_dir_with_attrs("/")]
+        self.assertEqual(names[:2], ["stash", "cloud"])
+        self.assertIn("a.txt", names)
+
+    def test_hub_listing_primes_attr_cache(self):
+        self.hub.list_dir_with_attrs("stash")
+        misses = self.hub.attr_cache.misses
+        self.assertEqual(self.hub.get_attr("stash/a.txt")["st_size"], 3)
+        self.assertEqual(self.hub.attr_cache.misses, misses)
+
+    def test_remote_listing(self):
+        listing = self.hub.list_dir_with_attrs("cloud")
+        self.assertEqual(listing[0][0], "cloud_data.txt")
+
+    def test_dav_members_reuse_listing_attrs(self):
+        environ = {"wsgidav.provider": ProxionDAVProvider(self.hub)}
+        collection = ProxionCollection("/stash", environ, self.hub)
+        calls = []
+        original = self.hub.get_attr
+        self.hub.get_attr = lambda path: calls.append(path) or original(path)
+        members = {m.name: m for m in collection.get_member_list()}
+        self.assertEqual(members["a.txt"].get_content_length(), 3)
+        self.assertTrue(members["sub"].is_collection)
+        members["sub"].get_last_modified()
+        members["sub"].get_etag()
+        self.assertEqual(calls, [])
+
+class TestListDirPage(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for i in range(12):
+            with open(os.path.join(self.root, f"f{i:02d}.txt"), "wb") as f:
+                f.write(b"x")
+        self.provider = LocalProvider(self.root)
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", self.provider)
+        self.hub.mount("stash/f05b", DemoRemoteProvider("nested"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _walk(self, lister, limit):
+        names, after = [], None
+        while True:
+            page, more = lister(after, limit)
+            names.extend(name for name, _ in page)
+            if not more:
+                return names
+            after = page[-1][0]
+
+    def test_local_pages_are_sorted_and_complete(self):
+        names = self._walk(lambda after, limit: self.provider.list_dir_page("", after, limit), 5)
+        self.assertEqual(names, sorted(os.listdir(self.root)))
+
+    def test_cursor_survives_inserts(self):
+        page, more = self.provider.list_dir_page("", None, 4)
+        self.assertTrue(more)
+        with open(os.path.join(self.root, "a_new.txt"), "wb") as f:
+            f.write(b"x")
+        rest, _ = self.provider.list_dir_page("", page[-1][0], 100)
+        self.assertEqual(rest[0][0], "f04.txt")
+
+    def test_sorted_names_kept_until_directory_changes(self):
+        settled = os.stat(self.root).st_mtime - 10
+        os.utime(self.root, (settled, settled))
+        first, _ = self.provider.list_dir_page("", None, 4)
+        self.assertIn(self.root, self.provider._sorted)
+        scandir = os.scandir
+        try:
+            os.scandir = None  # A cached directory must not be rescanned
+            second, _ = self.provider.list_dir_page("", first[-1][0], 4)
+        finally:
+            os.scandir = scandir
+        self.assertEqual(second[0][0], "f04.txt")
+        with open(os.path.join(self.root, "f04a.txt"), "wb") as f:
+            f.write(b"x")
+        again, _ = self.provider.list_dir_page("", first[-1][0], 4)
+        self.assertEqual(again[1][0], "f04a.txt")
+
+    def test_hub_pages_merge_mounts(self):
+        names = self._walk(lambda after, limit: self.hub.list_dir_page("stash", after, limit), 4)
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(names), 13)
+        self.assertIn("f05b", names)
+
+    def test_cursor_round_trip_and_turtle_stream(self):
+        cursor = PodProxyServer._encode_cursor("f05.txt")
+        self.assertEqual(PodProxyServer._decode_cursor(cursor), "f05.txt")
+        with self.assertRaises(ValueError):
+            PodProxyServer._decode_cursor("not base64!")
+        entries, _ = self.provider.list_dir_page("", None, 100)
+        server = PodProxyServer.__new__(PodProxyServer)
+        pieces = list(server._iter_turtle("", entries, buffer_size=64))
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual("".join(pieces), server._render_turtle("", entries))
+        self.assertEqual("".join(pieces).count("ldp:contains"), 12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from proxion_keyring.pod_proxy import HybridHub, LocalProvider, MountTrie
+
+class TestMountTrie(unittest.TestCase):
+    def test_longest_prefix_wins(self):
+        trie = MountTrie()
+        media, archive = object(), object()
+        trie.insert("media", media)
+        trie.insert("media/archive", archive)
+        self.assertEqual(trie.longest_match("media/a.mkv"), (media, "a.mkv"))
+        self.assertEqual(trie.longest_match("media/archive/old.mkv"), (archive, "old.mkv"))
+        self.assertEqual(trie.longest_match("media/archived.mkv"), (media, "archived.mkv"))
+        self.assertEqual(trie.longest_match("/media/archive"), (archive, ""))
+        self.assertEqual(trie.longest_match("other/x"), (None, "other/x"))
+
+    def test_remove_prunes_empty_branches(self):
+        trie = MountTrie()
+        deep = object()
+        trie.insert("a/b/c", deep)
+        self.assertEqual(trie.children("a"), ["b"])
+        self.assertIs(trie.remove("a/b/c"), deep)
+        self.assertEqual(trie.children(""), [])
+
+class TestNestedMounts(unittest.TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.archive = tempfile.mkdtemp()
+        with open(os.path.join(self.media, "new.mkv"), "wb") as f:
+            f.write(b"new")
+        with open(os.path.join(self.archive, "old.mkv"), "wb") as f:
+            f.write(b"old!")
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("media", LocalProvider(self.media))
+
+    def tearDown(self):
+        shutil.rmtree(self.media, ignore_errors=True)
+        shutil.rmtree(self.archive, ignore_errors=True)
+
+    def test_runtime_mount_and_unmount(self):
+        self.assertIsNone(self.hub.get_attr("media/archive/old.mkv"))
+        self.hub.mount("media/archive", LocalProvider(self.archive))
+        self.assertEqual(self.hub.get_attr("media/archive/old.mkv")["st_size"], 4)
+        self.assertEqual(self.hub.list_dir("media"), ["archive", "new.mkv"])
+        self.assertEqual(self.hub.list_dir("media/archive"), ["old.mkv"])
+
+        self.hub.unmount("media/archive")
+        self.assertIsNone(self.hub.get_attr("media/archive/old.mkv"))
+        self.assertEqual(self.hub.list_dir("media"), ["new.mkv"])
+
+    def test_virtual_intermediate_directory(self):
+        self.hub.mount("vault/archive", LocalProvider(self.archive))
+        self.assertTrue(self.hub.get_attr("vault")["st_mode"] & 0o40000)
+        self.assertIn("vault", self.hub.list_dir("/"))
+        self.assertEqual([n for n, _ in self.hub.list_dir_with_attrs("vault")], ["archive"])
+
+if __name__ == '__main__':
+    unittest.main()
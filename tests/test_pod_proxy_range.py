@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from flask import Flask
+
+from proxion_keyring.pod_proxy import DemoRemoteProvider, FileRange, HybridHub, LocalProvider, PodProxyServer
+
+class TestRangedReads(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.data = bytes(range(256)) * 1024
+        with open(os.path.join(self.root, "media.bin"), "wb") as f:
+            f.write(self.data)
+        self.provider = LocalProvider(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_local_read_range(self):
+        body = b"".join(self.provider.read_range("media.bin", 1000, 300000))
+        self.assertEqual(body, self.data[1000:301000])
+
+    def test_file_range_exposes_fileno_and_closes(self):
+        f = self.provider.open_file("media.bin")
+        body = FileRange(f, 10, 20)
+        self.assertEqual(body.fileno(), f.fileno())
+        self.assertEqual(b"".join(body), self.data[10:30])
+        body.close()
+        self.assertTrue(f.closed)
+
+    def test_file_range_defaults_to_tail(self):
+        with self.provider.open_file("media.bin") as f:
+            body = FileRange(f, len(self.data) - 5, close_file=False)
+            self.assertEqual(b"".join(body), self.data[-5:])
+
+    def test_generic_fallback_over_read_stream(self):
+        remote = DemoRemoteProvider("Bunker")
+        full = b"".join(remote.read_stream("cloud_data.txt"))
+        self.assertEqual(b"".join(remote.read_range("cloud_data.txt", 5, 7)), full[5:12])
+
+class TestRangedFileResponse(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        with open(os.path.join(self.root, "a.txt"), "wb") as f:
+            f.write(b"hello")
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", LocalProvider(self.root))
+        # _file_response only needs the hub and a request context
+        self.server = PodProxyServer.__new__(PodProxyServer)
+        self.server.hub = self.hub
+        self.app = Flask(__name__)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _ranged(self, range_header):
+        opened = []
+        open_file = self.hub.open_file
+        self.hub.open_file = lambda path: opened.append(open_file(path)) or opened[-1]
+        attr = self.hub.get_attr("stash/a.txt")
+        with self.app.test_request_context("/", headers={"Range": range_header}):
+            resp = self.server._file_response("stash/a.txt", attr, "text/plain", {})
+        return resp, opened[0]
+
+    def test_unsatisfiable_range_closes_file(self):
+        resp, f = self._ranged("bytes=10-20")
+        self.assertEqual(resp.status_code, 416)
+        self.assertTrue(f.closed)
+
+    def test_unread_multipart_body_closes_file(self):
+        resp, f = self._ranged("bytes=0-0,3-4")
+        self.assertEqual(resp.status_code, 206)
+        self.assertFalse(f.closed)
+        resp.close()  # e.g. HEAD, or a client gone before the body started
+        self.assertTrue(f.closed)
+
+if __name__ == '__main__':
+    unittest.main()
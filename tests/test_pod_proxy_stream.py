@@ -0,0 +1,92 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from proxion_keyring.pod_proxy import DemoRemoteProvider, GeneratorStream, HybridHub, LocalProvider, ProxionDAVProvider, ProxionResource
+
+def chunked(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+class TestGeneratorStream(unittest.TestCase):
+    def setUp(self):
+        self.data = bytes(range(256)) * 64
+
+    def _stream(self, chunk=1000):
+        return GeneratorStream(
+            chunked(self.data, chunk),
+            reopen=lambda offset: chunked(self.data[offset:], chunk),
+            size=len(self.data)
+        )
+
+    def test_small_reads_reassemble(self):
+        stream = self._stream()
+        out = []
+        while True:
+            piece = stream.read(37)
+            if not piece:
+                break
+            out.append(piece)
+        self.assertEqual(b"".join(out), self.data)
+        self.assertEqual(stream.tell(), len(self.data))
+
+    def test_readinto_spans_chunks(self):
+        stream = self._stream(chunk=100)
+        buf = bytearray(250)
+        self.assertEqual(stream.readinto(buf), 250)
+        self.assertEqual(bytes(buf), self.data[:250])
+        self.assertEqual(stream.read(), self.data[250:])
+
+    def test_seek_forward_backward_and_end(self):
+        stream = self._stream()
+        stream.read(10)
+        self.assertEqual(stream.seek(500), 500)
+        self.assertEqual(stream.read(4), self.data[500:504])
+        stream.seek(3)
+        self.assertEqual(stream.read(4), self.data[3:7])
+        stream.seek(-5, io.SEEK_END)
+        self.assertEqual(stream.read(), self.data[-5:])
+
+    def test_unseekable_without_reopen(self):
+        stream = GeneratorStream(chunked(self.data, 100))
+        self.assertFalse(stream.seekable())
+        stream.read(50)
+        # Forward seeks within the buffered chunk still work
+        stream.seek(60)
+        self.assertEqual(stream.read(2), self.data[60:62])
+        with self.assertRaises(io.UnsupportedOperation):
+            stream.seek(0)
+
+    def test_buffered_reader_wraps_stream(self):
+        reader = io.BufferedReader(self._stream(chunk=333), buffer_size=4096)
+        self.assertEqual(reader.read(), self.data)
+
+class TestResourceContent(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        with open(os.path.join(self.root, "a.bin"), "wb") as f:
+            f.write(b"x" * 100)
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", LocalProvider(self.root))
+        self.hub.mount("cloud", DemoRemoteProvider("Bunker"))
+        self.environ = {"wsgidav.provider": ProxionDAVProvider(self.hub)}
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_local_content_is_real_file(self):
+        content = ProxionResource("/stash/a.bin", self.environ, self.hub).get_content()
+        with content:
+            self.assertIsInstance(content, io.BufferedReader)
+            self.assertEqual(content.read(), b"x" * 100)
+
+    def test_remote_content_is_seekable_stream(self):
+        content = ProxionResource("/cloud/cloud_data.txt", self.environ, self.hub).get_content()
+        full = content.read()
+        content.seek(5)
+        self.assertEqual(content.read(3), full[5:8])
+        content.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from proxion_keyring.pod_proxy import HybridHub, LocalProvider
+
+class TestStreamingWrites(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.provider = LocalProvider(self.root)
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", self.provider)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _read(self, name):
+        with open(os.path.join(self.root, name), "rb") as f:
+            return f.read()
+
+    def test_full_replacement_truncates(self):
+        self.hub.write_stream("stash/doc.txt", iter([b"0123456789"]))
+        self.hub.write_stream("stash/doc.txt", iter([b"ab", b"c"]))
+        self.assertEqual(self._read("doc.txt"), b"abc")
+        self.assertEqual(os.listdir(self.root), ["doc.txt"])
+
+    def test_offset_write_patches_in_place(self):
+        self.hub.write_stream("stash/doc.txt", iter([b"0123456789"]))
+        self.hub.write_stream("stash/doc.txt", iter([b"XY"]), offset=4)
+        self.assertEqual(self._read("doc.txt"), b"0123XY6789")
+
+    def test_failed_upload_keeps_original(self):
+        self.hub.write_stream("stash/doc.txt", iter([b"original"]))
+
+        def broken():
+            yield b"partial"
+            raise ConnectionError("client went away")
+
+        with self.assertRaises(ConnectionError):
+            self.hub.write_stream("stash/doc.txt", broken())
+        self.assertEqual(self._read("doc.txt"), b"original")
+        self.assertEqual(os.listdir(self.root), ["doc.txt"])
+
+    def test_cache_sees_new_size(self):
+        self.hub.write_stream("stash/doc.txt", iter([b"1234"]))
+        self.assertEqual(self.hub.get_attr("stash/doc.txt")["st_size"], 4)
+        self.hub.write_stream("stash/doc.txt", iter([b"12"]))
+        self.assertEqual(self.hub.get_attr("stash/doc.txt")["st_size"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from proxion_keyring.pod_proxy import WRITE_HANDLES, LocalProvider, WriteHandleCache
+
+class TestWriteHandleCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.handles = WriteHandleCache(max_handles=2, idle_timeout=0.2)
+        self.provider = LocalProvider(self.root, write_handles=self.handles)
+
+    def tearDown(self):
+        self.handles.close_all()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_sequential_writes_reuse_one_handle(self):
+        for i in range(10):
+            self.provider.write("seq.bin", bytes([i]) * 100, i * 100)
+        self.assertEqual(self.handles.opens, 1)
+        self.assertEqual(self.handles.syncs, 0)
+        # Every acknowledged byte is visible on disk without a flush
+        with open(os.path.join(self.root, "seq.bin"), "rb") as f:
+            data = f.read()
+        self.assertEqual(data, b"".join(bytes([i]) * 100 for i in range(10)))
+
+    def test_lru_eviction_syncs_and_closes(self):
+        for name in ("a", "b", "c"):
+            self.provider.write(name, b"x", 0)
+        self.assertEqual(self.handles.stats()["open"], 2)
+        self.assertEqual(self.handles.syncs, 1)
+        self.provider.write("a", b"y", 1)  # Evicted handle is reopened
+        self.assertEqual(self.handles.opens, 4)
+        self.assertEqual(b"".join(self.provider.read_stream("a")), b"xy")
+
+    def test_idle_handles_are_reaped(self):
+        self.provider.write("idle.bin", b"data", 0)
+        deadline = time.monotonic() + 5
+        # The handle leaves the table before its fsync finishes; wait for both
+        while (self.handles.stats()["open"] or not self.handles.syncs) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.handles.stats()["open"], 0)
+        self.assertEqual(self.handles.syncs, 1)
+
+    def test_flush_and_delete_close_handle(self):
+        self.provider.write("f.bin", b"abc", 0)
+        self.assertTrue(self.provider.flush("f.bin"))
+        self.assertEqual(self.handles.stats()["open"], 0)
+        self.provider.create("d", is_dir=True)
+        self.provider.write("d/inner.bin", b"abc", 0)
+        self.assertTrue(self.provider.delete("d/inner.bin"))
+        self.assertEqual(self.handles.stats()["open"], 0)
+
+    def test_full_replace_after_cached_write(self):
+        self.provider.write("r.bin", b"old-old-old", 0)
+        self.provider.write_stream("r.bin", [b"new"])
+        self.assertEqual(self.handles.stats()["open"], 0)
+        self.provider.write("r.bin", b"N", 0)
+        self.assertEqual(b"".join(self.provider.read_stream("r.bin")), b"New")
+
+    def test_providers_hold_no_handles_unless_given_a_cache(self):
+        plain = LocalProvider(self.root)
+        self.assertIsNone(plain.write_handles)
+        opens = WRITE_HANDLES.opens
+        plain.write("plain.bin", b"abc", 0)
+        plain.write("plain.bin", b"def", 3)
+        self.assertEqual(WRITE_HANDLES.opens, opens)
+        self.assertEqual(b"".join(plain.read_stream("plain.bin")), b"abcdef")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+
+from ldp_server import LDPStandIn
+
+from proxion_keyring.ldp import parse_container, parse_turtle
+from proxion_keyring.pod_proxy import HybridHub, RemoteProvider
+
+class TestContainerParsing(unittest.TestCase):
+    def test_turtle_members_with_inline_metadata(self):
+        body = """@prefix ldp: <http://www.w3.org/ns/ldp#>.
+@prefix posix: <http://www.w3.org/ns/posix/stat#>.
+@prefix dc: <http://purl.org/dc/terms/>.
+<> a ldp:BasicContainer; ldp:contains <a.txt>, <sub/>, <b%20c.txt>.
+<a.txt> a ldp:Resource; posix:size 3; dc:modified "2024-01-01T00:00:00Z"^^<http://www.w3.org/2001/XMLSchema#dateTime>.
+<sub/> a ldp:BasicContainer; posix:mtime 10.
+"""
+        members = dict(parse_container(body, "text/turtle", "http://pod/x/"))
+        self.assertEqual(members["http://pod/x/a.txt"]["st_size"], 3)
+        self.assertTrue(members["http://pod/x/a.txt"]["complete"])
+        self.assertTrue(members["http://pod/x/sub/"]["is_dir"])
+        self.assertFalse(members["http://pod/x/b%20c.txt"]["complete"])
+
+    def test_jsonld_members(self):
+        body = '{"@graph": [{"@id": "", "http://www.w3.org/ns/ldp#contains": [{"@id": "a.txt"}]}]}'
+        members = parse_container(body, "application/ld+json", "http://pod/x/")
+        self.assertEqual([url for url, _ in members], ["http://pod/x/a.txt"])
+
+    def test_literal_escapes_keep_non_ascii_text(self):
+        body = r"""<s> <p> "Café \"ünïcode\"\tend\u00e9\n" ."""
+        triples = parse_turtle(body, "http://pod/")
+        self.assertEqual(triples[0][2], 'Café "ünïcode"\tendé\n')
+        with self.assertRaises(ValueError):
+            parse_turtle(r'<s> <p> "bad \q" .', "http://pod/")
+
+    def test_malformed_containers_raise_value_error(self):
+        for body, content_type in (("@prefix", "text/turtle"), ("[1, 2]", "application/ld+json"), ("{", "application/ld+json")):
+            with self.assertRaises(ValueError):
+                parse_container(body, content_type, "http://pod/x/")
+
+class TestRemoteProvider(unittest.TestCase):
+    def setUp(self):
+        self.server = LDPStandIn(inline_metadata=False).start()
+        self.server.put("docs/a.txt", b"hello world", mtime=1700000000)
+        self.server.put("docs/b c.txt", b"xy")
+        self.server.put("docs/nested/")
+        self.provider = RemoteProvider("remote", self.server.url, max_workers=4)
+
+    def tearDown(self):
+        self.provider.close()
+        self.server.stop()
+
+    def test_listing_fills_missing_metadata_concurrently(self):
+        listing = dict(self.provider.list_dir_with_attrs("docs"))
+        self.assertEqual(set(listing), {"a.txt", "b c.txt", "nested"})
+        self.assertEqual(listing["a.txt"]["st_size"], 11)
+        self.assertEqual(listing["a.txt"]["st_mtime"], 1700000000)
+        self.assertTrue(listing["nested"]["st_mode"] & 0o40000)
+        heads = [r for r in self.server.requests if r[0] == "HEAD"]
+        self.assertEqual(len(heads), 3)
+
+    def test_inline_listing_needs_no_heads(self):
+        self.server.inline_metadata = True
+        self.provider.list_dir_with_attrs("docs")
+        self.assertEqual([r[0] for r in self.server.requests], ["GET"])
+
+    def test_connections_are_reused(self):
+        for _ in range(5):
+            self.provider.get_attr("docs/a.txt")
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_malformed_listing_reads_as_empty(self):
+        self.server._listing = lambda container, as_json: b"<> <p> \"unterminated"
+        self.assertEqual(self.provider.list_dir_with_attrs("docs"), [])
+
+    def test_get_attr_detects_containers(self):
+        self.assertTrue(self.provider.get_attr("docs/nested")["st_mode"] & 0o40000)
+        self.assertEqual(self.provider.get_attr("docs/a.txt")["st_size"], 11)
+        self.assertIsNone(self.provider.get_attr("docs/missing.txt"))
+
+    def test_reads_and_ranges(self):
+        self.assertEqual(b"".join(self.provider.read_stream("docs/a.txt")), b"hello world")
+        self.assertEqual(b"".join(self.provider.read_range("docs/a.txt", 6, 5)), b"world")
+
+    def test_writes_through_hub(self):
+        hub = HybridHub(watch=False)
+        hub.mount("cloud", self.provider)
+        self.assertTrue(hub.write_stream("cloud/docs/new.bin", iter([b"ab", b"cd"])))
+        self.assertEqual(self.server.resources["/docs/new.bin"][0], b"abcd")
+        self.assertTrue(hub.create("cloud/docs/folder", is_dir=True))
+        self.assertIn("folder", hub.list_dir("cloud/docs"))
+        self.assertTrue(hub.delete("cloud/docs/new.bin"))
+        self.assertNotIn("/docs/new.bin", self.server.resources)
+
+    def test_offset_writes_are_staged_and_uploaded_once(self):
+        self.provider.write("docs/a.txt", b"HELLO", 0)  # Patches, does not truncate
+        self.provider.write("docs/a.txt", b"!", 14)  # Past the end: zero-filled gap
+        expected = b"HELLO world\0\0\0!"
+        self.assertEqual(self.server.resources["/docs/a.txt"][0], b"hello world")
+        self.assertEqual(b"".join(self.provider.read_stream("docs/a.txt")), expected)
+        self.assertEqual(b"".join(self.provider.read_range("docs/a.txt", 10, 10)), expected[10:])
+        self.assertEqual(self.provider.get_attr("docs/a.txt")["st_size"], len(expected))
+        self.assertTrue(self.provider.flush("docs/a.txt"))
+        self.assertEqual(self.server.resources["/docs/a.txt"][0], expected)
+        self.assertEqual([r[0] for r in self.server.requests].count("PUT"), 1)
+        self.assertEqual(self.provider.get_attr("docs/a.txt")["proxion_status"], "cloud-only")
+
+    def test_idle_staged_writes_upload_in_background(self):
+        import time
+        self.provider.write_handles.idle_timeout = 0.2
+        self.provider.write("docs/new.bin", b"data", 2)
+        self.assertIn("new.bin", dict(self.provider.list_dir_with_attrs("docs")))
+        deadline = time.monotonic() + 5
+        while "/docs/new.bin" not in self.server.resources and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.server.resources["/docs/new.bin"][0], b"\0\0data")
+
+    def test_replace_discards_staged_writes(self):
+        self.provider.write("docs/a.txt", b"X", 0)
+        self.provider.write_stream("docs/a.txt", iter([b"fresh"]))
+        self.assertTrue(self.provider.flush("docs/a.txt"))
+        self.assertEqual(self.server.resources["/docs/a.txt"][0], b"fresh")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from proxion_keyring.pod_compress import CompressedLocalProvider
+from proxion_keyring.pod_proxy import DemoRemoteProvider, HybridHub, LocalProvider
+from proxion_keyring.pod_uploads import ChunkedUploads, UploadError
+
+CHUNK = ChunkedUploads.MIN_CHUNK_SIZE
+
+class TestChunkedUploads(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.hub = HybridHub(watch=False)
+        self.hub.mount("stash", LocalProvider(self.root))
+        self.hub.mount("cloud", DemoRemoteProvider("test"))
+        self.uploads = ChunkedUploads(self.hub)
+        self.data = os.urandom(CHUNK * 5 + 123)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _chunk(self, i):
+        return [self.data[i * CHUNK:(i + 1) * CHUNK]]
+
+    def test_parallel_chunks_and_commit(self):
+        session = self.uploads.create("stash/clip.mp4", len(self.data), CHUNK)
+        sid = session["upload_id"]
+        self.assertEqual(session["chunk_count"], 6)
+        self.assertEqual(self.hub.list_dir("stash"), [])
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: self.uploads.put_chunk("stash/clip.mp4", sid, i, self._chunk(i)), range(6)))
+
+        self.uploads.commit("stash/clip.mp4", sid)
+        with open(os.path.join(self.root, "clip.mp4"), "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(os.listdir(self.root), ["clip.mp4"])
+
+    def test_resume_reports_missing_chunks(self):
+        sid = self.uploads.create("stash/clip.mp4", len(self.data), CHUNK)["upload_id"]
+        for i in (0, 2, 5):
+            self.uploads.put_chunk("stash/clip.mp4", sid, i, self._chunk(i))
+        # A fresh instance (e.g. after a proxy restart) sees the same state
+        status = ChunkedUploads(self.hub).status("stash/clip.mp4", sid)
+        self.assertEqual(status["missing"], [1, 3, 4])
+        with self.assertRaises(UploadError) as ctx:
+            self.uploads.commit("stash/clip.mp4", sid)
+        self.assertEqual(ctx.exception.status, 409)
+
+    def test_resent_chunks_report_no_new_bytes(self):
+        sid = self.uploads.create("stash/clip.mp4", len(self.data), CHUNK)["upload_id"]
+        self.assertEqual(self.uploads.put_chunk("stash/clip.mp4", sid, 5, self._chunk(5)), 123)
+        # A retry after a lost response must not be charged again
+        self.assertEqual(self.uploads.put_chunk("stash/clip.mp4", sid, 5, self._chunk(5)), 0)
+        self.assertEqual(self.uploads.put_chunk("stash/clip.mp4", sid, 0, self._chunk(0)), CHUNK)
+
+    def test_wrong_chunk_size_not_marked(self):
+        sid = self.uploads.create("stash/clip.mp4", len(self.data), CHUNK)["upload_id"]
+        with self.assertRaises(UploadError):
+            self.uploads.put_chunk("stash/clip.mp4", sid, 0, [b"short"])
+        self.assertIn(0, self.uploads.status("stash/clip.mp4", sid)["missing"])
+
+    def test_abort_removes_staging(self):
+        sid = self.uploads.create("stash/clip.mp4", len(self.data), CHUNK)["upload_id"]
+        self.uploads.abort("stash/clip.mp4", sid)
+        self.assertEqual(os.listdir(self.root), [])
+        with self.assertRaises(UploadError) as ctx:
+            self.uploads.status("stash/clip.mp4", sid)
+        self.assertEqual(ctx.exception.status, 404)
+
+    def test_rejects_bad_ids_and_remote_targets(self):
+        with self.assertRaises(UploadError):
+            self.uploads.status("stash/clip.mp4", "../../etc/passwd")
+        with self.assertRaises(UploadError) as ctx:
+            self.uploads.create("cloud/clip.mp4", 10)
+        self.assertEqual(ctx.exception.status, 501)
+
+    def test_rejects_compressed_mount(self):
+        self.hub.mount("packed", CompressedLocalProvider(os.path.join(self.root, "packed")))
+        with self.assertRaises(UploadError) as ctx:
+            self.uploads.create("packed/clip.mp4", 10)
+        self.assertEqual(ctx.exception.status, 501)
+
+    def test_overwrite_needs_write(self):
+        with open(os.path.join(self.root, "clip.mp4"), "wb") as f:
+            f.write(b"original")
+        sid = self.uploads.create("stash/clip.mp4", 3, CHUNK)["upload_id"]
+        self.uploads.put_chunk("stash/clip.mp4", sid, 0, [b"new"])
+        asked = []
+        deny = lambda action, path, size: asked.append((action, path, size)) and False
+        with self.assertRaises(UploadError) as ctx:
+            self.uploads.commit("stash/clip.mp4", sid, deny)
+        self.assertEqual((ctx.exception.status, asked), (403, [("WRITE", "stash/clip.mp4", 3)]))
+        with open(os.path.join(self.root, "clip.mp4"), "rb") as f:
+            self.assertEqual(f.read(), b"original")
+        self.uploads.commit("stash/clip.mp4", sid, lambda *args: True)
+        with open(os.path.join(self.root, "clip.mp4"), "rb") as f:
+            self.assertEqual(f.read(), b"new")
+
+if __name__ == '__main__':
+    unittest.main()
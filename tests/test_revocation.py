@@ -0,0 +1,75 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from proxion_core import issue_token
+from proxion_keyring.core.revocation import BloomFilter, RevocationList
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives_and_low_false_positives(self):
+        bloom = BloomFilter(10000, fp_rate=0.01)
+        for i in range(10000):
+            bloom.add(f"jti-{i}")
+        self.assertTrue(all(f"jti-{i}" in bloom for i in range(10000)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+class TestRevocationList(unittest.TestCase):
+    def setUp(self):
+        self.crl = RevocationList(capacity=64)
+
+    def test_revoke_and_expire(self):
+        token = issue_token([("read", "a")], NOW + timedelta(hours=1), "aud", [], "fp", b"k", token_id="tok")
+        self.crl.revoke(token, NOW, ttl_seconds=60)
+        self.crl.revoke("other", NOW, ttl_seconds=600)
+        self.assertTrue(self.crl.is_revoked("tok", NOW + timedelta(seconds=60)))
+        self.assertFalse(self.crl.is_revoked("never", NOW))
+        self.assertFalse(self.crl.is_revoked(token, NOW + timedelta(seconds=61)))
+        self.assertEqual(self.crl.get_crl(), ["other"])  # Purged from the heap, not only on lookup
+
+    def test_purge_rebuilds_filter(self):
+        for i in range(2000):
+            self.crl.revoke(f"t{i}", NOW, ttl_seconds=10)
+        self.crl.revoke("keep", NOW, ttl_seconds=1000)
+        self.assertEqual(self.crl.stats()["bloom_capacity"], 2048)  # Grew with the live list
+        self.assertEqual(self.crl.purge(NOW + timedelta(seconds=11)), 2000)
+        stats = self.crl.stats()
+        self.assertEqual((stats["entries"], stats["stale"]), (1, 0))
+        self.assertTrue(self.crl.is_revoked("keep", NOW + timedelta(seconds=11)))
+
+    def test_snapshot_and_diff(self):
+        self.crl.revoke("a", NOW, ttl_seconds=60)
+        first = self.crl.snapshot()
+        self.assertIs(self.crl.snapshot(), first)  # Cached until the list changes
+        self.crl.revoke("b", NOW, ttl_seconds=60)
+        self.crl.revoke("a", NOW, ttl_seconds=120)  # Re-revoked with a later expiry
+        diff = self.crl.diff(first.version, first.epoch)
+        self.assertFalse(diff.reset)
+        self.assertEqual([tid for tid, _ in diff.revoked], ["b", "a"])
+        self.assertEqual(self.crl.diff(diff.version, diff.epoch).revoked, ())
+        self.assertEqual(dict(self.crl.snapshot().revoked)["a"], (NOW + timedelta(seconds=120)).timestamp())
+
+    def test_diff_from_every_version(self):
+        for i in range(10):
+            self.crl.revoke(f"t{i}", NOW, ttl_seconds=60)
+        for since in range(11):
+            self.assertEqual([tid for tid, _ in self.crl.diff(since).revoked], [f"t{i}" for i in range(since, 10)])
+
+    def test_other_epoch_gets_full_snapshot(self):
+        self.crl.revoke("a", NOW)
+        self.assertTrue(self.crl.diff(0, "another-list").reset)
+        self.assertTrue(self.crl.diff(self.crl.version + 5).reset)
+
+    def test_replica_applies_snapshots_and_diffs(self):
+        replica = RevocationList()
+        self.crl.revoke("a", NOW, ttl_seconds=60)
+        since = replica.apply(self.crl.snapshot(), NOW)
+        self.crl.revoke("b", NOW, ttl_seconds=60)
+        replica.apply(self.crl.diff(since, self.crl.epoch), NOW)
+        self.assertTrue(replica.is_revoked("a", NOW) and replica.is_revoked("b", NOW))
+        replica.apply(RevocationList().snapshot(), NOW)  # Reset to an empty list
+        self.assertFalse(replica.is_revoked("a", NOW))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from proxion_keyring.core.identity import Identity
+from proxion_keyring.core.token_cache import TokenRevoked, VerifiedTokenCache
+
+class FakeRevocationList:
+    def __init__(self):
+        self.revoked = set()
+
+    def is_revoked(self, token, now):
+        return token.token_id in self.revoked
+
+def make_token(token_id="t1", seconds=3600):
+    return SimpleNamespace(token_id=token_id, exp=datetime.now(timezone.utc) + timedelta(seconds=seconds))
+
+class TestVerifiedTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.revocations = FakeRevocationList()
+        self.cache = VerifiedTokenCache(self.revocations, max_entries=2)
+        self.calls = 0
+
+    def _verify(self, token):
+        def verify():
+            self.calls += 1
+            return token
+        return verify
+
+    def test_hit_skips_verification(self):
+        token = make_token()
+        for _ in range(5):
+            self.assertIs(self.cache.get_or_verify("jwt-a", self._verify(token)), token)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.stats()["hits"], 4)
+
+    def test_revocation_checked_on_every_hit(self):
+        token = make_token("revoke-me")
+        self.cache.get_or_verify("jwt-a", self._verify(token))
+        self.revocations.revoked.add("revoke-me")
+        with self.assertRaises(TokenRevoked):
+            self.cache.get_or_verify("jwt-a", self._verify(token))
+
+    def test_entries_expire_with_token(self):
+        self.cache.get_or_verify("jwt-a", self._verify(make_token(seconds=-1)))
+        self.cache.get_or_verify("jwt-a", self._verify(make_token(seconds=-1)))
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_failures_are_not_cached_and_size_is_bounded(self):
+        def fail():
+            raise ValueError("bad signature")
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.cache.get_or_verify("jwt-bad", fail)
+        for name in ("a", "b", "c"):
+            self.cache.get_or_verify(name, self._verify(make_token(name)))
+        self.assertEqual(self.cache.stats()["entries"], 2)
+        self.cache.get_or_verify("a", self._verify(make_token("a")))  # Evicted; verified again
+        self.assertEqual(self.calls, 4)
+
+class TestIdentityTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.identity = Identity(ed25519.Ed25519PrivateKey.generate())
+        self.revocations = FakeRevocationList()
+        self.identity.token_cache.revocation_list = self.revocations
+        self.token_json = json.dumps({
+            "token_id": "pod-1",
+            "permissions": [["READ", "/stash"]],
+            "exp": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+            "aud": self.identity.get_public_key_hex(),
+            "holder_key_fingerprint": "fp",
+            "signature": "sig",
+        })
+
+    def test_repeat_validation_reuses_parsed_token(self):
+        ctx = {"action": "READ", "resource": "/stash"}
+        first = self.identity.validate_token(self.token_json, ctx, {})
+        second = self.identity.validate_token(self.token_json, ctx, {})
+        self.assertEqual(first.allowed, second.allowed)
+        stats = self.identity.token_cache.stats()
+        self.assertEqual((stats["misses"], stats["hits"]), (1, 1))
+
+    def test_revoked_token_is_denied(self):
+        ctx = {"action": "READ", "resource": "/stash"}
+        self.identity.validate_token(self.token_json, ctx, {})
+        self.revocations.revoked.add("pod-1")
+        decision = self.identity.validate_token(self.token_json, ctx, {})
+        self.assertFalse(decision.allowed)
+        self.assertEqual(decision.reason, "Token revoked")
+
+if __name__ == "__main__":
+    unittest.main()